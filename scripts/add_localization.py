@@ -3,9 +3,12 @@
 
 import re
 
+import file_writer
+import project_paths
+
 
 def add_zh_hans_to_project():
-    project_file = "/Users/WangQiao/Desktop/github/ios-dev/ZeroNet-Space/ZeroNet_Space/ZeroNet-Space.xcodeproj/project.pbxproj"
+    project_file = project_paths.xcode_project_path()
 
     with open(project_file, "r", encoding="utf-8") as f:
         content = f.read()
@@ -27,10 +30,10 @@ def add_zh_hans_to_project():
     if "developmentRegion = en;" in content:
         print("✓ developmentRegion already set to en")
 
-    with open(project_file, "w", encoding="utf-8") as f:
-        f.write(content)
-
-    print("\n✅ Project file updated successfully!")
+    if file_writer.write_if_changed(project_file, content):
+        print("\n✅ Project file updated successfully!")
+    else:
+        print("\n✅ Project file already up to date")
     print("\n⚠️  重要提示：")
     print("1. 需要在 Xcode 中打开项目")
     print("2. 选择项目 -> Info -> Localizations")
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Gallery search: linear filter vs the gram index in vault/search.py.
+
+GalleryViewModel.search walks every loaded MediaItem and calls
+localizedCaseInsensitiveContains on fileName and fileExtension; type and
+date filters are further passes. This times that against SearchIndex for a
+fixed set of queries (common and rare substrings, one character, a name
+prefix, type and date filters, no match) at several library sizes, and
+checks both return the same items. The linear filter gets pre-casefolded
+strings, so it is the best case of the app's loop.
+
+Items are synthetic (IMG_1234.JPG, screenshots, WeChat exports, scans...)
+unless --csv names a metadata table from `vault_store.py --csv`. Insert and
+delete columns are the mean cost of one incremental add() and remove().
+
+  python3 scripts/bench_search_index.py [--sizes 10000,100000,1000000]
+  python3 scripts/bench_search_index.py --csv media.csv
+"""
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+from collections import namedtuple
+
+from vault.metadata import read_csv
+from vault.search import SearchIndex
+
+Item = namedtuple("Item", "id file_name file_extension type created_at")
+
+WORDS = [
+    "trip", "beach", "family", "birthday", "receipt", "passport", "contract",
+    "invoice", "cat", "dog", "concert", "wedding", "notes", "draft", "final",
+    "旅行", "合同", "发票", "家庭", "截图", "报告", "生日", "风景",
+]  # fmt: skip
+DAY = 86400.0
+UPDATES = 1000
+
+
+def _stamp(created):
+    return time.strftime("%Y%m%d_%H%M%S", time.gmtime(created + 978307200))
+
+
+def synthetic_items(count, seed, created=7.0e8):
+    """Items with name shapes as they come off a phone, oldest first"""
+    rng = random.Random(seed)
+    items = []
+    for n in range(count):
+        created += rng.expovariate(1 / 600)
+        roll = rng.random()
+        if roll < 0.45:
+            kind, name = (
+                "photo",
+                f"IMG_{rng.randrange(10000):04d}.{rng.choice(['JPG', 'HEIC', 'jpg'])}",
+            )
+        elif roll < 0.60:
+            kind, name = "photo", f"Screenshot {_stamp(created)}.png"
+        elif roll < 0.72:
+            kind, name = "photo", f"微信图片_{_stamp(created)}.jpg"
+        elif roll < 0.80:
+            kind = "photo"
+            name = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {n}.jpeg"
+        elif roll < 0.90:
+            kind, name = "video", f"VID_{_stamp(created)}.mp4"
+        elif roll < 0.95:
+            kind, name = "video", f"{rng.choice(WORDS)} {rng.randrange(100)}.MOV"
+        else:
+            kind = "document"
+            name = f"{rng.choice(WORDS)}_{rng.randrange(1000)}.{rng.choice(['pdf', 'docx'])}"
+        extension = name.rpartition(".")[2]
+        items.append(
+            Item(
+                uuid.UUID(int=rng.getrandbits(128), version=4),
+                name,
+                extension,
+                kind,
+                created,
+            )
+        )
+    return items
+
+
+def queries(items):
+    """(label, search kwargs); dates are relative to the newest item"""
+    newest = max(item.created_at for item in items)
+    return [
+        ("common 'img'", {"text": "img"}),
+        ("rare '4821'", {"text": "4821"}),
+        ("extension 'mp4'", {"text": "mp4"}),
+        ("one char 'a'", {"text": "a"}),
+        ("prefix 'scr'", {"text": "scr", "prefix": True}),
+        ("CJK '微信'", {"text": "微信"}),
+        ("'trip' photos", {"text": "trip", "kind": "photo"}),
+        ("videos, 30 days", {"kind": "video", "since": newest - 30 * DAY}),
+        ("long 'screenshot 2023'", {"text": "screenshot 2023"}),
+        ("no match", {"text": "zzqx"}),
+    ]
+
+
+class LinearFilter:
+    """The app's filter: one pass over every item per condition"""
+
+    def __init__(self, items):
+        self.items = {
+            item.id: (item.file_name.casefold(), item.file_extension.casefold(), item)
+            for item in items
+        }
+
+    def search(self, text="", kind=None, since=None, until=None, prefix=False):
+        rows = self.items.values()
+        if text:
+            text = text.casefold()
+            if prefix:
+                rows = [
+                    r for r in rows if r[0].startswith(text) or r[1].startswith(text)
+                ]
+            else:
+                rows = [r for r in rows if text in r[0] or text in r[1]]
+        if kind is not None:
+            rows = [r for r in rows if r[2].type == kind]
+        if since is not None:
+            rows = [r for r in rows if r[2].created_at >= since]
+        if until is not None:
+            rows = [r for r in rows if r[2].created_at <= until]
+        return [r[2].id for r in rows]
+
+
+def _median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def bench(items, repeat, seed):
+    count = len(items)
+    start = time.perf_counter()
+    index = SearchIndex(items)
+    built = time.perf_counter() - start
+    linear = LinearFilter(items)
+    print(
+        f"\n📚 {count} items: index built in {built:.2f}s, "
+        f"{index.nbytes() / 1e6:.1f} MB of arrays"
+    )
+    print(f"{'Query':<24}{'hits':>9}{'linear ms':>11}{'index ms':>10}{'speedup':>9}")
+    for label, kwargs in queries(items):
+        linear_ms, expected = _median_ms(lambda: linear.search(**kwargs), repeat)
+        index_ms, found = _median_ms(lambda: index.search(**kwargs), repeat)
+        if set(found) != set(expected):
+            raise SystemExit(f"❌ {label}: index and linear filter disagree")
+        print(
+            f"{label:<24}{len(found):>9}{linear_ms:>11.3f}{index_ms:>10.3f}"
+            f"{linear_ms / max(index_ms, 1e-6):>8.0f}x"
+        )
+
+    # New imports are the newest items, as in the app
+    rng = random.Random(seed)
+    added = synthetic_items(UPDATES, seed + 1, max(item.created_at for item in items))
+    start = time.perf_counter()
+    for item in added:
+        index.add(item)
+    insert_us = (time.perf_counter() - start) / UPDATES * 1e6
+    doomed = rng.sample(items, min(UPDATES, count))
+    start = time.perf_counter()
+    for item in doomed:
+        index.remove(item.id)
+    delete_us = (time.perf_counter() - start) / len(doomed) * 1e6
+    gone = {item.id for item in doomed}
+    linear = LinearFilter([i for i in items if i.id not in gone] + added)
+    for label, kwargs in queries(items):
+        if set(index.search(**kwargs)) != set(linear.search(**kwargs)):
+            raise SystemExit(f"❌ {label}: wrong after inserts and deletes")
+    print(f"✏️  insert {insert_us:.1f} µs, delete {delete_us:.1f} µs per item")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default="10000,100000,1000000",
+        help="comma-separated synthetic library sizes",
+    )
+    parser.add_argument("--csv", help="metadata table to search instead")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per query")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.csv:
+        rows = list(read_csv(args.csv))
+        if not rows:
+            raise SystemExit(f"❌ {args.csv} has no items")
+        bench(
+            [
+                Item(
+                    r.id,
+                    r.file_name or "",
+                    r.file_extension or "",
+                    r.type,
+                    r.created_at or 0.0,
+                )
+                for r in rows
+            ],
+            args.repeat,
+            args.seed,
+        )
+        return
+    for size in (int(s) for s in args.sizes.split(",")):
+        bench(synthetic_items(size, args.seed), args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+MediaItem reads: full fetches vs SQL aggregates and covering indexes.
+
+Builds a synthetic SwiftData store (100k ZMEDIAITEM rows with every column
+filled and ~20 KB thumbnails inline, as MediaImportService leaves them),
+then times each access pattern in vault/metadata.py twice:
+
+  bare      the schema as SwiftData creates it: no index besides Z_PK
+  indexed   after adding PROPOSED_INDEXES
+
+"fetch all" materialises every row the way FetchDescriptor<MediaItem>()
+does and sums fileSize in Python, which is what StorageService does today;
+"sum fileSize" and "per-type totals" are the same answers as one aggregate.
+Rows of the inline-blob table are a page or more each, so anything that
+scans ZMEDIAITEM reads most of the file; an index holding the column is a
+few MB. Times are warm (the store is in the page cache) medians.
+
+  python3 scripts/bench_swiftdata_store.py [--items 100000] [--thumb-kb 20]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+import uuid
+
+from vault.metadata import (
+    ACCESS_PATTERNS,
+    COLUMNS,
+    PROPOSED_INDEXES,
+    TABLE,
+    MetadataStore,
+    create_store,
+)
+
+# (type, share, mean file size MB, extension)
+MEDIA_TYPES = [
+    ("photo", 0.80, 3.0, "jpg"),
+    ("video", 0.15, 80.0, "mov"),
+    ("document", 0.05, 0.5, "pdf"),
+]
+BATCH = 2000
+FILE_SIZE = list(COLUMNS).index("file_size") + 3  # after Z_PK, Z_ENT, Z_OPT
+
+
+def build_store(path, items, thumb_kb, seed):
+    rng = random.Random(seed)
+    noise = os.urandom(256 * 1024)
+    weights = [share for _, share, _, _ in MEDIA_TYPES]
+    db = create_store(path)
+    columns = ["Z_PK", "Z_ENT", "Z_OPT", *COLUMNS.values(), "ZTHUMBNAILDATA"]
+    insert = (
+        f"INSERT INTO {TABLE} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' * len(columns))})"
+    )
+    created = 7.0e8  # 2023-03-07, in Core Data's reference-date seconds
+    batch = []
+    for pk in range(1, items + 1):
+        kind, _, mean_mb, extension = rng.choices(MEDIA_TYPES, weights)[0]
+        item_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+        created += rng.expovariate(1 / 600)
+        size = max(2048, int(rng.gauss(thumb_kb, thumb_kb / 4) * 1024))
+        start = rng.randrange(len(noise) - size)
+        batch.append(
+            (
+                pk,
+                1,
+                1,
+                item_id.bytes,
+                f"IMG_{pk:06d}.{extension}",
+                extension,
+                int(rng.lognormvariate(0, 0.6) * mean_mb * 1e6),
+                kind,
+                f"EncryptedMedia/{item_id}_IMG_{pk:06d}.{extension}.encrypted",
+                created,
+                created,
+                4032 if kind != "document" else None,
+                3024 if kind != "document" else None,
+                rng.uniform(2, 600) if kind == "video" else None,
+                b"\xff\xd8\xff\xe0" + noise[start : start + size - 4],
+            )
+        )
+        if len(batch) == BATCH:
+            db.executemany(insert, batch)
+            batch = []
+    db.executemany(insert, batch)
+    db.commit()
+    db.close()
+
+
+def add_indexes(path):
+    db = sqlite3.connect(path)
+    for name, columns in PROPOSED_INDEXES.items():
+        db.execute(f"CREATE INDEX {name} ON {TABLE} ({', '.join(columns)})")
+    db.execute("ANALYZE")
+    db.commit()
+    db.close()
+
+
+def run_pattern(db, name, sql):
+    """Execute one pattern, doing in Python what the app does with the rows"""
+    rows = db.execute(sql)
+    if name == "fetch all":
+        return sum(row[FILE_SIZE] for row in rows)
+    if name == "fetch fileSize":
+        return sum(size for _, size in rows)
+    return rows.fetchall()
+
+
+def time_patterns(path, repeat):
+    """{pattern: (median ms, result, plan)}"""
+    results = {}
+    with MetadataStore(path) as store:
+        for name, (_, sql) in ACCESS_PATTERNS.items():
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                result = run_pattern(store.db, name, sql)
+                samples.append((time.perf_counter() - start) * 1000)
+            results[name] = (statistics.median(samples), result, store.query_plan(sql))
+    return results
+
+
+def object_mb(path):
+    with MetadataStore(path) as store:
+        sizes = store.object_sizes() or {}
+    return {name: size / 1e6 for name, (size, _) in sizes.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--thumb-kb", type=float, default=20, help="mean size")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per pattern")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--dir", help="work directory (default: system temp)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="swiftdata-bench-", dir=args.dir)
+    try:
+        path = os.path.join(workdir, "default.store")
+        print(f"🔧 Building {args.items} items (~{args.thumb_kb:g} KB thumbnails)...")
+        start = time.perf_counter()
+        build_store(path, args.items, args.thumb_kb, args.seed)
+        print(
+            f"   {os.path.getsize(path) / 1e6:.1f} MB in "
+            f"{time.perf_counter() - start:.1f}s"
+        )
+        bare = time_patterns(path, args.repeat)
+
+        start = time.perf_counter()
+        add_indexes(path)
+        built = time.perf_counter() - start
+        sizes = object_mb(path)
+        index_mb = sum(sizes.get(name, 0) for name in PROPOSED_INDEXES)
+        print(
+            f"   indexes: {index_mb:.1f} MB, built in {built:.1f}s "
+            f"(table {sizes.get(TABLE, 0):.1f} MB)"
+        )
+        indexed = time_patterns(path, args.repeat)
+
+        total = bare["sum fileSize"][1][0][0]
+        if bare["fetch all"][1] != total or bare["fetch fileSize"][1] != total:
+            raise SystemExit("❌ fetched and aggregated totals differ")
+        if bare["per-type totals"][1] != indexed["per-type totals"][1]:
+            raise SystemExit("❌ per-type totals differ with the indexes")
+
+        print(f"\n📊 {args.items} rows, median of {args.repeat}")
+        print(f"{'Pattern':<18}{'bare ms':>11}{'indexed ms':>12}{'vs fetch all':>14}")
+        baseline = bare["fetch all"][0]
+        for name in ACCESS_PATTERNS:
+            before, after = bare[name][0], indexed[name][0]
+            print(
+                f"{name:<18}{before:>11.2f}{after:>12.2f}"
+                f"{baseline / max(after, 1e-6):>13.0f}x"
+            )
+        print("\n🔎 Plans (bare → indexed)")
+        for name in ACCESS_PATTERNS:
+            print(f"   {name:<16}{' | '.join(bare[name][2])}")
+            print(f"   {'':<16}{' | '.join(indexed[name][2])}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Grid-page thumbnail load: inline SwiftData blobs vs a packed store.
+
+Builds a synthetic store (ZMEDIAITEM rows with ~20 KB thumbnails inline) and
+the equivalent pack, then times loading random grid pages:
+
+  per-row blobs   one SELECT per cell, as SwiftData faults thumbnailData for
+                  each visible MediaItem
+  page query      one SELECT for the whole page (best case for inline blobs)
+  pack slices     mmap'd pack, one slice per cell (no decryption)
+  pack decrypted  the same, plus AES-GCM for every thumbnail under the pack's
+                  single key
+
+The page's item ids come from the gallery query in every case and are not
+timed. "open" columns include opening the store or pack first, i.e. the
+first page after launch. Inline blobs here are plain JPEG-like bytes (what
+MediaImportService stores); legacy encrypted inline blobs would add one
+100 000-round PBKDF2 per cell on top.
+
+  python3 scripts/bench_thumbnails.py [--items 5000] [--page 60]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+import uuid
+
+from vault import derive_key
+from vault.format import SALT_LENGTH
+from vault.metadata import TABLE, create_store
+from vault.thumbpack import ThumbPack, write_pack
+
+PASSWORD = "benchmark"
+
+
+def build_fixture(workdir, items, mean_kb, seed):
+    rng = random.Random(seed)
+    noise = os.urandom(256 * 1024)
+    store_path = os.path.join(workdir, "default.store")
+    db = create_store(store_path)
+    rows = []
+    for pk in range(1, items + 1):
+        size = max(2048, int(rng.gauss(mean_kb, mean_kb / 4) * 1024))
+        start = rng.randrange(len(noise) - size)
+        thumbnail = b"\xff\xd8\xff\xe0" + noise[start : start + size - 4]
+        rows.append(
+            (pk, uuid.UUID(int=rng.getrandbits(128)).bytes, pk * 60.0, thumbnail)
+        )
+    db.executemany(
+        f"INSERT INTO {TABLE} (Z_PK, ZID, ZCREATEDAT, ZTHUMBNAILDATA) "
+        f"VALUES (?, ?, ?, ?)",
+        rows,
+    )
+    db.execute(f"CREATE INDEX ZMEDIAITEM_ZCREATEDAT ON {TABLE} (ZCREATEDAT)")
+    db.commit()
+    db.close()
+
+    salt = os.urandom(SALT_LENGTH)
+    key = derive_key(PASSWORD, salt)
+    pack_path = os.path.join(workdir, "thumbs.zntp")
+    gallery = sorted(rows, key=lambda row: -row[2])
+    with open(pack_path, "wb") as out:
+        write_pack(out, [(row[1], row[3]) for row in gallery], key, salt)
+    return store_path, pack_path, key
+
+
+def gallery_pages(store_path, page):
+    """[(pks, ids)] per page, in gallery order (newest first)"""
+    db = sqlite3.connect(store_path)
+    rows = db.execute(
+        f"SELECT Z_PK, ZID FROM {TABLE} ORDER BY ZCREATEDAT DESC"
+    ).fetchall()
+    db.close()
+    return [
+        ([pk for pk, _ in rows[i : i + page]], [zid for _, zid in rows[i : i + page]])
+        for i in range(0, len(rows), page)
+    ]
+
+
+def per_row(db, pks):
+    return [
+        db.execute(
+            f"SELECT ZTHUMBNAILDATA FROM {TABLE} WHERE Z_PK = ?", (pk,)
+        ).fetchone()[0]
+        for pk in pks
+    ]
+
+
+def page_query(db, pks):
+    marks = ",".join("?" * len(pks))
+    found = dict(
+        db.execute(
+            f"SELECT Z_PK, ZTHUMBNAILDATA FROM {TABLE} WHERE Z_PK IN ({marks})", pks
+        ).fetchall()
+    )
+    return [found[pk] for pk in pks]
+
+
+def pack_slices(pack, ids):
+    return [bytes(pack.record(item_id)) for item_id in ids]
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--page", type=int, default=60, help="cells per grid page")
+    parser.add_argument("--thumb-kb", type=float, default=20, help="mean size")
+    parser.add_argument("--pages", type=int, default=200, help="pages to sample")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--dir", help="work directory (default: system temp)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="zntp-bench-", dir=args.dir)
+    try:
+        print(f"🔧 Building {args.items} items (~{args.thumb_kb:g} KB thumbnails)...")
+        store_path, pack_path, key = build_fixture(
+            workdir, args.items, args.thumb_kb, args.seed
+        )
+        pages = gallery_pages(store_path, args.page)
+        rng = random.Random(args.seed)
+        sample = [rng.choice(pages) for _ in range(args.pages)]
+        print(
+            f"   store {os.path.getsize(store_path) / 1e6:.1f} MB, "
+            f"pack {os.path.getsize(pack_path) / 1e6:.1f} MB"
+        )
+
+        def with_db(fn):
+            def run(pks, ids, open_first):
+                db = sqlite3.connect(store_path) if open_first else shared_db
+                try:
+                    return fn(db, pks)
+                finally:
+                    if open_first:
+                        db.close()
+
+            return run
+
+        def with_pack(decrypt):
+            def run(pks, ids, open_first):
+                pack = ThumbPack(pack_path) if open_first else shared_pack
+                try:
+                    if decrypt:
+                        return pack.load_page(ids, key)
+                    return pack_slices(pack, ids)
+                finally:
+                    if open_first:
+                        pack.close()
+
+            return run
+
+        # (name, run, returns plaintext thumbnails)
+        methods = [
+            ("per-row blobs", with_db(per_row), True),
+            ("page query", with_db(page_query), True),
+            ("pack slices", with_pack(False), False),
+            ("pack decrypted", with_pack(True), True),
+        ]
+
+        shared_db = sqlite3.connect(store_path)
+        shared_pack = ThumbPack(pack_path)
+        print(f"\n📊 {args.page}-cell pages, {args.pages} random pages")
+        print(f"{'Method':<16}{'p50 ms':>9}{'p95 ms':>9}{'open+p50':>10}")
+        expected = per_row(shared_db, sample[0][0])
+        for name, run, plaintext in methods:
+            if plaintext and run(*sample[0], False) != expected:
+                raise SystemExit(f"❌ {name} returned different thumbnails")
+            warm, cold = [], []
+            for pks, ids in sample:
+                start = time.perf_counter()
+                run(pks, ids, False)
+                warm.append((time.perf_counter() - start) * 1000)
+                start = time.perf_counter()
+                run(pks, ids, True)
+                cold.append((time.perf_counter() - start) * 1000)
+            p50, p95 = _percentiles(warm)
+            print(f"{name:<16}{p50:>9.3f}{p95:>9.3f}{statistics.median(cold):>10.3f}")
+        shared_db.close()
+        shared_pack.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Benchmark ZNSC chunk sizes across file sizes.
+
+For every (chunk size, file size) cell a fresh child process encrypts a
+random plaintext file, decrypts it back (streamed, discarded) and performs
+random 64 KB seeks through the frame index. Running each cell in its own
+process makes peak RSS meaningful per cell.
+
+Columns:
+  enc / dec MiB/s  plaintext throughput (best of --repeat)
+  enc RSS          child's peak resident set while encrypting, minus its
+                   idle baseline (the writer's working memory)
+  dec RSS          peak after decrypting; includes the container's mapped
+                   pages, which the kernel can drop at any time
+  overhead         container bytes beyond the plaintext (32 per frame + 28)
+  seek p50/p95     one random read through a warm index (decrypts 1-2 frames)
+
+  python3 scripts/bench_znsc_chunks.py
+  python3 scripts/bench_znsc_chunks.py --chunks-kb 256,1024,4096 \\
+      --sizes-mb 0.5,4,50,500 --csv chunks.csv
+
+Key derivation is excluded from all timings; the files stay in the page
+cache, so this measures CPU and memory cost rather than the disk. All sizes
+are binary: MiB is 2**20 bytes, KB 2**10.
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+DEFAULT_CHUNKS_KB = "256,512,1024,2048,4096,8192"
+DEFAULT_SIZES_MB = "0.5,4,50,500"
+SEEKS = 50
+SEEK_LENGTH = 64 * 1024
+PASSWORD = "benchmark"
+
+FIELDS = [
+    "size_mib",
+    "chunk_kb",
+    "frames",
+    "enc_mibps",
+    "dec_mibps",
+    "enc_rss_mib",
+    "dec_rss_mib",
+    "overhead_bytes",
+    "overhead_pct",
+    "index_ms",
+    "seek_p50_ms",
+    "seek_p95_ms",
+]
+
+
+def _rss_mib():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_cell(plain_path, chunk_kb, workdir, repeat):
+    """Measure one cell in this (child) process; return a row dict"""
+    from vault import Container, FrameIndex, SeekableReader, derive_key, iter_plaintext
+    from vault.writer import encrypt_file
+
+    baseline = _rss_mib()
+    size = os.path.getsize(plain_path)
+    salt = bytes(16)
+    key = derive_key(PASSWORD, salt)
+    out = os.path.join(workdir, f"cell-{chunk_kb}.encrypted")
+
+    enc = dec = enc_rss = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        writer = encrypt_file(
+            plain_path, out, key=key, salt=salt, chunk_size=chunk_kb * 1024
+        )
+        elapsed = time.perf_counter() - start
+        enc = elapsed if enc is None else min(enc, elapsed)
+        if enc_rss is None:
+            enc_rss = _rss_mib() - baseline
+
+        start = time.perf_counter()
+        with Container(out) as container:
+            for _ in iter_plaintext(container, key):
+                pass
+        elapsed = time.perf_counter() - start
+        dec = elapsed if dec is None else min(dec, elapsed)
+
+    container_size = os.path.getsize(out)
+    rng = random.Random(chunk_kb)
+    latencies = []
+    with Container(out) as container:
+        start = time.perf_counter()
+        index = FrameIndex.build(container)
+        index_ms = (time.perf_counter() - start) * 1000
+        for _ in range(SEEKS):
+            offset = rng.randrange(max(1, size - SEEK_LENGTH))
+            reader = SeekableReader(container, key, index)  # no frame cache
+            start = time.perf_counter()
+            reader.read(offset, SEEK_LENGTH)
+            latencies.append((time.perf_counter() - start) * 1000)
+    os.unlink(out)
+
+    latencies.sort()
+    mib = size / (1024 * 1024)
+    overhead = container_size - size
+    return {
+        "size_mib": round(mib, 2),
+        "chunk_kb": chunk_kb,
+        "frames": writer.frames,
+        "enc_mibps": round(mib / enc, 1),
+        "dec_mibps": round(mib / dec, 1),
+        "enc_rss_mib": round(enc_rss, 1),
+        "dec_rss_mib": round(_rss_mib() - baseline, 1),
+        "overhead_bytes": overhead,
+        "overhead_pct": round(100 * overhead / size, 4) if size else 0,
+        "index_ms": round(index_ms, 3),
+        "seek_p50_ms": round(statistics.median(latencies), 3),
+        "seek_p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 3),
+    }
+
+
+def _write_plaintext(path, size):
+    block = os.urandom(1024 * 1024)
+    with open(path, "wb") as f:
+        remaining = size
+        while remaining:
+            n = min(remaining, len(block))
+            f.write(block[:n])
+            remaining -= n
+
+
+def _spawn_cell(plain_path, chunk_kb, workdir, repeat):
+    result = subprocess.run(
+        [
+            sys.executable,
+            os.path.abspath(__file__),
+            "--cell",
+            plain_path,
+            str(chunk_kb),
+            workdir,
+            str(repeat),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout)
+
+
+def print_table(rows):
+    header = (
+        f"{'Size MiB':>9}{'Chunk KB':>9}{'Frames':>7}{'Enc MiB/s':>10}{'Dec MiB/s':>10}"
+        f"{'Enc RSS':>8}{'Dec RSS':>8}{'Overhead':>10}{'Index ms':>9}"
+        f"{'Seek p50':>9}{'p95':>8}"
+    )
+    print(header)
+    last_size = None
+    for row in rows:
+        if last_size is not None and row["size_mib"] != last_size:
+            print()
+        last_size = row["size_mib"]
+        print(
+            f"{row['size_mib']:>9}{row['chunk_kb']:>9}{row['frames']:>7}"
+            f"{row['enc_mibps']:>10}{row['dec_mibps']:>10}"
+            f"{row['enc_rss_mib']:>8}{row['dec_rss_mib']:>8}"
+            f"{row['overhead_pct']:>9.3f}%{row['index_ms']:>9.2f}"
+            f"{row['seek_p50_ms']:>9.2f}{row['seek_p95_ms']:>8.2f}"
+        )
+
+
+def _float_list(text):
+    return [float(x) for x in text.split(",") if x]
+
+
+def main():
+    if len(sys.argv) == 6 and sys.argv[1] == "--cell":
+        _, _, plain_path, chunk_kb, workdir, repeat = sys.argv
+        row = run_cell(plain_path, int(chunk_kb), workdir, int(repeat))
+        print(json.dumps(row))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunks-kb", default=DEFAULT_CHUNKS_KB)
+    parser.add_argument(
+        "--sizes-mb", default=DEFAULT_SIZES_MB, help="plaintext sizes in MiB"
+    )
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--csv", metavar="FILE", help="also write rows as CSV")
+    parser.add_argument("--dir", help="work directory (default: system temp)")
+    args = parser.parse_args()
+
+    chunks = [int(kb) for kb in _float_list(args.chunks_kb)]
+    sizes = [int(mb * 1024 * 1024) for mb in _float_list(args.sizes_mb)]
+
+    workdir = tempfile.mkdtemp(prefix="znsc-chunks-", dir=args.dir)
+    rows = []
+    try:
+        for size in sizes:
+            plain_path = os.path.join(workdir, "plain.bin")
+            _write_plaintext(plain_path, size)
+            for chunk_kb in chunks:
+                print(
+                    f"⏱️  {size / (1024 * 1024):g} MiB @ {chunk_kb} KB...",
+                    file=sys.stderr,
+                )
+                rows.append(_spawn_cell(plain_path, chunk_kb, workdir, args.repeat))
+            os.unlink(plain_path)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print_table(rows)
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\n💾 Wrote {len(rows)} rows to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
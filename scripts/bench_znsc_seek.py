@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Time-to-first-byte for a seek into the middle of a large ZNSC container.
+
+Generates a container (500 MB by default, the app's import limit) in a
+temp directory and compares three ways of serving the first bytes at the
+midpoint:
+
+  full decrypt   decrypt the whole file to a temp file, then read it
+                 (what FileStorageService.createDecryptedTempFile does)
+  index (cold)   hop the length prefixes to build a frame index, then
+                 decrypt only the covering frame
+  index (warm)   load the frame index from its sidecar, then decrypt only
+                 the covering frame
+
+  python3 scripts/bench_znsc_seek.py [--size-mb 500] [--chunk-kb 4096]
+
+Key derivation is done once up front and excluded from every timing, since
+all three paths pay it equally.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from vault import Container, FrameIndex, SeekableReader, derive_key, iter_plaintext
+from vault.format import SALT_LENGTH
+from vault.index import load_or_build, sidecar_path
+from vault.writer import encrypt_stream
+
+PASSWORD = "benchmark"
+
+
+def _generate(path, size, key, salt, chunk_size):
+    block = os.urandom(1024 * 1024)
+    remaining = size
+
+    class _Source:
+        def read(self, n):
+            nonlocal remaining
+            n = min(n, remaining)
+            remaining -= n
+            return (block * (n // len(block) + 1))[:n] if n else b""
+
+    with open(path, "wb") as out:
+        return encrypt_stream(_Source(), out, key, salt, chunk_size)
+
+
+def _drop_page_cache(path):
+    """Best effort: evict the container so cold runs really hit the disk"""
+    if hasattr(os, "posix_fadvise"):
+        with open(path, "rb") as f:
+            os.fsync(f.fileno())
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def full_decrypt(path, key, offset, length, workdir):
+    out_path = os.path.join(workdir, "decrypted.tmp")
+    with Container(path) as container, open(out_path, "wb") as out:
+        for chunk in iter_plaintext(container, key):
+            out.write(chunk)
+    with open(out_path, "rb") as f:
+        f.seek(offset)
+        data = f.read(length)
+    os.unlink(out_path)
+    return data
+
+
+def index_cold(path, key, offset, length):
+    with Container(path) as container:
+        reader = SeekableReader(container, key, FrameIndex.build(container))
+        return reader.read(offset, length)
+
+
+def index_warm(path, key, offset, length):
+    with Container(path) as container:
+        reader = SeekableReader(container, key, load_or_build(container))
+        return reader.read(offset, length)
+
+
+def _time(fn, repeat, path, cold):
+    best = None
+    result = None
+    for _ in range(repeat):
+        if cold:
+            _drop_page_cache(path)
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=500)
+    parser.add_argument("--chunk-kb", type=int, default=4096)
+    parser.add_argument("--read-kb", type=int, default=64, help="bytes to fetch")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--cold",
+        action="store_true",
+        help="evict the container from the page cache before every run",
+    )
+    parser.add_argument("--dir", help="work directory (default: system temp)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="znsc-seek-", dir=args.dir)
+    try:
+        path = os.path.join(workdir, "bench.encrypted")
+        salt = os.urandom(SALT_LENGTH)
+        key = derive_key(PASSWORD, salt)
+        size = args.size_mb * 1024 * 1024
+
+        print(
+            f"🔧 Generating {args.size_mb} MB container ({args.chunk_kb} KB chunks)..."
+        )
+        start = time.perf_counter()
+        writer = _generate(path, size, key, salt, args.chunk_kb * 1024)
+        print(f"   {writer.frames} frames in {time.perf_counter() - start:.1f}s")
+
+        with Container(path) as container:
+            FrameIndex.build(container).save(sidecar_path(path))
+
+        offset = size // 2 + 12345  # deliberately not frame-aligned
+        length = args.read_kb * 1024
+        runs = [
+            ("full decrypt", lambda: full_decrypt(path, key, offset, length, workdir)),
+            ("index (cold)", lambda: index_cold(path, key, offset, length)),
+            ("index (warm)", lambda: index_warm(path, key, offset, length)),
+        ]
+
+        print(
+            f"\n📊 First {args.read_kb} KB at offset {offset} (best of {args.repeat})"
+        )
+        print(f"{'Method':<16}{'TTFB':>12}{'Speedup':>10}")
+        baseline = None
+        expected = None
+        for name, fn in runs:
+            elapsed, data = _time(fn, args.repeat, path, args.cold)
+            if expected is None:
+                expected = data
+            elif data != expected:
+                raise SystemExit(f"❌ {name} returned different bytes")
+            baseline = baseline or elapsed
+            print(f"{name:<16}{elapsed * 1000:>10.2f}ms{baseline / elapsed:>9.1f}x")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
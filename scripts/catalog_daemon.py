@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Long-lived Localizable.xcstrings query daemon.
+
+Keeps the catalog parsed and indexed in memory and answers lookups over a
+local Unix socket, so editor integrations and build scripts don't pay for
+starting Python and parsing ~250 KB of JSON on every question. Use
+catalog_query.py as the client.
+
+Protocol: one request line per connection, fields separated by tabs
+(`get<TAB>key`, `prefix<TAB>p<TAB>limit`, `reverse<TAB>value`, `stats`,
+`ping`); the answer is one JSON line whose first field is "found".
+
+The catalog file is polled for (mtime, size) changes. On change it is
+re-parsed and only entries whose content differs are re-indexed.
+"""
+
+import argparse
+import bisect
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+import catalog_query
+import project_paths
+
+
+def _values(entry):
+    """locale -> stringUnit value for one catalog entry"""
+    values = {}
+    for locale, loc in entry.get("localizations", {}).items():
+        unit = loc.get("stringUnit")
+        if unit and "value" in unit:
+            values[locale] = unit["value"]
+    return values
+
+
+class CatalogIndex:
+    """Key lookup, sorted-key prefix search and value -> keys reverse index"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._raw = {}  # key -> raw entry, used to detect changed entries
+        self._values = {}  # key -> {locale: value}
+        self._sorted_keys = []
+        self._reverse = {}  # value -> set of keys
+        self.loads = 0
+        self.last_changed = 0
+
+    def _unindex(self, key):
+        for value in self._values.pop(key, {}).values():
+            keys = self._reverse.get(value)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._reverse[value]
+
+    def _index(self, key, entry):
+        values = _values(entry)
+        self._values[key] = values
+        for value in values.values():
+            self._reverse.setdefault(value, set()).add(key)
+
+    def update(self, strings):
+        """Apply a freshly parsed `strings` dict; return the number of changed keys"""
+        with self._lock:
+            changed = 0
+            for key in [k for k in self._raw if k not in strings]:
+                self._unindex(key)
+                del self._raw[key]
+                i = bisect.bisect_left(self._sorted_keys, key)
+                del self._sorted_keys[i]
+                changed += 1
+            for key, entry in strings.items():
+                old = self._raw.get(key)
+                if old == entry:
+                    continue
+                if old is None:
+                    bisect.insort(self._sorted_keys, key)
+                else:
+                    self._unindex(key)
+                self._raw[key] = entry
+                self._index(key, entry)
+                changed += 1
+            self.loads += 1
+            if changed:
+                self.last_changed = time.time()
+            return changed
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._values:
+                return {"found": False, "key": key}
+            return {"found": True, "key": key, "values": self._values[key]}
+
+    def prefix(self, prefix, limit=100):
+        with self._lock:
+            i = bisect.bisect_left(self._sorted_keys, prefix)
+            keys = []
+            while i < len(self._sorted_keys) and len(keys) < limit:
+                key = self._sorted_keys[i]
+                if not key.startswith(prefix):
+                    break
+                keys.append(key)
+                i += 1
+        return {"found": bool(keys), "prefix": prefix, "keys": keys}
+
+    def reverse(self, value):
+        with self._lock:
+            keys = sorted(self._reverse.get(value, ()))
+        return {"found": bool(keys), "value": value, "keys": keys}
+
+    def stats(self):
+        with self._lock:
+            return {
+                "found": True,
+                "keys": len(self._values),
+                "values": len(self._reverse),
+                "loads": self.loads,
+                "last_changed": self.last_changed,
+            }
+
+
+class CatalogWatcher(threading.Thread):
+    """Re-index the catalog whenever its (mtime, size) changes"""
+
+    def __init__(self, path, index, interval=0.25):
+        super().__init__(daemon=True)
+        self.path = path
+        self.index = index
+        self.interval = interval
+        self._signature = None
+
+    def poll(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        signature = (st.st_mtime_ns, st.st_size)
+        if signature == self._signature:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                strings = json.load(f).get("strings", {})
+        except (OSError, ValueError) as e:
+            # Probably caught mid-write by a non-atomic writer; retry next poll
+            print(f"⚠️  Cannot load catalog yet: {e}", file=sys.stderr)
+            return
+        self._signature = signature
+        changed = self.index.update(strings)
+        print(f"🔄 Catalog indexed: {changed} keys changed", file=sys.stderr)
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            self.poll()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    timeout = 1.0  # a stalled client must not hold up the (serial) server
+
+    def handle(self):
+        try:
+            line = self.rfile.readline().decode("utf-8").rstrip("\n")
+        except (OSError, UnicodeDecodeError):
+            return
+        fields = line.split("\t")
+        index = self.server.index
+        cmd, args = fields[0], fields[1:]
+        try:
+            if cmd == "get" and args:
+                result = index.get(args[0])
+            elif cmd == "prefix" and args:
+                limit = int(args[1]) if len(args) > 1 else 100
+                result = index.prefix(args[0], limit)
+            elif cmd == "reverse" and args:
+                result = index.reverse(args[0])
+            elif cmd == "stats":
+                result = index.stats()
+            elif cmd == "ping":
+                result = {"found": True}
+            else:
+                result = {"found": False, "error": f"bad request: {line!r}"}
+        except ValueError as e:
+            result = {"found": False, "error": str(e)}
+        self.wfile.write(json.dumps(result, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+class CatalogServer(socketserver.UnixStreamServer):
+    """Serves connections one at a time; every query is a few dict operations,
+    so a thread per connection would cost more than the work itself."""
+
+    def __init__(self, path, index):
+        self.index = index
+        super().__init__(path, _Handler)
+
+
+def _remove_stale_socket(path):
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(path)
+    else:
+        probe.close()
+        print(f"❌ Daemon already running on {path}", file=sys.stderr)
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--catalog", default=project_paths.catalog_path())
+    parser.add_argument("--socket", help="socket path (default: per-user private dir)")
+    parser.add_argument("--interval", type=float, default=0.25, help="poll seconds")
+    args = parser.parse_args()
+
+    try:
+        path = args.socket or catalog_query.socket_path(args.catalog)
+    except PermissionError as e:
+        sys.exit(f"❌ {e}")
+    _remove_stale_socket(path)
+
+    index = CatalogIndex()
+    watcher = CatalogWatcher(args.catalog, index, args.interval)
+    watcher.poll()
+
+    # Bind with the socket already 0600, not chmod-ed after the fact
+    umask = os.umask(0o177)
+    try:
+        server = CatalogServer(path, index)
+    finally:
+        os.umask(umask)
+    watcher.start()
+
+    def _shutdown(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    print(f"📚 Serving {args.catalog} on {path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Find catalog keys that carry the same text, and fold them into one key.
+
+Keys are often added per screen, so the same string ends up under several
+names ("目录" / "Table of Contents" is both media.toc and media.toc.title).
+Every copy is one more entry for translators to keep in step and one more
+row in the string tables the app loads. This hashes each entry's
+(locale, value) pairs in one pass over the catalog and the tables of
+catalog_shards.py, and groups the keys whose values match in every
+locale. Keys with format specifiers are left out: their placeholders are
+typed by the call site, so equal text does not make them interchangeable.
+
+Equal text does not make two screens the same string, so keys are only
+folded within one module: the catalog_shards.py table their prefix routes
+to, else their first dotted segment (media.toc and media.toc.title, but
+not login.title and settings.appName). Within a module the key to keep is
+the one SwiftUI may look up on its own (a plain literal such as
+`.navigationTitle("...")` cannot be rewritten), then the one with the most
+lookups, then the shortest. The modules' kept keys are then proposed for
+merging across modules, chosen the same way; those merges are only
+applied with --cross-module.
+
+By default this only reports. With --apply, every `String(localized:)`
+and `Text("...")` lookup of a dropped key is rewritten to the kept one
+(its table argument too, if the kept key lives in another table), all
+files in one batch, and the dropped keys are deleted from their
+catalogs. Their fingerprints go on the next catalog_fingerprints.py run.
+
+  python3 scripts/catalog_duplicates.py            # report groups
+  python3 scripts/catalog_duplicates.py --apply    # fold within modules
+  python3 scripts/catalog_duplicates.py --apply --cross-module
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections import Counter, defaultdict
+
+import catalog_shards
+import file_writer
+import project_paths
+import swift_lexer
+import xcstrings
+
+
+def signature(entry):
+    """BLAKE2b of an entry's (locale, value) pairs; None if it has none"""
+    localizations = entry.get("localizations", {})
+    if not localizations:
+        return None
+    digest = hashlib.blake2b(digest_size=16)
+    for locale in sorted(localizations):
+        unit = localizations[locale].get("stringUnit")
+        if unit is not None and "value" in unit:
+            value = unit["value"]
+        else:
+            value = json.dumps(localizations[locale], sort_keys=True)
+        digest.update(f"{locale}\x1f{value}\x1e".encode("utf-8"))
+    return digest.digest()
+
+
+def duplicate_groups(strings):
+    """Lists of keys with identical values in every locale, in catalog order"""
+    by_signature = defaultdict(list)
+    for key, entry in strings.items():
+        if "%" in key:
+            continue
+        digest = signature(entry)
+        if digest is not None:
+            by_signature[digest].append(key)
+    return [keys for keys in by_signature.values() if len(keys) > 1]
+
+
+def choose(group, lookups, pinned):
+    """(key to keep, keys to drop, keys kept because they cannot be rewritten)"""
+    ranked = sorted(
+        group, key=lambda k: (k not in pinned, -lookups[k], len(k), k.lower())
+    )
+    keep = ranked[0]
+    drop = [k for k in ranked[1:] if k not in pinned]
+    stuck = [k for k in ranked[1:] if k in pinned]
+    return keep, drop, stuck
+
+
+def module_of(key, router):
+    """The table `key` routes to, else its first dotted segment"""
+    return router.route(key, default=None) or key.split(".", 1)[0]
+
+
+def plan_group(group, lookups, pinned, router):
+    """
+    ({dropped: kept} within modules, {dropped: kept} across modules, kept
+    key, stuck keys). Cross-module renames already point at the final key.
+    """
+    modules = defaultdict(list)
+    for key in group:
+        modules[module_of(key, router)].append(key)
+    within = {}
+    stuck = []
+    leaders = []
+    for keys in modules.values():
+        keep, drop, module_stuck = choose(keys, lookups, pinned)
+        within.update(dict.fromkeys(drop, keep))
+        stuck.extend(module_stuck)
+        leaders.append(keep)
+    keep, drop, leader_stuck = choose(leaders, lookups, pinned)
+    stuck.extend(leader_stuck)
+    across = dict.fromkeys(drop, keep)
+    return within, across, keep, stuck
+
+
+def swift_literal(text):
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def source_value(entry, source_language):
+    unit = entry.get("localizations", {}).get(source_language, {}).get("stringUnit")
+    return unit.get("value", "") if unit else ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="rewrite lookups and delete the duplicate keys",
+    )
+    parser.add_argument(
+        "--cross-module",
+        action="store_true",
+        help="with --apply, also fold keys from different modules",
+    )
+    args = parser.parse_args()
+
+    tables = project_paths.catalog_tables()
+    managed = set(tables)
+    try:
+        router = catalog_shards.PrefixRouter(tables)
+    except ValueError as e:
+        sys.exit(f"❌ catalog_tables: {e}")
+    main_catalog, strings, current = catalog_shards.load_tables(managed)
+    source_language = main_catalog.get("sourceLanguage", "en")
+    groups = duplicate_groups(strings)
+
+    files = {}
+    pinned = set()
+    lookups = Counter()
+    for path in project_paths.iter_localized_source_files():
+        with open(path, "r", encoding="utf-8") as f:
+            source = f.read()
+        try:
+            sites, literals, computed = catalog_shards.scan(source, strings, managed)
+        except swift_lexer.LexError as e:
+            sys.exit(f"❌ {os.path.relpath(path)}: {e} at offset {e.offset}")
+        files[path] = (source, sites)
+        pinned.update(literals, computed)
+        lookups.update(site.key for site in sites if site.key is not None)
+
+    renames = {}
+    proposed = 0
+    for group in groups:
+        within, across, keep, stuck = plan_group(group, lookups, pinned, router)
+        value = source_value(strings[keep], source_language)
+        print(f"\n♊ {value!r} x{len(group)}")
+        print(f"   keep  {keep} in {current[keep]}, {lookups[keep]} lookup(s)")
+        for key, kept in within.items():
+            print(
+                f"   dup   {key} in {current[key]}, {lookups[key]} lookup(s)"
+                + ("" if kept == keep else f" -> {kept}")
+            )
+        for key in across:
+            print(
+                f"   maybe {key} in {current[key]}, {lookups[key]} lookup(s), "
+                f"another module"
+            )
+        for key in stuck:
+            print(f"   stuck {key} (also used as a plain literal)")
+        renames.update(within)
+        proposed += len(across)
+        if args.cross_module:
+            renames.update(across)
+            # Keys folded into a module's kept key follow it to the final one
+            for key, kept in within.items():
+                renames[key] = across.get(kept, kept)
+
+    writer = file_writer.BatchWriter()
+    rewritten = 0
+    for path, (source, sites) in files.items():
+        edits = []
+        for site in sites:
+            keep = renames.get(site.key)
+            if keep is None:
+                continue
+            edits.append((site.token.start, site.token.end, swift_literal(keep)))
+            edits.extend(catalog_shards.site_edits(source, site, current[keep]))
+            rewritten += 1
+        if edits:
+            writer.add(path, catalog_shards.apply_edits(source, edits))
+
+    print(
+        f"\n📊 {len(groups)} groups, {len(renames)} of {len(strings)} keys "
+        f"redundant, {rewritten} lookups in {len(writer)} files to rewrite"
+    )
+    if proposed and not args.cross_module:
+        print(f"   {proposed} more across modules, left alone (see --cross-module)")
+    if not args.apply:
+        if renames:
+            print("   (report only; --apply rewrites and deletes)")
+        return
+
+    for path in writer.flush():
+        print(f"💾 Updated {os.path.relpath(path, project_paths.PROJECT_ROOT)}")
+    for table in sorted({current[key] for key in renames}):
+        if table == catalog_shards.DEFAULT_TABLE:
+            path = project_paths.catalog_path()
+        else:
+            path = project_paths.table_path(table)
+        catalog = xcstrings.load(path)
+        for key in renames:
+            catalog["strings"].pop(key, None)
+        if xcstrings.save(path, catalog):
+            print(f"💾 Updated {os.path.basename(path)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Flag translations whose English source text changed since they were made.
+
+Xcode leaves a zh-Hans stringUnit at "translated" when the en value it was
+translated from is edited, so stale translations look finished. This keeps
+a 16-hex-digit BLAKE2b fingerprint of each entry's source value, per
+translated locale, in Localizable.fingerprints.json next to the catalog
+(Xcode would drop unknown fields from the catalog itself). Each run is one
+pass over the catalog:
+
+  - no fingerprint yet (first run, new key or locale): record it, trust
+    the current state
+  - fingerprint differs: the source changed; a "translated" unit becomes
+    "needs_review" and the new fingerprint is recorded, so the flag in the
+    catalog is what carries the staleness from then on
+  - fingerprints of deleted keys and locales are dropped
+
+Reviewing means setting the unit back to "translated" (in Xcode or by
+hand); it stays that way until the source changes again. Only the changed
+entries are printed, so review work follows the edit, not the catalog. The
+exit status is 1 when something was flagged.
+
+  python3 scripts/catalog_fingerprints.py            # update and flag
+  python3 scripts/catalog_fingerprints.py --dry-run  # report only
+  python3 scripts/catalog_fingerprints.py --pending  # list needs_review units
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+import file_writer
+import project_paths
+import xcstrings
+
+VERSION = 1
+STALE_STATE = "needs_review"
+
+
+def fingerprint(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def source_text(key, entry, source_language):
+    """
+    The text translators work from: the source stringUnit's value, the
+    source localization as JSON for plural/device variations, else the key
+    """
+    localization = entry.get("localizations", {}).get(source_language)
+    if localization is None:
+        return key
+    unit = localization.get("stringUnit")
+    if unit is not None and "value" in unit:
+        return unit["value"]
+    return json.dumps(localization, sort_keys=True, ensure_ascii=False)
+
+
+def load_fingerprints(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if data.get("version") != VERSION:
+        sys.exit(f"❌ {path}: unsupported version {data.get('version')!r}")
+    return data["fingerprints"]
+
+
+def dumps_fingerprints(fingerprints):
+    data = {"version": VERSION, "fingerprints": fingerprints}
+    return json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True) + "\n"
+
+
+def update(catalog, fingerprints):
+    """
+    Compare and update in one pass. Returns (new fingerprints, [(key,
+    locale)] flagged stale, number initialised); `catalog` is edited in
+    place.
+    """
+    source_language = catalog.get("sourceLanguage", "en")
+    updated = {}
+    stale = []
+    initialised = 0
+    for key, entry in catalog.get("strings", {}).items():
+        localizations = entry.get("localizations", {})
+        targets = [locale for locale in localizations if locale != source_language]
+        if not targets:
+            continue
+        current = fingerprint(source_text(key, entry, source_language))
+        known = fingerprints.get(key, {})
+        for locale in targets:
+            recorded = known.get(locale)
+            if recorded is None:
+                initialised += 1
+            elif recorded != current:
+                unit = localizations[locale].get("stringUnit")
+                if unit is not None and unit.get("state") == "translated":
+                    unit["state"] = STALE_STATE
+                    stale.append((key, locale))
+            updated.setdefault(key, {})[locale] = current
+    return updated, stale, initialised
+
+
+def pending(catalog):
+    """[(key, locale)] of every unit currently marked needs_review"""
+    return [
+        (key, locale)
+        for key, entry in catalog.get("strings", {}).items()
+        for locale, localization in entry.get("localizations", {}).items()
+        if localization.get("stringUnit", {}).get("state") == STALE_STATE
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--catalog", default=project_paths.catalog_path())
+    parser.add_argument(
+        "--fingerprints",
+        help="fingerprint file (default: next to the project catalog)",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="report without writing anything"
+    )
+    parser.add_argument(
+        "--pending", action="store_true", help="list units awaiting review and exit"
+    )
+    args = parser.parse_args()
+
+    fingerprints_file = args.fingerprints or (
+        project_paths.fingerprints_path()
+        if os.path.abspath(args.catalog) == project_paths.catalog_path()
+        else os.path.splitext(args.catalog)[0] + ".fingerprints.json"
+    )
+    catalog = xcstrings.load(args.catalog)
+
+    if args.pending:
+        waiting = pending(catalog)
+        for key, locale in waiting:
+            print(f"   {locale:<8} {key}")
+        print(f"🔎 {len(waiting)} units need review")
+        return
+
+    first_run = not os.path.exists(fingerprints_file)
+    fingerprints = load_fingerprints(fingerprints_file)
+    updated, stale, initialised = update(catalog, fingerprints)
+    dropped = sum(
+        1
+        for key, locales in fingerprints.items()
+        for locale in locales
+        if locale not in updated.get(key, {})
+    )
+
+    for key, locale in stale:
+        print(f"⚠️  {locale:<8} {key}")
+    if first_run:
+        print(f"🆕 Recorded {initialised} fingerprints; nothing flagged on a first run")
+    else:
+        print(
+            f"🔍 {len(stale)} translations flagged {STALE_STATE}, "
+            f"{initialised} new, {dropped} dropped"
+        )
+
+    if args.dry_run:
+        print("   (dry run, nothing written)")
+        return
+    if stale and xcstrings.save(args.catalog, catalog):
+        print(f"💾 Updated {os.path.basename(args.catalog)}")
+    if file_writer.write_if_changed(fingerprints_file, dumps_fingerprints(updated)):
+        print(f"💾 Updated {os.path.basename(fingerprints_file)}")
+    if stale:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Tiny client for catalog_daemon.py.
+
+  catalog_query.py get export.title          # key -> {locale: value}
+  catalog_query.py prefix export. [LIMIT]    # keys starting with a prefix
+  catalog_query.py reverse 正在导出...         # keys whose value matches exactly
+  catalog_query.py stats | ping
+
+Prints the daemon's one-line JSON answer and exits as soon as it arrives.
+Exit status: 0 found, 1 not found, 2 daemon unreachable. With --autostart a
+missing daemon is started in the background first.
+"""
+
+import hashlib
+import os
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+
+COMMANDS = ("get", "prefix", "reverse", "stats", "ping")
+
+
+def socket_dir():
+    """
+    A directory only this user can enter: $XDG_RUNTIME_DIR, else a 0700
+    zeronet-catalog-<uid> directory in the temp dir. Raises PermissionError
+    if that name is taken by anything else, so a socket another user put
+    there is never mistaken for the daemon.
+    """
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return runtime
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    path = os.path.join(tempfile.gettempdir(), f"zeronet-catalog-{uid}")
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(path)
+    if (
+        not stat.S_ISDIR(st.st_mode)
+        or st.st_uid != uid
+        or stat.S_IMODE(st.st_mode) & 0o077
+    ):
+        raise PermissionError(f"{path} is not a private directory of uid {uid}")
+    return path
+
+
+def socket_path(catalog_file):
+    """Per-user, per-catalog socket path ($ZERONET_CATALOG_SOCKET overrides)"""
+    override = os.environ.get("ZERONET_CATALOG_SOCKET")
+    if override:
+        return override
+    tag = hashlib.sha1(os.path.realpath(catalog_file).encode("utf-8")).hexdigest()[:10]
+    return os.path.join(socket_dir(), f"zeronet-catalog-{tag}.sock")
+
+
+def query(path, line, timeout=5.0):
+    """Send one request line and return the raw response bytes"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(line.encode("utf-8") + b"\n")
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if chunk.endswith(b"\n"):
+                break
+        return b"".join(chunks)
+
+
+def _start_daemon(catalog_file, path):
+    daemon = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "catalog_daemon.py"
+    )
+    subprocess.Popen(
+        [sys.executable, daemon, "--catalog", catalog_file, "--socket", path],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def main(argv):
+    autostart = "--autostart" in argv
+    argv = [a for a in argv if a != "--autostart"]
+    if not argv or argv[0] not in COMMANDS:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+
+    import project_paths
+
+    catalog_file = project_paths.catalog_path()
+    try:
+        path = socket_path(catalog_file)
+    except PermissionError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    line = "\t".join(argv)
+
+    deadline = time.monotonic() + 3.0
+    started = False
+    while True:
+        try:
+            response = query(path, line)
+            break
+        except (FileNotFoundError, ConnectionRefusedError):
+            if not autostart or time.monotonic() > deadline:
+                print(f"❌ catalog daemon not running ({path})", file=sys.stderr)
+                return 2
+            if not started:
+                _start_daemon(catalog_file, path)
+                started = True
+            time.sleep(0.02)
+
+    sys.stdout.buffer.write(response)
+    sys.stdout.flush()
+    return 1 if response.startswith(b'{"found": false') else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Split Localizable.xcstrings into per-module string tables, or merge them back.
+
+Tables and the key prefixes they own are listed under "catalog_tables" in
+project_paths.json; a key goes to the table with the longest matching
+prefix (a character trie, so routing costs one walk down the key), and
+everything else stays in Localizable. Each table is its own
+Resources/<Table>.xcstrings, registered in the Xcode project next to
+Localizable, so a translator edit, a diff or a catalog tool run only
+touches the module it is about.
+
+Moving a key only works if its lookups follow, so the same run rewrites
+every call site in the app target, lexed once with swift_lexer.py:
+
+  String(localized: "export.title")
+      -> String(localized: "export.title", table: "Export")
+  Text("tags.add.title")
+      -> Text("tags.add.title", tableName: "Tags")
+
+An existing table argument is updated, or removed when the key goes back
+to Localizable. An interpolated key ("media.count \\(n)") follows the
+format key it resolves to ("media.count %lld"), else its text before the
+first interpolation. A key that also appears as a literal anywhere else (a
+`.navigationTitle("...")`, a Button label, interpolated or not) is looked
+up in Localizable by SwiftUI, so it stays there. Fingerprint sidecars from
+catalog_fingerprints.py move with their keys.
+
+Split is a rebalance: it reads Localizable and the existing tables, so it
+is also what to run after editing the prefixes. Merge folds every table
+back into Localizable and drops the table arguments. Key order follows
+Xcode's (case-insensitive), so split then merge gives back the original
+files.
+
+  python3 scripts/catalog_shards.py split [--dry-run]
+  python3 scripts/catalog_shards.py merge [--dry-run]
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+from collections import Counter, defaultdict, namedtuple
+
+import catalog_fingerprints
+import file_writer
+import project_paths
+import swift_lexer
+import xcstrings
+
+DEFAULT_TABLE = "Localizable"
+# Call name -> the label of its table argument
+TABLE_LABELS = {"String": "table", "Text": "tableName"}
+
+_END = None  # trie node entry holding the table of the prefix ending there
+
+# A lookup the tool can rewrite: the call, its key literal token, the key
+# (None if interpolated) and the literal's string_parts
+Site = namedtuple("Site", "call token key parts")
+
+# A printf-style specifier, as Xcode writes interpolations into keys
+_SPECIFIER = (
+    r"%(?:\d+\$)?[-+ #0']*\d*(?:\.\d+)?(?:hh|h|ll|l|q|z|t|j|L)?"
+    r"[@dDiuUxXoOfFeEgGcCsSaAp]"
+)
+
+
+class PrefixRouter:
+    """Key prefixes to table names in a character trie; the longest prefix wins"""
+
+    def __init__(self, tables):
+        self._root = {}
+        for table, prefixes in tables.items():
+            for prefix in prefixes:
+                if not prefix:
+                    raise ValueError(f"{table}: empty prefix")
+                node = self._root
+                for char in prefix:
+                    node = node.setdefault(char, {})
+                if node.get(_END, table) != table:
+                    raise ValueError(
+                        f"{prefix!r} is claimed by {node[_END]} and {table}"
+                    )
+                node[_END] = table
+
+    def route(self, key, default=DEFAULT_TABLE):
+        table = default
+        node = self._root
+        for char in key:
+            node = node.get(char)
+            if node is None:
+                break
+            table = node.get(_END, table)
+        return table
+
+
+def merged_order(base, extra):
+    """
+    `base` keys in their order, with each `extra` key after the last base
+    key that sorts at or before it case-insensitively, like Xcode inserts
+    """
+    lowered = [key.lower() for key in base]
+    after = defaultdict(list)
+    for key in sorted(extra, key=lambda k: (k.lower(), k)):
+        folded = key.lower()
+        at = len(lowered) - 1
+        while at >= 0 and lowered[at] > folded:
+            at -= 1
+        after[at].append(key)
+    order = list(after[-1])
+    for at, key in enumerate(base):
+        order.append(key)
+        order.extend(after[at])
+    return order
+
+
+def fingerprints_file(table):
+    """The catalog_fingerprints.py sidecar of a table"""
+    if table == DEFAULT_TABLE:
+        return project_paths.fingerprints_path()
+    return os.path.splitext(project_paths.table_path(table))[0] + ".fingerprints.json"
+
+
+def load_tables(tables):
+    """(Localizable catalog, {key: entry} in merged order, {key: current table})"""
+    main = xcstrings.load(project_paths.catalog_path())
+    strings = dict(main.get("strings", {}))
+    current = dict.fromkeys(strings, DEFAULT_TABLE)
+    extra = []
+    for table in tables:
+        path = project_paths.table_path(table)
+        if not os.path.exists(path):
+            continue
+        for key, entry in xcstrings.load(path).get("strings", {}).items():
+            if key in current:
+                sys.exit(f"❌ {key!r} is in both {current[key]} and {table}")
+            current[key] = table
+            strings[key] = entry
+            extra.append(key)
+    order = merged_order(list(main.get("strings", {})), extra)
+    return main, {key: strings[key] for key in order}, current
+
+
+def _string_tokens(source, start=0, end=None):
+    """Every string literal token, including those inside interpolations"""
+    for token in swift_lexer.tokenize(source, start, end):
+        if token.kind == swift_lexer.STRING:
+            yield token
+            for body_start, body_end in swift_lexer.interpolations(source, token):
+                yield from _string_tokens(source, body_start, body_end)
+
+
+def format_pattern(parts):
+    """Regex matching the format keys an interpolated literal resolves to"""
+    return re.compile(
+        "".join(
+            _SPECIFIER if part is None else re.escape(part.replace("%", "%%"))
+            for part in parts
+        )
+    )
+
+
+def _single_string(arg):
+    if len(arg.tokens) == 1 and arg.tokens[0].kind == swift_lexer.STRING:
+        return arg.tokens[0]
+    return None
+
+
+def _table_arg(call):
+    label = TABLE_LABELS[call.name]
+    for n, arg in enumerate(call.args):
+        if arg.label == label:
+            return n, arg
+    return None, None
+
+
+def scan(source, keys, managed):
+    """
+    ([Site], {literal}, {key}) for one file: lookups whose table can be
+    rewritten, the other literals (they may be keys SwiftUI looks up in
+    Localizable; a tuple of string_parts if interpolated) and keys looked
+    up in a computed table, which stay put
+    """
+    sites = []
+    claimed = set()
+    held = set()
+    for call in swift_lexer.iter_calls(source, TABLE_LABELS):
+        if not call.args:
+            continue
+        first = call.args[0]
+        if first.label != ("localized" if call.name == "String" else None):
+            continue
+        token = _single_string(first)
+        if token is None:
+            continue
+        _, table_arg = _table_arg(call)
+        if table_arg is not None:
+            table_token = _single_string(table_arg)
+            if table_token is None:
+                claimed.add(token.start)
+                held.add(swift_lexer.string_value(source, token))
+                continue
+            if swift_lexer.string_value(source, table_token) not in managed:
+                claimed.add(token.start)
+                continue
+        parts = swift_lexer.string_parts(source, token)
+        key = None if None in parts else "".join(parts)
+        if key is not None and key not in keys:
+            continue
+        claimed.add(token.start)
+        sites.append(Site(call, token, key, parts))
+    literals = set()
+    for token in _string_tokens(source):
+        if token.start not in claimed:
+            parts = swift_lexer.string_parts(source, token)
+            literals.add(tuple(parts) if None in parts else "".join(parts))
+    return sites, literals, held
+
+
+def site_table(site, decisions, router, format_keys):
+    """Table a rewritable lookup should name"""
+    if site.key is not None:
+        return decisions[site.key]
+    # Interpolated: the format key it resolves to, else its leading text
+    pattern = format_pattern(site.parts)
+    tables = {decisions[k] for k in format_keys if pattern.fullmatch(k)}
+    return tables.pop() if len(tables) == 1 else router.route(site.parts[0])
+
+
+def site_edits(source, site, table):
+    """[(start, end, replacement)] that make the lookup name `table`"""
+    call = site.call
+    label = TABLE_LABELS[call.name]
+    wanted = None if table == DEFAULT_TABLE else f'"{table}"'
+    n, arg = _table_arg(call)
+    if arg is not None:
+        if wanted is None:
+            return [(call.args[n - 1].end, arg.end, "")]
+        if source[arg.start : arg.end] == wanted:
+            return []
+        return [(arg.start, arg.end, wanted)]
+    if wanted is None:
+        return []
+    anchor = 0
+    if len(call.args) > 1 and call.args[1].label == "defaultValue":
+        anchor = 1
+    at = call.args[anchor].end
+    if anchor + 1 < len(call.args) and "\n" in source[at : call.args[anchor + 1].start]:
+        line = source[source.rfind("\n", 0, at) + 1 :]
+        indent = line[: len(line) - len(line.lstrip(" \t"))]
+        return [(at, at, f",\n{indent}{label}: {wanted}")]
+    return [(at, at, f", {label}: {wanted}")]
+
+
+def apply_edits(source, edits):
+    for start, end, text in sorted(edits, reverse=True):
+        source = source[:start] + text + source[end:]
+    return source
+
+
+_FILE_REF = re.compile(
+    r"(\w{24}) /\* Localizable\.xcstrings \*/ = \{isa = PBXFileReference"
+)
+_BUILD_FILE = re.compile(r"(\w{24}) /\* Localizable\.xcstrings in Resources \*/")
+
+
+def _object_id(table, role):
+    return (
+        hashlib.blake2b(f"{table}.xcstrings/{role}".encode("utf-8"), digest_size=12)
+        .hexdigest()
+        .upper()
+    )
+
+
+def register_tables(pbxproj, present, managed):
+    """
+    The project with exactly the `present` tables registered: every line
+    naming Localizable.xcstrings (file reference, build file, group child,
+    Resources phase entry) is cloned for each, with deterministic ids.
+    Lines of other `managed` tables are dropped.
+    """
+    ref = _FILE_REF.search(pbxproj)
+    build = _BUILD_FILE.search(pbxproj)
+    if ref is None or build is None:
+        sys.exit("❌ Localizable.xcstrings is not in the Xcode project")
+    ref_id, build_id = ref.group(1), build.group(1)
+    names = tuple(f"/* {table}.xcstrings" for table in managed)
+    out = []
+    for line in pbxproj.splitlines(keepends=True):
+        if any(name in line for name in names):
+            continue
+        out.append(line)
+        if ref_id in line or build_id in line:
+            for table in sorted(present):
+                out.append(
+                    line.replace(ref_id, _object_id(table, "fileRef"))
+                    .replace(build_id, _object_id(table, "buildFile"))
+                    .replace("Localizable.xcstrings", f"{table}.xcstrings")
+                )
+    return "".join(out)
+
+
+def rebalance(router, managed, dry_run):
+    catalog_file = project_paths.catalog_path()
+    main, strings, current = load_tables(managed)
+
+    files = {}
+    pinned = set()
+    held = set()
+    for path in project_paths.iter_localized_source_files():
+        with open(path, "r", encoding="utf-8") as f:
+            source = f.read()
+        try:
+            sites, literals, computed = scan(source, strings, managed)
+        except swift_lexer.LexError as e:
+            sys.exit(f"❌ {os.path.relpath(path)}: {e} at offset {e.offset}")
+        files[path] = (source, sites)
+        pinned.update(literals)
+        held.update(computed)
+    format_keys = [key for key in strings if "%" in key]
+    patterns = [format_pattern(p) for p in pinned if isinstance(p, tuple)]
+    pinned = (pinned & strings.keys()) | {
+        key for key in format_keys if any(p.fullmatch(key) for p in patterns)
+    }
+
+    decisions = {}
+    for key in strings:
+        if key in held:
+            decisions[key] = current[key]
+        elif key in pinned:
+            decisions[key] = DEFAULT_TABLE
+        else:
+            decisions[key] = router.route(key)
+    writer = file_writer.BatchWriter()
+    edited_sites = 0
+    for path, (source, sites) in files.items():
+        edits = []
+        for site in sites:
+            changes = site_edits(
+                source, site, site_table(site, decisions, router, format_keys)
+            )
+            edited_sites += bool(changes)
+            edits.extend(changes)
+        if edits:
+            writer.add(path, apply_edits(source, edits))
+
+    counts = Counter(decisions.values())
+    before = Counter(current.values())
+    moved = sum(1 for key in strings if decisions[key] != current[key])
+    print(f"🔀 {len(strings)} keys, {moved} moving")
+    for table in [DEFAULT_TABLE] + sorted(managed):
+        if counts[table] or before[table]:
+            print(f"   {table:<14}{counts[table]:>5} keys (was {before[table]})")
+    routed_away = sorted(k for k in pinned if router.route(k) != DEFAULT_TABLE)
+    for key in routed_away:
+        print(f"📌 {key} stays in {DEFAULT_TABLE}: also used as a plain literal")
+    print(f"✏️  {edited_sites} call sites in {len(writer)} files")
+
+    if dry_run:
+        print("   (dry run, nothing written)")
+        return
+
+    present = sorted(t for t in managed if counts[t])
+    for table in [DEFAULT_TABLE] + sorted(managed):
+        path = (
+            catalog_file if table == DEFAULT_TABLE else project_paths.table_path(table)
+        )
+        if table != DEFAULT_TABLE and not counts[table]:
+            if os.path.exists(path):
+                os.unlink(path)
+                print(f"🗑️  Removed {os.path.basename(path)}")
+            continue
+        catalog = dict(main)
+        catalog["strings"] = {
+            key: entry for key, entry in strings.items() if decisions[key] == table
+        }
+        if xcstrings.save(path, catalog):
+            print(f"💾 Updated {os.path.basename(path)}")
+
+    _move_fingerprints(managed, decisions, counts)
+
+    for path in writer.flush():
+        print(f"💾 Updated {os.path.relpath(path, project_paths.PROJECT_ROOT)}")
+
+    pbxproj_file = project_paths.xcode_project_path()
+    with open(pbxproj_file, "r", encoding="utf-8") as f:
+        pbxproj = f.read()
+    if file_writer.write_if_changed(
+        pbxproj_file, register_tables(pbxproj, present, managed)
+    ):
+        print(f"💾 Updated {os.path.basename(pbxproj_file)}")
+
+
+def _move_fingerprints(managed, decisions, counts):
+    """Regroup catalog_fingerprints.py sidecars by the keys' new tables"""
+    tables = [DEFAULT_TABLE] + sorted(managed)
+    existing = [t for t in tables if os.path.exists(fingerprints_file(t))]
+    if not existing:
+        return
+    fingerprints = {}
+    for table in existing:
+        fingerprints.update(
+            catalog_fingerprints.load_fingerprints(fingerprints_file(table))
+        )
+    for table in tables:
+        path = fingerprints_file(table)
+        if table != DEFAULT_TABLE and not counts[table]:
+            if os.path.exists(path):
+                os.unlink(path)
+            continue
+        entries = {
+            key: locales
+            for key, locales in fingerprints.items()
+            if decisions.get(key) == table
+        }
+        if file_writer.write_if_changed(
+            path, catalog_fingerprints.dumps_fingerprints(entries)
+        ):
+            print(f"💾 Updated {os.path.basename(path)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help in (
+        ("split", "route keys into the configured tables and rewrite lookups"),
+        ("merge", "fold every table back into Localizable"),
+    ):
+        command = commands.add_parser(name, help=help)
+        command.add_argument(
+            "--dry-run", action="store_true", help="report without writing anything"
+        )
+    args = parser.parse_args()
+
+    tables = project_paths.catalog_tables()
+    if DEFAULT_TABLE in tables:
+        sys.exit(f"❌ {DEFAULT_TABLE} is the default table and cannot own prefixes")
+    try:
+        router = PrefixRouter(tables if args.command == "split" else {})
+    except ValueError as e:
+        sys.exit(f"❌ catalog_tables: {e}")
+    rebalance(router, set(tables), args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
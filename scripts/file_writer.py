@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Atomic, skip-if-unchanged file writes for the rewriters and catalog tools.
+
+Every write goes to a temp file in the target's directory, is fsynced and
+then renamed over the target, so an interrupted run never leaves a
+half-written Swift file or catalog behind. Content is compared against the
+file on disk first (size, then BLAKE2b digest); unchanged files are not
+touched at all, which keeps their mtimes and Xcode's incremental build
+state intact.
+
+BatchWriter collects many (path, content) pairs and flushes them from a
+thread pool.
+"""
+
+import contextlib
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=32).digest()
+
+
+def _encode(content, encoding):
+    return content if isinstance(content, bytes) else content.encode(encoding)
+
+
+def is_unchanged(path, data):
+    """True if `path` already holds exactly `data`"""
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        with open(path, "rb") as f:
+            return _digest(f.read()) == _digest(data)
+    except FileNotFoundError:
+        return False
+
+
+def _fsync_dir(directory):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # not supported on this platform
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def atomic_output(path):
+    """
+    Yield a binary file that replaces `path` only if the block succeeds.
+
+    For streamed output too large to hold in memory; on error the temp file
+    is removed and `path` is left untouched. The file's `name` is the temp
+    path, so the caller can re-read what it wrote before it is committed.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    os.close(fd)
+    try:
+        with open(tmp_path, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_dir(directory)
+
+
+def atomic_write(path, data):
+    """Write bytes to `path` via temp file + fsync + rename"""
+    with atomic_output(path) as f:
+        f.write(data)
+
+
+def write_if_changed(path, content, encoding="utf-8"):
+    """Atomically write `content` unless the file already matches; True if written"""
+    data = _encode(content, encoding)
+    if is_unchanged(path, data):
+        return False
+    atomic_write(path, data)
+    return True
+
+
+class BatchWriter:
+    """Queue file contents and flush them in parallel"""
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self._pending = {}
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, path, content, encoding="utf-8"):
+        self._pending[path] = _encode(content, encoding)
+
+    def flush(self):
+        """Write all queued files; return the paths that actually changed"""
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {
+                path: pool.submit(write_if_changed, path, data)
+                for path, data in pending.items()
+            }
+        # Every future has finished here; surface the first failure, if any
+        return [path for path, future in futures.items() if future.result()]
@@ -1,48 +1,65 @@
 #!/usr/bin/env python3
+import argparse
 import os
 import re
 import sys
 
+import git_changes
+import project_paths
 
-def find_chinese_strings(file_path):
-    """Find all Chinese strings in a Swift file"""
-    chinese_pattern = re.compile(r'"[^"]*[\u4e00-\u9fa5]+[^"]*"')
+CHINESE_PATTERN = re.compile(r'"[^"]*[\u4e00-\u9fa5]+[^"]*"')
+
+
+def find_chinese_in_text(content, file_path):
+    """Find all Chinese strings in Swift source text"""
     results = []
+    lines = content.split("\n")
+
+    for line_num, line in enumerate(lines, 1):
+        matches = CHINESE_PATTERN.findall(line)
+        for match in matches:
+            # Skip if it's already using String(localized:)
+            if "String(localized:" not in line:
+                results.append(
+                    {
+                        "file": os.path.basename(file_path),
+                        "line": line_num,
+                        "string": match,
+                        "context": line.strip(),
+                    }
+                )
+
+    return results
 
+
+def find_chinese_strings(file_path):
+    """Find all Chinese strings in a Swift file"""
     try:
         with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-            lines = content.split("\n")
-
-            for line_num, line in enumerate(lines, 1):
-                matches = chinese_pattern.findall(line)
-                for match in matches:
-                    # Skip if it's already using String(localized:)
-                    if "String(localized:" not in line:
-                        results.append(
-                            {
-                                "file": os.path.basename(file_path),
-                                "line": line_num,
-                                "string": match,
-                                "context": line.strip(),
-                            }
-                        )
+            return find_chinese_in_text(f.read(), file_path)
     except Exception as e:
         print(f"Error reading {file_path}: {e}", file=sys.stderr)
-
-    return results
+        return []
 
 
 def main():
-    base_path = "ZeroNet-Space/Views"
+    parser = argparse.ArgumentParser(description="Find hardcoded Chinese strings")
+    git_changes.add_arguments(parser)
+    args = parser.parse_args()
+
     all_results = []
 
-    for root, dirs, files in os.walk(base_path):
-        for file in files:
-            if file.endswith(".swift"):
-                file_path = os.path.join(root, file)
-                results = find_chinese_strings(file_path)
-                all_results.extend(results)
+    if git_changes.is_enabled(args):
+        _, changed = git_changes.collect(
+            args,
+            matcher=project_paths.source_matcher(),
+            project_root=project_paths.PROJECT_ROOT,
+        )
+        for file_path, content in changed:
+            all_results.extend(find_chinese_in_text(content, file_path))
+    else:
+        for file_path in project_paths.iter_source_files():
+            all_results.extend(find_chinese_strings(file_path))
 
     # Group by file
     by_file = {}
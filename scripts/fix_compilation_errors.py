@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 """iOS Internationalization Compilation Error Fixer"""
 
+import file_writer
+import project_paths
+
 
 def fix_disguise_settings():
-    path = "/Users/WangQiao/Desktop/github/ios-dev/ZeroNet-Space/ZeroNet_Space/ZeroNet-Space/Views/Disguise/DisguiseSettingsView.swift"
+    path = project_paths.project_path(
+        "ZeroNet-Space/Views/Disguise/DisguiseSettingsView.swift"
+    )
     with open(path, "r", encoding="utf-8") as f:
         lines = f.readlines()
 
@@ -18,13 +23,12 @@ def fix_disguise_settings():
         '                Button(String(localized: "disguise.confirmChange.continue"), role: .destructive) {\n'
     )
 
-    with open(path, "w", encoding="utf-8") as f:
-        f.writelines(lines)
+    file_writer.write_if_changed(path, "".join(lines))
     return "✅ DisguiseSettingsView.swift (3 errors fixed)"
 
 
 def fix_file_preview():
-    path = "/Users/WangQiao/Desktop/github/ios-dev/ZeroNet-Space/ZeroNet_Space/ZeroNet-Space/Views/Files/FilePreviewView.swift"
+    path = project_paths.project_path("ZeroNet-Space/Views/Files/FilePreviewView.swift")
     with open(path, "r", encoding="utf-8") as f:
         lines = f.readlines()
 
@@ -36,13 +40,14 @@ def fix_file_preview():
         '            exportError = String(localized: "filePreview.error.noPassword")\n'
     )
 
-    with open(path, "w", encoding="utf-8") as f:
-        f.writelines(lines)
+    file_writer.write_if_changed(path, "".join(lines))
     return "✅ FilePreviewView.swift (1 error fixed)"
 
 
 def fix_folder_list():
-    path = "/Users/WangQiao/Desktop/github/ios-dev/ZeroNet-Space/ZeroNet_Space/ZeroNet-Space/Views/Folders/FolderListView.swift"
+    path = project_paths.project_path(
+        "ZeroNet-Space/Views/Folders/FolderListView.swift"
+    )
     with open(path, "r", encoding="utf-8") as f:
         lines = f.readlines()
 
@@ -70,8 +75,7 @@ def fix_folder_list():
     # Fix line 364: Restore ToolbarItem opening brace
     lines[363] = "                ToolbarItem(placement: .cancellationAction) {\n"
 
-    with open(path, "w", encoding="utf-8") as f:
-        f.writelines(lines)
+    file_writer.write_if_changed(path, "".join(lines))
     return "✅ FolderListView.swift (8 errors fixed)"
 
 
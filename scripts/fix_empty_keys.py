@@ -3,9 +3,12 @@
 
 import json
 
+import project_paths
+import xcstrings
+
 
 def find_and_fix_empty_keys():
-    file_path = "/Users/WangQiao/Desktop/github/ios-dev/ZeroNet-Space/ZeroNet_Space/Resources/Localizable.xcstrings"
+    file_path = project_paths.catalog_path()
 
     with open(file_path, "r", encoding="utf-8") as f:
         data = json.load(f)
@@ -58,8 +61,7 @@ def find_and_fix_empty_keys():
             del data["strings"][key]
 
     # Write back
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    xcstrings.save(file_path, data)
 
     print(f"\n✅ Fixed {len(fixed_keys)} keys")
     print(f"✅ Removed {len(remaining_empty)} empty/junk keys")
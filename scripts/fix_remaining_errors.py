@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 """Fix remaining compilation errors in NetworkVerificationView and TagManagementView."""
 
+import file_writer
+import project_paths
+
 
 def fix_network_verification():
-    file_path = "/Users/WangQiao/Desktop/github/ios-dev/ZeroNet-Space/ZeroNet_Space/ZeroNet-Space/Views/Security/NetworkVerificationView.swift"
+    file_path = project_paths.project_path(
+        "ZeroNet-Space/Views/Security/NetworkVerificationView.swift"
+    )
 
     with open(file_path, "r", encoding="utf-8") as f:
         content = f.read()
@@ -29,12 +34,13 @@ def fix_network_verification():
     else:
         print("⚠ Pattern not found in NetworkVerificationView")
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(content)
+    file_writer.write_if_changed(file_path, content)
 
 
 def fix_tagmanagement():
-    file_path = "/Users/WangQiao/Desktop/github/ios-dev/ZeroNet-Space/ZeroNet_Space/ZeroNet-Space/Views/Tags/TagManagementView.swift"
+    file_path = project_paths.project_path(
+        "ZeroNet-Space/Views/Tags/TagManagementView.swift"
+    )
 
     with open(file_path, "r", encoding="utf-8") as f:
         content = f.read()
@@ -49,13 +55,14 @@ def fix_tagmanagement():
     else:
         print("⚠ Pattern not found in TagManagementView")
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(content)
+    file_writer.write_if_changed(file_path, content)
 
 
 def verify_structure():
     """Check EditTagView structure for missing closing brace."""
-    file_path = "/Users/WangQiao/Desktop/github/ios-dev/ZeroNet-Space/ZeroNet_Space/ZeroNet-Space/Views/Tags/TagManagementView.swift"
+    file_path = project_paths.project_path(
+        "ZeroNet-Space/Views/Tags/TagManagementView.swift"
+    )
 
     with open(file_path, "r", encoding="utf-8") as f:
         lines = f.readlines()
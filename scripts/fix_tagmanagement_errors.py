@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 """Fix TagManagementView.swift compilation errors."""
 
+import file_writer
+import project_paths
+
 
 def fix_tagmanagement():
-    file_path = "/Users/WangQiao/Desktop/github/ios-dev/ZeroNet-Space/ZeroNet_Space/ZeroNet-Space/Views/Tags/TagManagementView.swift"
+    file_path = project_paths.project_path(
+        "ZeroNet-Space/Views/Tags/TagManagementView.swift"
+    )
 
     with open(file_path, "r", encoding="utf-8") as f:
         content = f.read()
@@ -54,8 +59,7 @@ def fix_tagmanagement():
         else:
             print(f"⚠ Not found: {old[:50]}...")
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(content)
+    file_writer.write_if_changed(file_path, content)
 
     print(f"\n✅ Fixed TagManagementView.swift")
 
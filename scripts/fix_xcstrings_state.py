@@ -3,9 +3,12 @@
 
 import json
 
+import project_paths
+import xcstrings
+
 
 def fix_xcstrings():
-    input_file = "/Users/WangQiao/Desktop/github/ios-dev/ZeroNet-Space/ZeroNet_Space/Resources/Localizable.xcstrings"
+    input_file = project_paths.catalog_path()
 
     print("📖 Reading Localizable.xcstrings...")
     with open(input_file, "r", encoding="utf-8") as f:
@@ -18,10 +21,14 @@ def fix_xcstrings():
 
     # Process each string entry
     for key, value in data.get("strings", {}).items():
-        localizations = value.get("localizations", {})
+        localizations = value.get("localizations")
+        if not localizations:
+            continue  # leave empty entries untouched so no-op runs write nothing
 
         for lang, lang_data in localizations.items():
-            string_unit = lang_data.get("stringUnit", {})
+            if "stringUnit" not in lang_data:
+                continue  # plural/device variations carry their own units
+            string_unit = lang_data["stringUnit"]
 
             # Add 'state' field if missing
             if "state" not in string_unit:
@@ -39,10 +46,10 @@ def fix_xcstrings():
 
     # Write back to file
     print("💾 Writing updated file...")
-    with open(input_file, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-    print(f"\n✅ Successfully updated Localizable.xcstrings!")
+    if xcstrings.save(input_file, data):
+        print(f"\n✅ Successfully updated Localizable.xcstrings!")
+    else:
+        print(f"\n✅ Localizable.xcstrings already up to date, nothing written")
     print(f"   Total entries: {total_strings}")
     print(f"   Fixed fields: {fixed_count}")
 
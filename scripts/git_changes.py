@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Git-aware changed-file discovery for the i18n scripts.
+
+Changed Swift paths come from `git diff`, and their contents are read in bulk
+through a single long-lived `git cat-file --batch` process instead of opening
+files one by one. Used by find_chinese.py and replace_hardcoded_strings.py
+(`--staged` / `--since <rev>`) so a pre-commit hook only scans what changed.
+
+  --staged       scan the index, i.e. exactly what is about to be committed
+  --since REV    scan everything that differs from REV (index + working tree)
+"""
+
+import os
+import subprocess
+import sys
+import threading
+
+
+class GitError(RuntimeError):
+    """Raised when a git command fails"""
+
+
+def _git(root, *args):
+    result = subprocess.run(
+        ["git", "-C", root, *args],
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        raise GitError(result.stderr.decode("utf-8", "replace").strip())
+    return result.stdout
+
+
+def repo_root(start="."):
+    """Return the top-level directory of the git checkout containing `start`"""
+    return _git(start, "rev-parse", "--show-toplevel").decode("utf-8").strip()
+
+
+def _name_list(output):
+    return [p for p in output.decode("utf-8").split("\0") if p]
+
+
+def changed_paths(root, since=None, staged=False, suffix=".swift"):
+    """
+    List changed paths (relative to `root`) ending in `suffix`.
+
+    Deleted files are skipped; renames and copies report the new path.
+    """
+    if staged:
+        args = ["diff", "--cached", "--name-only", "-z", "--diff-filter=ACMR"]
+    else:
+        args = ["diff", "--name-only", "-z", "--diff-filter=ACMR", since or "HEAD"]
+    paths = _name_list(_git(root, *args))
+    if not staged:
+        # Untracked files are also "changed since <rev>"
+        paths += _name_list(
+            _git(root, "ls-files", "--others", "--exclude-standard", "-z")
+        )
+    seen = set()
+    return [p for p in paths if p.endswith(suffix) and not (p in seen or seen.add(p))]
+
+
+def dirty_paths(root):
+    """Paths whose working tree copy differs from the index (or are untracked)"""
+    paths = set(_name_list(_git(root, "diff", "--name-only", "-z")))
+    paths.update(
+        _name_list(_git(root, "ls-files", "--others", "--exclude-standard", "-z"))
+    )
+    return paths
+
+
+class BlobReader:
+    """
+    Long-lived `git cat-file --batch` process.
+
+    Object names are written from a helper thread while the caller reads
+    responses, so any number of blobs can be requested without the pipes
+    filling up and deadlocking.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._proc = subprocess.Popen(
+            ["git", "-C", root, "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._proc.poll() is None:
+            self._proc.stdin.close()
+            self._proc.wait()
+        self._proc.stdout.close()
+
+    def _feed(self, names):
+        try:
+            for name in names:
+                self._proc.stdin.write(name.encode("utf-8") + b"\n")
+            self._proc.stdin.flush()
+        except BrokenPipeError:
+            pass
+
+    def read_many(self, object_names):
+        """Yield (object_name, bytes or None) in request order"""
+        object_names = list(object_names)
+        writer = threading.Thread(target=self._feed, args=(object_names,), daemon=True)
+        writer.start()
+        out = self._proc.stdout
+        for name in object_names:
+            header = out.readline()
+            if not header:
+                raise GitError("git cat-file exited unexpectedly")
+            fields = header.split()
+            if fields[-1] == b"missing" or fields[-1] == b"ambiguous":
+                yield name, None
+                continue
+            size = int(fields[2])
+            data = out.read(size)
+            out.read(1)  # trailing LF
+            yield name, data
+        writer.join()
+
+
+def read_changed(root, paths, staged=False):
+    """
+    Yield (path, text) for each path.
+
+    With `staged`, content always comes from the index so partially staged
+    files are scanned exactly as they will be committed. Otherwise files that
+    match the index are read through cat-file and files with unstaged edits
+    are read from the working tree.
+    """
+    dirty = set() if staged else dirty_paths(root)
+    from_index = [p for p in paths if p not in dirty]
+    with BlobReader(root) as reader:
+        for name, data in reader.read_many(":" + p for p in from_index):
+            if data is not None:
+                yield name[1:], data.decode("utf-8")
+    for path in paths:
+        if path in dirty:
+            with open(os.path.join(root, path), "r", encoding="utf-8") as f:
+                yield path, f.read()
+
+
+def add_arguments(parser):
+    """Register --staged / --since on an argparse parser"""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--staged",
+        action="store_true",
+        help="only scan Swift files staged for commit (reads the index)",
+    )
+    group.add_argument(
+        "--since",
+        metavar="REV",
+        help="only scan Swift files changed since REV (index and working tree)",
+    )
+
+
+def is_enabled(args):
+    return bool(args.staged or args.since)
+
+
+def collect(args, matcher=None, project_root="."):
+    """
+    Return (root, [(path, text)]) for the changed Swift files.
+
+    `path` is relative to the git top level `root`; when a PathMatcher is
+    given only files it matches (relative to `project_root`) are kept.
+    """
+    try:
+        root = repo_root(project_root)
+        paths = changed_paths(root, since=args.since, staged=args.staged)
+    except GitError as e:
+        print(f"❌ git: {e}", file=sys.stderr)
+        sys.exit(2)
+    if matcher is not None:
+        paths = [
+            p
+            for p in paths
+            if matcher.matches(
+                os.path.relpath(os.path.join(root, p), os.path.realpath(project_root))
+            )
+        ]
+    return root, list(read_changed(root, paths, staged=args.staged))
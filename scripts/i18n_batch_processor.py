@@ -8,6 +8,9 @@ import re
 import os
 from pathlib import Path
 
+import file_writer
+import project_paths
+
 # 字符串映射表 - 中文到英文键的映射
 STRING_MAPPINGS = {
     # Videos
@@ -90,8 +93,8 @@ STRING_MAPPINGS = {
     "从文件导入": "import.fromFiles",
 }
 
-def replace_hardcoded_strings(file_path):
-    """替换文件中的硬编码字符串"""
+def replace_hardcoded_strings(file_path, writer=None):
+    """替换文件中的硬编码字符串（传入 writer 时延迟到 flush 时并行写入）"""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
@@ -114,8 +117,10 @@ def replace_hardcoded_strings(file_path):
                 print(f"  ✓ 替换: {chinese_str[:20]}... -> {key}")
 
         if changes_made > 0:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            if writer is not None:
+                writer.add(str(file_path), content)
+            else:
+                file_writer.write_if_changed(file_path, content)
             print(f"✅ {file_path.name}: 完成 {changes_made} 处替换")
             return True
         else:
@@ -128,19 +133,15 @@ def replace_hardcoded_strings(file_path):
 
 def main():
     """主函数"""
-    base_path = Path("/Users/WangQiao/Desktop/github/ios-dev/ZeroNet-Space/ZeroNet_Space/ZeroNet-Space/Views")
-
-    if not base_path.exists():
-        print(f"❌ 路径不存在: {base_path}")
-        return
-
-    swift_files = list(base_path.rglob("*.swift"))
+    swift_files = [Path(p) for p in project_paths.iter_source_files()]
     print(f"\n🔍 找到 {len(swift_files)} 个 Swift 文件\n")
 
+    writer = file_writer.BatchWriter()
     modified_count = 0
     for swift_file in swift_files:
-        if replace_hardcoded_strings(swift_file):
+        if replace_hardcoded_strings(swift_file, writer):
             modified_count += 1
+    writer.flush()
 
     print(f"\n✨ 完成！共修改 {modified_count} 个文件")
 
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Shared project paths and source discovery for the scripts in this directory.
+
+Paths live in project_paths.json and are resolved against the checkout root
+(the parent of this directory), so every script behaves the same no matter
+where the repository is cloned or which directory it is run from.
+
+The include/exclude globs are compiled once into a single PathMatcher.
+Discovery walks with os.scandir, starts from the literal prefix of each
+include glob and prunes excluded directories before descending into them.
+
+Glob syntax: `*` and `?` never cross `/`, `**` matches any number of
+directories (`**/` may also match none).
+"""
+
+import json
+import os
+import re
+import sys
+from functools import lru_cache
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_FILE = os.path.join(PROJECT_ROOT, "scripts", "project_paths.json")
+
+
+def _translate(glob):
+    """Translate one glob into a regex fragment (no anchors)"""
+    out = []
+    i = 0
+    while i < len(glob):
+        if glob.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif glob.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif glob[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif glob[i] == "?":
+            out.append("[^/]")
+            i += 1
+        else:
+            out.append(re.escape(glob[i]))
+            i += 1
+    return "".join(out)
+
+
+def _compile(globs):
+    if not globs:
+        return None
+    return re.compile("(?:" + "|".join(_translate(g) for g in globs) + r")\Z")
+
+
+def _literal_prefix(glob):
+    """Directory part of a glob before its first wildcard ("" for the root)"""
+    parts = []
+    for part in glob.split("/")[:-1]:
+        if any(c in part for c in "*?["):
+            break
+        parts.append(part)
+    return "/".join(parts)
+
+
+class PathMatcher:
+    """Include/exclude globs compiled into one regex each"""
+
+    def __init__(self, include, exclude=()):
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self._include = _compile(self.include)
+        self._exclude = _compile(self.exclude)
+
+        # Walk roots: literal prefixes of the include globs, minus nested ones
+        roots = sorted({_literal_prefix(g) for g in self.include})
+        self.roots = [
+            r
+            for r in roots
+            if not any(r != o and (o == "" or r.startswith(o + "/")) for o in roots)
+        ]
+
+    def is_excluded(self, rel_path, is_dir=False):
+        if self._exclude is None:
+            return False
+        if self._exclude.match(rel_path):
+            return True
+        return is_dir and bool(self._exclude.match(rel_path + "/"))
+
+    def has_excluded_parent(self, rel_path):
+        """True if any directory above a root-relative path is excluded"""
+        if self._exclude is None:
+            return False
+        parts = rel_path.split("/")[:-1]
+        return any(
+            self.is_excluded("/".join(parts[: n + 1]), is_dir=True)
+            for n in range(len(parts))
+        )
+
+    def _matches_leaf(self, rel_path):
+        if self._include is None or not self._include.match(rel_path):
+            return False
+        return not self.is_excluded(rel_path)
+
+    def matches(self, rel_path):
+        """
+        True if a root-relative file path is included, and neither it nor a
+        directory above it is excluded (iter_files prunes those on the way)
+        """
+        rel_path = rel_path.replace(os.sep, "/")
+        return self._matches_leaf(rel_path) and not self.has_excluded_parent(rel_path)
+
+    def iter_files(self, root=PROJECT_ROOT):
+        """
+        Yield root-relative paths of matching files, directory by directory
+        (depth first): a directory's own files, names sorted, come before
+        those of its subdirectories
+        """
+        for base in self.roots:
+            start = os.path.join(root, base) if base else root
+            if not os.path.isdir(start) or (base and self.is_excluded(base, True)):
+                continue
+            stack = [(start, base)]
+            while stack:
+                path, rel = stack.pop()
+                try:
+                    with os.scandir(path) as it:
+                        entries = sorted(it, key=lambda e: e.name, reverse=True)
+                except OSError as e:
+                    print(f"⚠️  Cannot read {path}: {e}", file=sys.stderr)
+                    continue
+                files = []
+                for entry in entries:
+                    child = f"{rel}/{entry.name}" if rel else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if not self.is_excluded(child, is_dir=True):
+                            stack.append((entry.path, child))
+                    elif self._matches_leaf(child):  # parents pruned above
+                        files.append(child)
+                yield from reversed(files)
+
+
+@lru_cache(maxsize=None)
+def load_config():
+    with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def project_path(*parts):
+    """Absolute path of a root-relative project path"""
+    return os.path.join(PROJECT_ROOT, *parts)
+
+
+def catalog_path():
+    """Resources/Localizable.xcstrings"""
+    return project_path(load_config()["catalog"])
+
+
+def fingerprints_path():
+    """Source-value fingerprints kept next to the catalog"""
+    return project_path(load_config()["catalog_fingerprints"])
+
+
+def catalog_tables():
+    """{table name: [key prefixes]} for catalog_shards.py"""
+    return load_config().get("catalog_tables", {})
+
+
+def table_path(table):
+    """The string table `table`.xcstrings, next to the main catalog"""
+    return os.path.join(os.path.dirname(catalog_path()), f"{table}.xcstrings")
+
+
+def xcode_project_path():
+    """The .pbxproj file"""
+    return project_path(load_config()["xcode_project"])
+
+
+@lru_cache(maxsize=None)
+def source_matcher():
+    """Matcher for the Swift sources the i18n scripts scan and rewrite"""
+    sources = load_config()["sources"]
+    return PathMatcher(sources["include"], sources.get("exclude", ()))
+
+
+def iter_source_files():
+    """Yield absolute paths of all matching Swift sources"""
+    for rel in source_matcher().iter_files():
+        yield project_path(rel)
+
+
+@lru_cache(maxsize=None)
+def localized_source_matcher():
+    """Matcher for every Swift source that may look up catalog keys"""
+    sources = load_config()["localized_sources"]
+    return PathMatcher(sources["include"], sources.get("exclude", ()))
+
+
+def iter_localized_source_files():
+    """Yield absolute paths of all Swift sources that may look up catalog keys"""
+    for rel in localized_source_matcher().iter_files():
+        yield project_path(rel)
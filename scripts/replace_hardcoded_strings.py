@@ -3,9 +3,14 @@
 Replace hardcoded Chinese strings with String(localized:) calls
 """
 
+import argparse
 import os
 import re
 
+import git_changes
+import file_writer
+import project_paths
+
 # Precise mapping of Chinese strings to localization keys
 STRING_MAPPINGS = {
     # Export
@@ -212,12 +217,8 @@ STRING_MAPPINGS = {
 }
 
 
-def replace_in_file(file_path, dry_run=True):
-    """Replace hardcoded Chinese strings in a Swift file"""
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    original_content = content
+def replace_in_text(content):
+    """Replace hardcoded Chinese strings in Swift source text"""
     replacements = []
 
     # Sort by length (longest first) to avoid partial replacements
@@ -248,14 +249,27 @@ def replace_in_file(file_path, dry_run=True):
                 {"old": chinese_str, "new": key, "position": match.start()}
             )
 
-    if content != original_content:
-        if not dry_run:
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(content)
+    return content, replacements
+
+
+def apply_replacements(file_path, content, dry_run=True, writable=True, writer=None):
+    """Rewrite one file's content and report what changed"""
+    new_content, replacements = replace_in_text(content)
+
+    if new_content != content:
+        if not dry_run and writable:
+            if writer is not None:
+                writer.add(file_path, new_content)
+            else:
+                file_writer.write_if_changed(file_path, new_content)
             print(
                 f"✅ Updated: {os.path.basename(file_path)} ({len(replacements)} replacements)"
             )
         else:
+            if not dry_run:
+                print(
+                    f"⚠️  Skipped: {os.path.basename(file_path)} has unstaged changes, stage or stash them first"
+                )
             print(
                 f"📝 Would update: {os.path.basename(file_path)} ({len(replacements)} replacements)"
             )
@@ -269,28 +283,25 @@ def replace_in_file(file_path, dry_run=True):
     return 0
 
 
-def main():
-    import sys
+def replace_in_file(file_path, dry_run=True, writer=None):
+    """Replace hardcoded Chinese strings in a Swift file"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        content = f.read()
+    return apply_replacements(file_path, content, dry_run=dry_run, writer=writer)
 
-    dry_run = "--dry-run" in sys.argv or "-n" in sys.argv
 
-    view_files = [
-        "ZeroNet-Space/Views/Export/BatchExportView.swift",
-        "ZeroNet-Space/Views/Folders/BatchFolderSelectionView.swift",
-        "ZeroNet-Space/Views/Tags/BatchTagSelectionView.swift",
-        "ZeroNet-Space/Views/Disguise/DisguiseSettingsView.swift",
-        "ZeroNet-Space/Views/Files/FilePreviewView.swift",
-        "ZeroNet-Space/Views/Files/FilesView.swift",
-        "ZeroNet-Space/Views/Folders/FolderListView.swift",
-        "ZeroNet-Space/Views/Folders/FolderSelectionView.swift",
-        "ZeroNet-Space/Views/Gallery/GalleryView.swift",
-        "ZeroNet-Space/Views/Import/ImportButtonsView.swift",
-        "ZeroNet-Space/Views/Components/LoadingOverlay.swift",
-        "ZeroNet-Space/Views/Gallery/MediaDetailView.swift",
-        "ZeroNet-Space/Views/Security/NetworkVerificationView.swift",
-        "ZeroNet-Space/Views/Tags/TagManagementView.swift",
-    ]
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replace hardcoded Chinese strings with String(localized:) calls"
+    )
+    parser.add_argument(
+        "--dry-run", "-n", action="store_true", help="report without modifying files"
+    )
+    git_changes.add_arguments(parser)
+    args = parser.parse_args()
+    dry_run = args.dry_run
 
+    writer = file_writer.BatchWriter()
     total_replacements = 0
     updated_files = 0
 
@@ -302,14 +313,36 @@ def main():
         print("LIVE MODE - Files will be modified")
     print("=" * 60 + "\n")
 
-    for file_path in view_files:
-        if os.path.exists(file_path):
-            count = replace_in_file(file_path, dry_run=dry_run)
+    if git_changes.is_enabled(args):
+        root, changed = git_changes.collect(
+            args,
+            matcher=project_paths.source_matcher(),
+            project_root=project_paths.PROJECT_ROOT,
+        )
+        # In --staged mode the index copy is scanned; writing it back over a
+        # file with unstaged edits would silently drop those edits.
+        dirty = git_changes.dirty_paths(root) if args.staged else set()
+        view_files = [path for path, _ in changed]
+        for path, content in changed:
+            count = apply_replacements(
+                os.path.join(root, path),
+                content,
+                dry_run=dry_run,
+                writable=path not in dirty,
+                writer=writer,
+            )
             if count > 0:
                 total_replacements += count
                 updated_files += 1
-        else:
-            print(f"⚠️  File not found: {file_path}")
+    else:
+        view_files = list(project_paths.iter_source_files())
+        for file_path in view_files:
+            count = replace_in_file(file_path, dry_run=dry_run, writer=writer)
+            if count > 0:
+                total_replacements += count
+                updated_files += 1
+
+    writer.flush()
 
     print(f"\n{'=' * 60}")
     print(f"Summary:")
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+A small single-pass Swift tokenizer for the source rewriters.
+
+The regex-based scripts in this directory find `String(localized: "...")`
+well enough to report on, but not to edit: a call split over two lines, a
+key with an escaped quote, `")"` inside an interpolation or a commented-out
+call all trip them up. This lexer knows just enough Swift to get those
+right: nested block comments, string literals with escapes and `\\(...)`
+interpolations (lexed recursively, so strings and parentheses inside them
+balance), multi-line `\"\"\"` strings and raw `#"..."#` strings. Everything
+else is an identifier, a number or a single punctuation character.
+
+Tokens are (kind, start, end) offsets into the source, never copies, so a
+rewriter can splice edits back in without re-serializing anything.
+
+    for call in iter_calls(source, {"String"}):
+        if call.args and call.args[0].label == "localized":
+            ...
+"""
+
+import re
+from collections import namedtuple
+
+Token = namedtuple("Token", "kind start end")
+Call = namedtuple("Call", "name start open close args")
+Argument = namedtuple("Argument", "label start end tokens")
+
+SPACE, COMMENT, STRING, IDENT, NUMBER, PUNCT = (
+    "space",
+    "comment",
+    "string",
+    "ident",
+    "number",
+    "punct",
+)
+TRIVIA = (SPACE, COMMENT)
+
+_TOKEN = re.compile(
+    r"""
+    (?P<space>\s+)
+  | (?P<line_comment>//[^\n]*)
+  | (?P<block_comment>/\*)
+  | (?P<string>\#*(?:\"\"\"|\"))
+  | (?P<ident>[^\W\d]\w*|`[^`\n]+`|\$\w+|\#\w+|@\w+)
+  | (?P<number>0[xob][\w]+|\d[\d_]*(?:\.\d[\d_]*)?(?:[eEpP][+-]?\d+)?)
+  | (?P<punct>.)
+    """,
+    re.X | re.S,
+)
+_BLOCK = re.compile(r"/\*|\*/")
+_ESCAPES = {"0": "\0", "\\": "\\", "t": "\t", "n": "\n", "r": "\r", '"': '"', "'": "'"}
+
+
+class LexError(ValueError):
+    """Unterminated comment, string or interpolation"""
+
+    def __init__(self, message, offset):
+        super().__init__(message)
+        self.offset = offset
+
+
+def _block_comment_end(source, pos):
+    depth = 0
+    for m in _BLOCK.finditer(source, pos):
+        depth += 1 if m.group() == "/*" else -1
+        if depth == 0:
+            return m.end()
+    raise LexError("unterminated block comment", pos)
+
+
+def _delimiters(source, pos):
+    """(hashes, quote) of the string literal opening at `pos`"""
+    hashes = 0
+    while source.startswith("#", pos + hashes):
+        hashes += 1
+    quote = '"""' if source.startswith('"""', pos + hashes) else '"'
+    return hashes, quote
+
+
+def _interpolation_end(source, pos):
+    """Offset just past the `)` closing an interpolation whose body starts at `pos`"""
+    depth = 0
+    end = len(source)
+    while pos < end:
+        token = _next_token(source, pos)
+        if token.kind == PUNCT:
+            char = source[pos]
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                if depth == 0:
+                    return token.end
+                depth -= 1
+        pos = token.end
+    raise LexError("unterminated interpolation", pos)
+
+
+def _string_end(source, pos, interpolations=None):
+    """
+    Offset just past the string literal opening at `pos`. The body spans of
+    its interpolations, `\\(` to `)` exclusive, go to `interpolations`.
+    """
+    hashes, quote = _delimiters(source, pos)
+    close = quote + "#" * hashes
+    escape = "\\" + "#" * hashes
+    i = pos + hashes + len(quote)
+    end = len(source)
+    while i < end:
+        char = source[i]
+        if char == "\\" and source.startswith(escape, i):
+            i += len(escape)
+            if i < end and source[i] == "(":
+                body_end = _interpolation_end(source, i + 1)
+                if interpolations is not None:
+                    interpolations.append((i + 1, body_end - 1))
+                i = body_end
+            else:
+                i += 1
+        elif char == '"' and source.startswith(close, i):
+            return i + len(close)
+        elif char == "\n" and quote == '"':
+            break
+        else:
+            i += 1
+    raise LexError("unterminated string literal", pos)
+
+
+def _next_token(source, pos):
+    m = _TOKEN.match(source, pos)
+    kind = m.lastgroup
+    if kind == "line_comment":
+        return Token(COMMENT, pos, m.end())
+    if kind == "block_comment":
+        return Token(COMMENT, pos, _block_comment_end(source, pos))
+    if kind == "string":
+        return Token(STRING, pos, _string_end(source, pos))
+    return Token(kind, pos, m.end())
+
+
+def tokenize(source, start=0, end=None):
+    """Yield every token of source[start:end], trivia included"""
+    end = len(source) if end is None else end
+    pos = start
+    while pos < end:
+        token = _next_token(source, pos)
+        yield token
+        pos = token.end
+
+
+def interpolations(source, token):
+    """Body spans (start, end) of the interpolations in a string token"""
+    spans = []
+    _string_end(source, token.start, spans)
+    return spans
+
+
+def _dedent(body, quote):
+    """Strip a multi-line literal's delimiter lines and closing indentation"""
+    if quote != '"""':
+        return body
+    lines = body.split("\n")
+    indent = lines[-1]
+    lines = lines[1:-1]
+    return "\n".join(
+        line[len(indent) :] if line.startswith(indent) else line.lstrip(" \t")
+        for line in lines
+    )
+
+
+def string_parts(source, token):
+    """
+    The decoded text of a string literal as a list of pieces, with None in
+    place of each interpolation: "a\\(x)b" -> ["a", None, "b"]
+    """
+    hashes, quote = _delimiters(source, token.start)
+    opening = hashes + len(quote)
+    body = _dedent(source[token.start + opening : token.end - opening], quote)
+    escape = "\\" + "#" * hashes
+    parts = []
+    text = []
+    i = 0
+    while i < len(body):
+        if not body.startswith(escape, i):
+            text.append(body[i])
+            i += 1
+            continue
+        i += len(escape)
+        char = body[i]
+        if char == "(":
+            parts.append("".join(text))
+            parts.append(None)
+            text = []
+            i = _interpolation_end(body, i + 1)
+        elif char == "u" and body.startswith("{", i + 1):
+            close = body.index("}", i)
+            text.append(chr(int(body[i + 2 : close], 16)))
+            i = close + 1
+        elif char == "\n":  # line continuation in a multi-line literal
+            i += 1
+        else:
+            text.append(_ESCAPES.get(char, char))
+            i += 1
+    parts.append("".join(text))
+    return parts
+
+
+def string_value(source, token):
+    """The literal's text, or None if it is interpolated"""
+    parts = string_parts(source, token)
+    return None if None in parts else "".join(parts)
+
+
+def static_prefix(source, token):
+    """The literal's text up to its first interpolation"""
+    return string_parts(source, token)[0]
+
+
+def _arguments(source, tokens, open_index):
+    """(index of the closing paren, [Argument]) for the call opened at open_index"""
+    args = []
+    depth = 0
+    current = []
+    i = open_index + 1
+    while i < len(tokens):
+        token = tokens[i]
+        char = source[token.start] if token.kind == PUNCT else ""
+        if char in ("(", "[", "{"):
+            depth += 1
+        elif char in (")", "]", "}"):
+            if depth == 0:
+                break
+            depth -= 1
+        if char == "," and depth == 0:
+            args.append(current)
+            current = []
+        else:
+            current.append(token)
+        i += 1
+    else:
+        raise LexError("unbalanced parentheses", tokens[open_index].start)
+    if current or args:
+        args.append(current)
+
+    result = []
+    for arg in args:
+        label = None
+        if (
+            len(arg) >= 2
+            and arg[0].kind == IDENT
+            and arg[1].kind == PUNCT
+            and source[arg[1].start] == ":"
+        ):
+            label = source[arg[0].start : arg[0].end].strip("`")
+            arg = arg[2:]
+        if arg:
+            result.append(Argument(label, arg[0].start, arg[-1].end, tuple(arg)))
+        else:
+            result.append(Argument(label, None, None, ()))
+    return i, result
+
+
+def iter_calls(source, names, start=0, end=None):
+    """
+    Yield a Call for every `name(...)` with `name` in `names`, in source
+    order, including calls nested in other calls' arguments and in string
+    interpolations. `open` and `close` are the offsets of the parentheses;
+    argument tokens exclude trivia.
+    """
+    tokens = [t for t in tokenize(source, start, end) if t.kind not in TRIVIA]
+    for i, token in enumerate(tokens):
+        if token.kind == STRING:
+            for body_start, body_end in interpolations(source, token):
+                yield from iter_calls(source, names, body_start, body_end)
+            continue
+        if (
+            token.kind != IDENT
+            or i + 1 == len(tokens)
+            or source[tokens[i + 1].start] != "("
+            or tokens[i + 1].kind != PUNCT
+            or source[token.start : token.end] not in names
+        ):
+            continue
+        close, args = _arguments(source, tokens, i + 1)
+        yield Call(
+            source[token.start : token.end],
+            token.start,
+            tokens[i + 1].start,
+            tokens[close].start,
+            args,
+        )
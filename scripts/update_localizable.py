@@ -5,6 +5,10 @@ Update Localizable.xcstrings with all missing localization keys
 
 import json
 
+import file_writer
+import project_paths
+import xcstrings
+
 
 def create_string_entry(key, en_value, zh_value, comment=""):
     """Create a localization string entry"""
@@ -20,13 +24,14 @@ def create_string_entry(key, en_value, zh_value, comment=""):
     return entry
 
 
+catalog_file = project_paths.catalog_path()
+
 # Load existing file
-with open("Resources/Localizable.xcstrings", "r", encoding="utf-8") as f:
+with open(catalog_file, "r", encoding="utf-8") as f:
     data = json.load(f)
 
 # Backup
-with open("Resources/Localizable.xcstrings.backup", "w", encoding="utf-8") as f:
-    json.dump(data, f, ensure_ascii=False, indent=2)
+file_writer.write_if_changed(catalog_file + ".backup", xcstrings.dumps(data))
 
 print("✅ Backup created: Localizable.xcstrings.backup")
 
@@ -435,10 +440,10 @@ for key, (en_val, zh_val) in new_keys.items():
         print(f"⚠️  Skipped existing key: {key}")
 
 # Save updated file
-with open("Resources/Localizable.xcstrings", "w", encoding="utf-8") as f:
-    json.dump(data, f, ensure_ascii=False, indent=2)
-
-print(f"\n✅ Localizable.xcstrings updated successfully!")
+if xcstrings.save(catalog_file, data):
+    print(f"\n✅ Localizable.xcstrings updated successfully!")
+else:
+    print(f"\n✅ Localizable.xcstrings already up to date, nothing written")
 print(f"   Existing keys: {existing_count}")
 print(f"   Added keys: {added_count}")
 print(f"   Skipped (already exist): {skipped_count}")
@@ -0,0 +1,41 @@
+"""
+Offline tooling for the app's encrypted vault (the EncryptedMedia directory).
+
+Reads and writes the chunked ZNSC container format and the legacy
+single-blob format produced by EncryptionService.swift, so backups can be
+verified and processed on Linux without the device. See format.py for the
+byte layout.
+
+AES-GCM requires the optional `cryptography` package; structural checks
+(headers, frame walking) work with the standard library alone.
+"""
+
+from .container import Container, Frame, Header, decrypt_stream, iter_plaintext
+from .crypto import derive_key
+from .index import FrameIndex, SeekableReader, open_seekable
+from .keys import KeyCache, KeyDeriver, read_salt
+from .format import (
+    AuthenticationError,
+    ContainerError,
+    CorruptContainerError,
+    TruncatedContainerError,
+)
+
+__all__ = [
+    "AuthenticationError",
+    "Container",
+    "ContainerError",
+    "CorruptContainerError",
+    "Frame",
+    "FrameIndex",
+    "Header",
+    "KeyCache",
+    "KeyDeriver",
+    "SeekableReader",
+    "TruncatedContainerError",
+    "decrypt_stream",
+    "derive_key",
+    "iter_plaintext",
+    "open_seekable",
+    "read_salt",
+]
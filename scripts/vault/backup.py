@@ -0,0 +1,236 @@
+"""
+Incremental backups of an EncryptedMedia directory.
+
+A backup directory holds two files:
+
+    data.znbk       "ZNBK" | version u8 (=1) | pad 3, then container files
+                    copied byte for byte, back to back, append-only
+    manifest.jsonl  one line per stored version of a file, giving its offset
+                    and length in data.znbk, plus one line per finished run
+
+Containers are already encrypted, so backing up needs no password. A run
+stats every container and only reads the ones whose size or mtime differ
+from the manifest; those are fingerprinted (salt, frame count and a hash of
+the header plus the first frame's IV and tag) and appended. A file whose
+fingerprint is unchanged was only touched and is not copied again. Each
+run is a numbered generation, so any earlier state can be restored, and a
+file is restored with one positioned read of its own byte range.
+
+Data is fsynced before the manifest lines that point at it are written; on
+open, anything in data.znbk past the last recorded byte (a crashed run) is
+truncated away.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+
+from .format import (
+    FRAME_OVERHEAD,
+    HEADER_SIZE,
+    LEGACY_OVERHEAD,
+    SALT_LENGTH,
+    ContainerError,
+    CorruptContainerError,
+)
+
+PACK_NAME = "data.znbk"
+MANIFEST_NAME = "manifest.jsonl"
+MAGIC = b"ZNBK"
+VERSION = 1
+PACK_HEADER = struct.Struct(">4sB3x")
+COPY_BUFFER = 1024 * 1024
+
+
+def _digest():
+    return hashlib.blake2b(digest_size=32)
+
+
+def fingerprint(container):
+    """
+    (salt hex, frame count or None, head hash hex) for an open Container.
+
+    The head covers the header plus the first frame's length, IV and tag
+    (salt, IV and tag for legacy blobs): every encryption draws a fresh
+    salt and IV, so a rewritten file never keeps its head.
+    """
+    head_size = HEADER_SIZE + FRAME_OVERHEAD if container.is_znsc else LEGACY_OVERHEAD
+    head = hashlib.blake2b(container.view[:head_size], digest_size=16).hexdigest()
+    salt = container.salt.hex() if container.size >= SALT_LENGTH else None
+    frames = None
+    if container.is_znsc:
+        try:
+            frames = sum(1 for _ in container.frames())
+        except ContainerError:
+            pass  # damaged: backed up as is, but without a frame count
+    return salt, frames, head
+
+
+class Manifest:
+    """
+    Append-only JSONL manifest. `files` maps name -> latest record of the
+    newest generation; records(at=) rebuilds the state of an older one.
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self._lock = threading.Lock()
+        self.lines = self._load()
+        self.generations = [r for r in self.lines if "commit" in r]
+        self.generation = max((r["gen"] for r in self.lines), default=0)
+        self.files = self.records()
+        self.end = max(
+            (r["offset"] + r["length"] for r in self.lines if "offset" in r),
+            default=PACK_HEADER.size,
+        )
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _load(self):
+        lines = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line
+                    if isinstance(record, dict) and "gen" in record:
+                        lines.append(record)
+        except FileNotFoundError:
+            pass
+        return lines
+
+    def records(self, at=None):
+        """{name: record} for every file present after generation `at`"""
+        files = {}
+        for record in self.lines:
+            if "name" not in record or (at is not None and record["gen"] > at):
+                continue
+            if record.get("deleted"):
+                files.pop(record["name"], None)
+            else:
+                files[record["name"]] = record
+        return files
+
+    def append(self, records):
+        """Write `records` and fsync them as one batch"""
+        if not records:
+            return
+        text = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(text)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.lines.extend(records)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class BackupStore:
+    """A backup directory: the pack plus its manifest"""
+
+    def __init__(self, directory, create=False):
+        self.directory = os.fspath(directory)
+        if create:
+            os.makedirs(self.directory, exist_ok=True)
+        self.pack_path = os.path.join(self.directory, PACK_NAME)
+        self.manifest = Manifest(os.path.join(self.directory, MANIFEST_NAME))
+        if not os.path.exists(self.pack_path):
+            if not create:
+                raise FileNotFoundError(f"{self.pack_path}: no backup here")
+            with open(self.pack_path, "wb") as f:
+                f.write(PACK_HEADER.pack(MAGIC, VERSION))
+                os.fsync(f.fileno())
+        self._pack = open(self.pack_path, "r+b")
+        magic, version = PACK_HEADER.unpack(self._pack.read(PACK_HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise CorruptContainerError(
+                f"{self.pack_path}: not a version {VERSION} pack"
+            )
+        size = os.fstat(self._pack.fileno()).st_size
+        if size < self.manifest.end:
+            self.close()
+            raise CorruptContainerError(
+                f"{self.pack_path}: {size} bytes, manifest needs {self.manifest.end}"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.manifest.close()
+        self._pack.close()
+
+    def begin(self):
+        """Start a new generation; drop any tail left by a crashed run"""
+        self._pack.truncate(self.manifest.end)
+        self._pack.seek(self.manifest.end)
+        return self.manifest.generation + 1
+
+    def append(self, container):
+        """Copy an open Container to the end of the pack; (offset, length, digest)"""
+        offset = self._pack.tell()
+        digest = _digest()
+        view = container.view
+        for start in range(0, container.size, COPY_BUFFER):
+            piece = view[start : start + COPY_BUFFER]
+            digest.update(piece)
+            self._pack.write(piece)
+        return offset, container.size, digest.hexdigest()
+
+    def sync(self):
+        self._pack.flush()
+        os.fsync(self._pack.fileno())
+
+    def iter_read(self, record, size=COPY_BUFFER):
+        """Stored bytes of one record in pieces; the digest is checked at the end"""
+        digest = _digest()
+        fd = self._pack.fileno()
+        offset, end = record["offset"], record["offset"] + record["length"]
+        while offset < end:
+            piece = os.pread(fd, min(size, end - offset), offset)
+            if not piece:
+                raise CorruptContainerError(f"{record['name']}: pack is truncated")
+            digest.update(piece)
+            offset += len(piece)
+            yield piece
+        if digest.hexdigest() != record["digest"]:
+            raise CorruptContainerError(f"{record['name']}: digest mismatch")
+
+
+def file_record(generation, name, mtime_ns, identity, stored):
+    """Manifest line for a container fingerprinted as `identity`"""
+    salt, frames, head = identity
+    offset, length, digest = stored
+    return {
+        "gen": generation,
+        "name": name,
+        "size": length,
+        "mtime_ns": mtime_ns,
+        "salt": salt,
+        "frames": frames,
+        "head": head,
+        "offset": offset,
+        "length": length,
+        "digest": digest,
+        "time": round(time.time(), 3),
+    }
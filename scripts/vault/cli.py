@@ -0,0 +1,67 @@
+"""Shared argument handling for the vault_*.py command-line tools."""
+
+import getpass
+import os
+import sys
+
+PASSWORD_ENV = "ZNSC_PASSWORD"
+NEW_PASSWORD_ENV = "ZNSC_NEW_PASSWORD"
+
+
+def add_password_arguments(parser, required=True):
+    parser.add_argument(
+        "--password-env",
+        metavar="VAR",
+        default=PASSWORD_ENV,
+        help=f"read the vault password from this environment variable "
+        f"(default {PASSWORD_ENV}); prompts if it is unset",
+    )
+    if not required:
+        parser.add_argument(
+            "--verify-tags",
+            action="store_true",
+            help="also authenticate every GCM tag (needs the password)",
+        )
+
+
+def add_new_password_arguments(parser):
+    parser.add_argument(
+        "--new-password-env",
+        metavar="VAR",
+        default=NEW_PASSWORD_ENV,
+        help=f"read the new vault password from this environment variable "
+        f"(default {NEW_PASSWORD_ENV}); prompts twice if it is unset",
+    )
+
+
+def _password(env_var, prompt, confirm=False):
+    password = os.environ.get(env_var)
+    if password:
+        return password
+    if not sys.stdin.isatty():
+        sys.exit(f"❌ Set {env_var} or run interactively")
+    password = getpass.getpass(prompt)
+    if not password:
+        sys.exit("❌ Empty password")
+    if confirm and getpass.getpass("Repeat: ") != password:
+        sys.exit("❌ Passwords do not match")
+    return password
+
+
+def read_password(args, prompt="Vault password: "):
+    """Password from the environment, else an interactive prompt"""
+    return _password(args.password_env, prompt)
+
+
+def read_new_password(args, prompt="New vault password: "):
+    """New password from the environment, else a confirmed prompt"""
+    return _password(args.new_password_env, prompt, confirm=True)
+
+
+def add_cache_arguments(parser):
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="read every container's header instead of the .znsc-headers "
+        "manifest, and leave the manifest alone",
+    )
@@ -0,0 +1,203 @@
+"""
+Zero-copy reader for ZNSC and legacy containers.
+
+A Container memory-maps the file read-only and hands out memoryview slices
+of it, so walking the frames of a 500 MB video touches only the pages that
+are actually read and never copies ciphertext. Plaintext is produced one
+frame at a time by iter_plaintext(), keeping memory at about one chunk.
+"""
+
+import mmap
+import os
+from collections import namedtuple
+
+from . import crypto
+from .format import (
+    CHUNK_INDICATOR_MAX,
+    FRAME_OVERHEAD,
+    HEADER,
+    HEADER_SIZE,
+    IV_LENGTH,
+    LEGACY_OVERHEAD,
+    LENGTH,
+    MAGIC,
+    SALT_LENGTH,
+    TAG_LENGTH,
+    VERSION,
+    CorruptContainerError,
+    TruncatedContainerError,
+)
+
+Header = namedtuple("Header", "version reserved chunk_kb salt")
+
+# `offset` is where the frame's length prefix starts; iv, tag and ciphertext
+# are memoryview slices into the mapping.
+Frame = namedtuple("Frame", "index offset length iv tag ciphertext")
+
+LegacyParts = namedtuple("LegacyParts", "salt iv tag ciphertext")
+
+
+def max_frame_length(chunk_kb):
+    """Largest ciphertext a frame may hold, or None if the indicator saturated"""
+    if chunk_kb >= CHUNK_INDICATOR_MAX:
+        return None
+    return chunk_kb * 1024
+
+
+class Container:
+    """Read-only mapping of one container file"""
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self._file = open(self.path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        if self.size:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.view = memoryview(self._mmap)
+        else:  # mmap refuses empty files
+            self._mmap = None
+            self.view = memoryview(b"")
+        self.is_znsc = self.view[: len(MAGIC)] == MAGIC
+        try:
+            self.header = self._parse_header() if self.is_znsc else None
+        except Exception:
+            self.close()
+            raise
+        self.terminated = False
+        self.end_offset = None  # offset just past the terminator, once seen
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.view.release()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # frame slices still alive; the mapping closes with them
+        self._file.close()
+
+    def advise(self, advice):
+        """madvise() the whole mapping where the platform supports it"""
+        if self._mmap is not None and hasattr(self._mmap, "madvise"):
+            self._mmap.madvise(advice)
+
+    @property
+    def is_legacy(self):
+        return not self.is_znsc
+
+    @property
+    def salt(self):
+        if self.is_znsc:
+            return bytes(self.header.salt)
+        return bytes(self.view[:SALT_LENGTH])
+
+    def _parse_header(self):
+        if self.size < HEADER_SIZE:
+            raise TruncatedContainerError(f"{self.path}: header is {self.size} bytes")
+        _, version, reserved, chunk_kb, salt = HEADER.unpack_from(self.view)
+        if version != VERSION:
+            raise CorruptContainerError(f"{self.path}: unsupported version {version}")
+        return Header(version, reserved, chunk_kb, salt)
+
+    def frames(self, strict=True):
+        """
+        Yield every Frame in order.
+
+        Raises TruncatedContainerError if the data ends before the zero
+        terminator (EncryptionService.decryptFile silently stops there) and,
+        when `strict`, CorruptContainerError for a frame longer than the
+        header's chunk size allows.
+        """
+        if not self.is_znsc:
+            raise CorruptContainerError(f"{self.path}: not a ZNSC container")
+        view = self.view
+        limit = max_frame_length(self.header.chunk_kb) if strict else None
+        offset = HEADER_SIZE
+        index = 0
+        while True:
+            if offset + LENGTH.size > self.size:
+                raise TruncatedContainerError(
+                    f"{self.path}: missing terminator after {index} frames"
+                )
+            (length,) = LENGTH.unpack_from(view, offset)
+            if length == 0:
+                self.terminated = True
+                self.end_offset = offset + LENGTH.size
+                return
+            if limit is not None and length > limit:
+                raise CorruptContainerError(
+                    f"{self.path}: frame {index} is {length} bytes, "
+                    f"chunk size is {limit}"
+                )
+            start = offset + LENGTH.size
+            end = offset + FRAME_OVERHEAD + length
+            if end > self.size:
+                raise TruncatedContainerError(
+                    f"{self.path}: frame {index} needs {end} bytes, file has {self.size}"
+                )
+            yield Frame(
+                index,
+                offset,
+                length,
+                view[start : start + IV_LENGTH],
+                view[start + IV_LENGTH : start + IV_LENGTH + TAG_LENGTH],
+                view[start + IV_LENGTH + TAG_LENGTH : end],
+            )
+            offset = end
+            index += 1
+
+    def legacy_parts(self):
+        """Split a legacy single-blob file into memoryview slices"""
+        if self.size <= LEGACY_OVERHEAD:
+            raise TruncatedContainerError(
+                f"{self.path}: legacy blob is only {self.size} bytes"
+            )
+        v = self.view
+        return LegacyParts(
+            v[:SALT_LENGTH],
+            v[SALT_LENGTH : SALT_LENGTH + IV_LENGTH],
+            v[SALT_LENGTH + IV_LENGTH : LEGACY_OVERHEAD],
+            v[LEGACY_OVERHEAD:],
+        )
+
+    def plaintext_size(self):
+        """Plaintext bytes (GCM ciphertext is the same length as its plaintext)"""
+        if self.is_znsc:
+            return sum(frame.length for frame in self.frames())
+        return max(0, self.size - LEGACY_OVERHEAD)
+
+
+def iter_plaintext(container, key, legacy_chunk_size=4 * 1024 * 1024):
+    """
+    Yield decrypted plaintext chunks from an open Container.
+
+    ZNSC frames are authenticated before they are yielded. A legacy blob has
+    a single tag, so its chunks are only authenticated once the iterator is
+    exhausted; AuthenticationError is raised at the end if it fails.
+    """
+    if container.is_znsc:
+        for frame in container.frames():
+            yield crypto.open_frame(key, frame.iv, frame.tag, frame.ciphertext)
+        return
+
+    parts = container.legacy_parts()
+    decryptor = crypto.stream_decryptor(key, parts.iv, parts.tag)
+    ciphertext = parts.ciphertext
+    for start in range(0, len(ciphertext), legacy_chunk_size):
+        yield decryptor.update(ciphertext[start : start + legacy_chunk_size])
+    tail = crypto.finalize(decryptor)
+    if tail:
+        yield tail
+
+
+def decrypt_stream(path, password, key=None):
+    """Open `path` and yield its plaintext chunk by chunk (bounded memory)"""
+    with Container(path) as container:
+        if key is None:
+            key = crypto.derive_key(password, container.salt)
+        yield from iter_plaintext(container, key)
@@ -0,0 +1,79 @@
+"""
+PBKDF2 key derivation and AES-256-GCM frame operations.
+
+Key derivation only needs hashlib. AES-GCM uses the optional `cryptography`
+package (pip install cryptography); it is imported lazily so structural
+tools keep working without it.
+"""
+
+import hashlib
+import os
+
+from .format import (
+    IV_LENGTH,
+    KEY_LENGTH,
+    PBKDF2_ITERATIONS,
+    AuthenticationError,
+)
+
+try:
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+except ImportError:  # pragma: no cover - depends on the environment
+    Cipher = None
+
+
+def require_crypto():
+    if Cipher is None:
+        raise RuntimeError(
+            "AES-GCM needs the 'cryptography' package: pip install cryptography"
+        )
+
+
+def derive_key(password, salt, iterations=PBKDF2_ITERATIONS):
+    """PBKDF2-HMAC-SHA256 exactly as EncryptionService.deriveKey"""
+    if not password:
+        raise ValueError("password must not be empty")
+    if isinstance(password, str):
+        password = password.encode("utf-8")
+    return hashlib.pbkdf2_hmac("sha256", password, bytes(salt), iterations, KEY_LENGTH)
+
+
+def seal_frame(key, plaintext, iv=None):
+    """Encrypt one frame; return (iv, tag, ciphertext)"""
+    require_crypto()
+    iv = iv or os.urandom(IV_LENGTH)
+    encryptor = Cipher(algorithms.AES(key), modes.GCM(iv)).encryptor()
+    ciphertext = encryptor.update(plaintext) + encryptor.finalize()
+    return iv, encryptor.tag, ciphertext
+
+
+def open_frame(key, iv, tag, ciphertext):
+    """Decrypt and authenticate one frame; `ciphertext` may be a memoryview"""
+    require_crypto()
+    decryptor = Cipher(
+        algorithms.AES(key), modes.GCM(bytes(iv), bytes(tag))
+    ).decryptor()
+    plaintext = decryptor.update(ciphertext)
+    try:
+        decryptor.finalize()
+    except InvalidTag:
+        raise AuthenticationError("GCM tag mismatch (wrong password or tampered data)")
+    return plaintext
+
+
+def stream_decryptor(key, iv, tag):
+    """
+    Incremental GCM decryptor for the legacy single-blob layout.
+
+    Output from update() is unauthenticated until finalize() succeeds.
+    """
+    require_crypto()
+    return Cipher(algorithms.AES(key), modes.GCM(bytes(iv), bytes(tag))).decryptor()
+
+
+def finalize(decryptor):
+    try:
+        return decryptor.finalize()
+    except InvalidTag:
+        raise AuthenticationError("GCM tag mismatch (wrong password or tampered data)")
@@ -0,0 +1,58 @@
+"""
+On-disk constants and errors for the vault's encrypted containers.
+
+Mirrors EncryptionService.swift / AppConstants.swift:
+
+ZNSC (chunked, written by encryptFile(inputURL:to:password:preferredChunkSize:))
+    header  "ZNSC" | version u8 (=1) | reserved u8 | chunk KB u16 BE | salt 16
+    frames  ciphertext length u32 BE | IV 12 | GCM tag 16 | ciphertext
+    end     u32 0
+
+Legacy (single blob, written by encrypt(data:password:))
+    salt 16 | IV 12 | GCM tag 16 | ciphertext
+
+Keys are PBKDF2-HMAC-SHA256(password UTF-8, salt, 100 000 rounds, 32 bytes);
+every frame is AES-256-GCM with its own random IV and no associated data.
+"""
+
+import struct
+
+MAGIC = b"ZNSC"
+VERSION = 1
+
+SALT_LENGTH = 16
+IV_LENGTH = 12
+TAG_LENGTH = 16
+KEY_LENGTH = 32
+PBKDF2_ITERATIONS = 100_000
+
+HEADER = struct.Struct(">4sBBH16s")  # magic, version, reserved, chunk KB, salt
+HEADER_SIZE = HEADER.size  # 24
+LENGTH = struct.Struct(">I")
+FRAME_OVERHEAD = LENGTH.size + IV_LENGTH + TAG_LENGTH  # 32
+TERMINATOR = LENGTH.pack(0)
+LEGACY_OVERHEAD = SALT_LENGTH + IV_LENGTH + TAG_LENGTH  # 44
+
+MIN_CHUNK_SIZE = 256 * 1024
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+CHUNK_INDICATOR_MAX = 0xFFFF  # indicator saturates; no bound can be derived
+MAX_FILE_SIZE = 500 * 1024 * 1024
+
+ENCRYPTED_MEDIA_DIRECTORY = "EncryptedMedia"
+ENCRYPTED_FILE_EXTENSION = ".encrypted"
+
+
+class ContainerError(Exception):
+    """A file is not a valid container"""
+
+
+class TruncatedContainerError(ContainerError):
+    """The file ends before the zero-length terminator"""
+
+
+class CorruptContainerError(ContainerError):
+    """The header or a frame is structurally invalid"""
+
+
+class AuthenticationError(ContainerError):
+    """A GCM tag did not verify: wrong password or tampered data"""
@@ -0,0 +1,240 @@
+"""
+Frame-offset index and random-access reads for ZNSC containers.
+
+Playback currently decrypts a whole container to a temp file
+(FileStorageService.createDecryptedTempFile) before the player can seek.
+Every ZNSC frame is independently authenticated, so a read at plaintext
+offset X only needs the frames covering [X, X + n): the index maps each
+frame to its byte offset in the container and its first plaintext byte.
+
+Building the index hops over the u32 length prefixes (no decryption, a few
+page faults per frame). It can be kept in a sidecar next to the container,
+validated against the container's size and mtime:
+
+    "ZNIX" | version u8 | pad 3 | container size u64 | mtime ns u64 | count u32
+    frame offsets u64 * count | plaintext starts u64 * (count + 1)
+
+Integers in the arrays are little-endian.
+"""
+
+import bisect
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from . import crypto
+from .container import Container
+from .format import (
+    FRAME_OVERHEAD,
+    IV_LENGTH,
+    LENGTH,
+    TAG_LENGTH,
+    CorruptContainerError,
+    TruncatedContainerError,
+)
+
+SIDECAR_MAGIC = b"ZNIX"
+SIDECAR_VERSION = 1
+SIDECAR_HEADER = struct.Struct("<4sB3xQQI")
+SIDECAR_SUFFIX = ".znidx"
+
+
+def sidecar_path(container_path):
+    return os.fspath(container_path) + SIDECAR_SUFFIX
+
+
+def _le(values):
+    if sys.byteorder != "little":
+        values = array("Q", values)
+        values.byteswap()
+    return values
+
+
+class FrameIndex:
+    """
+    `offsets[i]` is where frame i's length prefix starts; `starts[i]` is its
+    first plaintext byte, and `starts[-1]` is the plaintext size.
+    """
+
+    def __init__(self, offsets, starts, size=None, mtime_ns=None):
+        self.offsets = offsets
+        self.starts = starts
+        self.size = size
+        self.mtime_ns = mtime_ns
+
+    def __len__(self):
+        return len(self.offsets)
+
+    @property
+    def plaintext_size(self):
+        return self.starts[-1]
+
+    @classmethod
+    def build(cls, container):
+        """
+        Walk the length prefixes of an open Container.
+
+        Readahead is switched off for the walk: on a cold page cache it would
+        pull in megabytes of ciphertext around each 4-byte prefix.
+        """
+        if not container.is_znsc:
+            raise CorruptContainerError(f"{container.path}: not a ZNSC container")
+        offsets = array("Q")
+        starts = array("Q", [0])
+        position = 0
+        random_access = getattr(mmap, "MADV_RANDOM", None)
+        if random_access is not None:
+            container.advise(random_access)
+        try:
+            for frame in container.frames():
+                offsets.append(frame.offset)
+                position += frame.length
+                starts.append(position)
+        finally:
+            if random_access is not None:
+                container.advise(mmap.MADV_NORMAL)
+        st = os.stat(container.path)
+        return cls(offsets, starts, st.st_size, st.st_mtime_ns)
+
+    def frame_for(self, position):
+        """Index of the frame holding plaintext byte `position`"""
+        return bisect.bisect_right(self.starts, position) - 1
+
+    def save(self, path):
+        count = len(self.offsets)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(
+                SIDECAR_HEADER.pack(
+                    SIDECAR_MAGIC, SIDECAR_VERSION, self.size, self.mtime_ns, count
+                )
+            )
+            _le(self.offsets).tofile(f)
+            _le(self.starts).tofile(f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, container_path=None):
+        """
+        Read a sidecar; return None if it is missing, malformed or (when
+        `container_path` is given) stale.
+        """
+        try:
+            with open(path, "rb") as f:
+                head = f.read(SIDECAR_HEADER.size)
+                if len(head) != SIDECAR_HEADER.size:
+                    return None
+                magic, version, size, mtime_ns, count = SIDECAR_HEADER.unpack(head)
+                if magic != SIDECAR_MAGIC or version != SIDECAR_VERSION:
+                    return None
+                offsets = array("Q")
+                starts = array("Q")
+                offsets.fromfile(f, count)
+                starts.fromfile(f, count + 1)
+        except (OSError, EOFError):
+            return None
+        if sys.byteorder != "little":
+            offsets.byteswap()
+            starts.byteswap()
+        if container_path is not None:
+            try:
+                st = os.stat(container_path)
+            except OSError:
+                return None
+            if (st.st_size, st.st_mtime_ns) != (size, mtime_ns):
+                return None
+        return cls(offsets, starts, size, mtime_ns)
+
+
+def load_or_build(container, write_sidecar=True):
+    """Sidecar index if it is current, else a freshly built (and saved) one"""
+    path = sidecar_path(container.path)
+    index = FrameIndex.load(path, container.path)
+    if index is None:
+        index = FrameIndex.build(container)
+        if write_sidecar:
+            try:
+                index.save(path)
+            except OSError:
+                pass  # read-only backup directory; the index still works
+    return index
+
+
+class SeekableReader:
+    """
+    Random-access plaintext reads over an open ZNSC Container.
+
+    Only the frames covering a requested range are decrypted; the last
+    decrypted frame is kept so sequential small reads (a player's buffer
+    refills) decrypt each frame once.
+    """
+
+    def __init__(self, container, key, index=None):
+        self.container = container
+        self.key = key
+        self.index = index if index is not None else FrameIndex.build(container)
+        self._cached = (None, b"")
+
+    @property
+    def size(self):
+        return self.index.plaintext_size
+
+    def _frame(self, i):
+        if self._cached[0] == i:
+            return self._cached[1]
+        offset = self.index.offsets[i]
+        view = self.container.view
+        (length,) = LENGTH.unpack_from(view, offset)
+        end = offset + FRAME_OVERHEAD + length
+        if end > self.container.size:
+            raise TruncatedContainerError(
+                f"{self.container.path}: frame {i} needs {end} bytes"
+            )
+        iv_start = offset + LENGTH.size
+        tag_start = iv_start + IV_LENGTH
+        ct_start = tag_start + TAG_LENGTH
+        plaintext = crypto.open_frame(
+            self.key,
+            view[iv_start:tag_start],
+            view[tag_start:ct_start],
+            view[ct_start:end],
+        )
+        if len(plaintext) != self.index.starts[i + 1] - self.index.starts[i]:
+            raise CorruptContainerError(
+                f"{self.container.path}: frame {i} does not match the index"
+            )
+        self._cached = (i, plaintext)
+        return plaintext
+
+    def read(self, offset, length):
+        """Plaintext bytes [offset, offset + length), clipped at end of data"""
+        if offset < 0 or length < 0:
+            raise ValueError("offset and length must be non-negative")
+        end = min(offset + length, self.size)
+        if offset >= end:
+            return b""
+        parts = []
+        i = self.index.frame_for(offset)
+        position = offset
+        while position < end:
+            start = self.index.starts[i]
+            plaintext = self._frame(i)
+            stop = min(end, start + len(plaintext))
+            parts.append(plaintext[position - start : stop - start])
+            position = stop
+            i += 1
+        return parts[0] if len(parts) == 1 else b"".join(parts)
+
+
+def open_seekable(path, password=None, key=None, write_sidecar=True):
+    """Open `path` for random access; the caller closes `reader.container`"""
+    container = Container(path)
+    try:
+        if key is None:
+            key = crypto.derive_key(password, container.salt)
+        return SeekableReader(container, key, load_or_build(container, write_sidecar))
+    except Exception:
+        container.close()
+        raise
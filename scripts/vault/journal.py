@@ -0,0 +1,77 @@
+"""
+Append-only JSONL checkpoint journal for long-running vault jobs.
+
+Each finished item appends one line and is fsynced, so an interrupted
+migration or re-key resumes where it stopped instead of starting over.
+Later lines for the same item override earlier ones; a torn last line
+(from a crash mid-append) is ignored on load.
+"""
+
+import json
+import os
+import threading
+import time
+
+
+class Journal:
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self._lock = threading.Lock()
+        self.entries = self._load()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _load(self):
+        entries = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(record, dict) and "item" in record:
+                        entries[record["item"]] = record
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def status(self, item):
+        record = self.entries.get(item)
+        return record["status"] if record else None
+
+    def record(self, item, status, **fields):
+        record = {"item": item, "status": status, "time": round(time.time(), 3)}
+        record.update(fields)
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.entries[item] = record
+        return record
+
+    def discard(self):
+        """Forget every entry and delete the journal file"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self.entries = {}
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
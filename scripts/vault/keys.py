@@ -0,0 +1,266 @@
+"""
+Batch key derivation for tools that process a whole vault.
+
+Every container has its own salt, so EncryptionService.deriveKey runs
+100 000 PBKDF2 rounds per file and a vault-wide job is dominated by key
+derivation. KeyDeriver reads all salts from the container headers first
+(a 24-byte read per file), derives the distinct ones across a process pool
+and keeps the results in a bounded LRU keyed by salt, so a verify or export
+job costs derivation time / cores plus its actual I/O.
+
+Keys are held in bytearrays and zeroed when evicted, on wipe() and at
+interpreter exit. That is best effort: copies made by hashlib or by the
+cipher library are outside our control.
+"""
+
+import atexit
+import functools
+import hashlib
+import os
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .crypto import derive_key
+from .format import (
+    HEADER,
+    HEADER_SIZE,
+    KEY_LENGTH,
+    MAGIC,
+    PBKDF2_ITERATIONS,
+    SALT_LENGTH,
+    TruncatedContainerError,
+)
+
+DEFAULT_CACHE_SIZE = 4096  # 32-byte keys; a large vault fits comfortably
+
+_live_caches = weakref.WeakSet()
+
+
+@atexit.register
+def _wipe_all():
+    for cache in list(_live_caches):
+        cache.wipe()
+
+
+def read_salt(path):
+    """Salt of a ZNSC or legacy container, from at most its first 24 bytes"""
+    with open(path, "rb") as f:
+        head = f.read(HEADER_SIZE)
+    if head[: len(MAGIC)] == MAGIC:
+        if len(head) < HEADER_SIZE:
+            raise TruncatedContainerError(f"{path}: header is {len(head)} bytes")
+        return HEADER.unpack(head)[4]
+    if len(head) < SALT_LENGTH:
+        raise TruncatedContainerError(f"{path}: only {len(head)} bytes")
+    return head[:SALT_LENGTH]
+
+
+def _zero(buffer):
+    buffer[:] = bytes(len(buffer))
+
+
+class KeyCache:
+    """Bounded salt -> key LRU whose entries are zeroed when dropped"""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._keys = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        _live_caches.add(self)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, salt):
+        return bytes(salt) in self._keys
+
+    def get(self, salt):
+        key = self._keys.get(bytes(salt))
+        if key is None:
+            self.misses += 1
+            return None
+        self._keys.move_to_end(bytes(salt))
+        self.hits += 1
+        return key
+
+    def put(self, salt, key):
+        salt = bytes(salt)
+        old = self._keys.pop(salt, None)
+        if old is not None:
+            _zero(old)
+        stored = bytearray(key)
+        self._keys[salt] = stored
+        while len(self._keys) > self.maxsize:
+            _, evicted = self._keys.popitem(last=False)
+            _zero(evicted)
+        return stored
+
+    def trim(self, keep=()):
+        """
+        Evict down to maxsize. Entries whose salt is in `keep` are handed
+        back instead of zeroed: the caller still holds them.
+        """
+        kept = []
+        while len(self._keys) > self.maxsize:
+            salt, evicted = self._keys.popitem(last=False)
+            if salt in keep:
+                kept.append(evicted)
+            else:
+                _zero(evicted)
+        return kept
+
+    def wipe(self):
+        for key in self._keys.values():
+            _zero(key)
+        self._keys.clear()
+
+
+# Set only in pool worker processes, which exit when the pool shuts down;
+# thread pools get the password bound to the task instead
+_worker_password = None
+
+
+def _init_worker(password):
+    global _worker_password
+    _worker_password = password
+
+
+def _derive(salt, iterations, password=None):
+    if password is None:
+        password = _worker_password
+    return hashlib.pbkdf2_hmac("sha256", password, salt, iterations, KEY_LENGTH)
+
+
+class KeyDeriver:
+    """
+    Derive and cache keys for one password.
+
+    Use as a context manager (or call close()) to shut the pool down and
+    wipe the cache.
+    """
+
+    def __init__(
+        self,
+        password,
+        workers=None,
+        cache=None,
+        iterations=PBKDF2_ITERATIONS,
+        executor="process",
+    ):
+        if not password:
+            raise ValueError("password must not be empty")
+        if isinstance(password, str):
+            password = password.encode("utf-8")
+        self._password = password
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache if cache is not None else KeyCache()
+        self.iterations = iterations
+        if executor not in ("process", "thread"):
+            raise ValueError(f"unknown executor {executor!r}")
+        self.executor = executor
+        self._pool = None
+        self._task = _derive
+        self._outgrown = []  # batch keys evicted while the caller holds them
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+            self._task = _derive
+        for key in self._outgrown:
+            _zero(key)
+        self._outgrown.clear()
+        self.cache.wipe()
+
+    def _executor(self):
+        if self._pool is None:
+            if self.executor == "process":
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    initializer=_init_worker,
+                    initargs=(self._password,),
+                )
+            else:  # hashlib releases the GIL while it runs PBKDF2
+                self._task = functools.partial(_derive, password=self._password)
+                self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def key_for(self, salt):
+        """Key for one salt, derived in-process on a cache miss"""
+        key = self.cache.get(salt)
+        if key is None:
+            key = self.cache.put(
+                salt, derive_key(self._password, salt, self.iterations)
+            )
+        return key
+
+    def derive_many(self, salts):
+        """
+        Return {salt: key} for every distinct salt, deriving misses in
+        parallel. Keys of a batch larger than the cache stay valid until
+        close(), but only maxsize of them stay cached.
+        """
+        distinct = list(dict.fromkeys(bytes(s) for s in salts))
+        # Every key of the batch is returned, so none of them may be evicted
+        # (and zeroed) while the batch is being filled in
+        maxsize = self.cache.maxsize
+        self.cache.maxsize = max(maxsize, len(distinct))
+        try:
+            keys = self._derive_batch(distinct)
+        finally:
+            self.cache.maxsize = maxsize
+        self._outgrown.extend(self.cache.trim(keep=keys))
+        return keys
+
+    def _derive_batch(self, distinct):
+        keys = {}
+        missing = []
+        for salt in distinct:
+            key = self.cache.get(salt)
+            if key is None:
+                missing.append(salt)
+            else:
+                keys[salt] = key
+        if len(missing) == 1 or (missing and self.workers == 1):
+            for salt in missing:
+                keys[salt] = self.key_for(salt)
+        elif missing:
+            pool = self._executor()
+            derived = pool.map(self._task, missing, [self.iterations] * len(missing))
+            for salt, key in zip(missing, derived):
+                keys[salt] = self.cache.put(salt, key)
+        return keys
+
+    def keys_for_paths(self, paths, io_workers=16):
+        """
+        Read every container's salt, then derive all keys in one batch.
+
+        Returns ({path: key}, {path: error}) so unreadable files can be
+        reported by the caller instead of aborting the job.
+        """
+        paths = list(paths)
+        salts = {}
+        errors = {}
+
+        def _read(path):
+            try:
+                return path, read_salt(path), None
+            except (OSError, TruncatedContainerError) as e:
+                return path, None, e
+
+        with ThreadPoolExecutor(max_workers=io_workers) as pool:
+            for path, salt, error in pool.map(_read, paths):
+                if error is None:
+                    salts[path] = salt
+                else:
+                    errors[path] = error
+        keys = self.derive_many(salts.values())
+        return {path: keys[salt] for path, salt in salts.items()}, errors
@@ -0,0 +1,58 @@
+"""
+Where containers live: FileStorageService keeps every encrypted item as
+`{UUID}_{originalName}.encrypted` (or `{UUID}.encrypted`) directly inside
+Documents/EncryptedMedia.
+"""
+
+import os
+import uuid
+
+from .format import ENCRYPTED_FILE_EXTENSION, ENCRYPTED_MEDIA_DIRECTORY
+
+
+def media_directory(path):
+    """Accept either the EncryptedMedia directory or its parent (Documents)"""
+    path = os.fspath(path)
+    nested = os.path.join(path, ENCRYPTED_MEDIA_DIRECTORY)
+    if os.path.basename(os.path.normpath(path)) != ENCRYPTED_MEDIA_DIRECTORY:
+        if os.path.isdir(nested):
+            return nested
+    return path
+
+
+def iter_containers(directory):
+    """Yield (path, os.DirEntry) for every container file, sorted by name"""
+    with os.scandir(directory) as it:
+        entries = [
+            entry
+            for entry in it
+            if entry.name.endswith(ENCRYPTED_FILE_EXTENSION)
+            and not entry.name.startswith(".")
+            and entry.is_file(follow_symlinks=False)
+        ]
+    entries.sort(key=lambda entry: entry.name)
+    for entry in entries:
+        yield entry.path, entry
+
+
+def original_name(file_name):
+    """
+    The name an item was imported under, from its container file name:
+    `{UUID}_{originalName}.encrypted` -> originalName, and `{UUID}.encrypted`
+    (imported without a name) -> UUID.
+    """
+    stem = file_name
+    if stem.endswith(ENCRYPTED_FILE_EXTENSION):
+        stem = stem[: -len(ENCRYPTED_FILE_EXTENSION)]
+    item_id, sep, name = stem.partition("_")
+    if sep and name and _is_uuid(item_id):
+        return name
+    return stem
+
+
+def _is_uuid(text):
+    try:
+        uuid.UUID(text)
+    except ValueError:
+        return False
+    return True
@@ -0,0 +1,277 @@
+"""
+Persistent header manifest: what every container in a directory looks like,
+without opening it.
+
+Batch tools need the same facts about every file before they can plan:
+ZNSC or legacy, chunk size, salt, frame count, plaintext size and whether
+the frame chain is intact. Getting them means opening the file, reading the
+24-byte header and hopping over every frame's length prefix. The manifest
+keeps them in one fixed-width record per file, in `.znsc-headers` next to
+the containers:
+
+    header  "ZNHM" | version u8 (=1) | pad 3 | count u32 | names bytes u32
+                                                                 (16 bytes)
+    record  size u64 | mtime ns u64 | plaintext u64 | frames u32
+            | chunk KB u16 | status u8 | version u8 | reserved u8 | salt 16
+            | pad 7                                              (56 bytes)
+    names   file names in record order, UTF-8, NUL-separated
+
+Integers are big-endian; records are sorted by file name. A record is used
+only while the file's size and mtime (from the directory scan the tools do
+anyway) still match; anything else is re-read and the manifest rewritten,
+so a refresh costs one stat per file plus the changed files.
+
+Statuses follow vault_scan.py: ok (ZNSC, frame chain intact), legacy,
+truncated and corrupt.
+"""
+
+import mmap
+import os
+import struct
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .container import Container
+from .format import (
+    LEGACY_OVERHEAD,
+    CorruptContainerError,
+    TruncatedContainerError,
+)
+from .layout import iter_containers
+
+MANIFEST_NAME = ".znsc-headers"
+MAGIC = b"ZNHM"
+VERSION = 1
+HEADER = struct.Struct(">4sB3xII")
+RECORD = struct.Struct(">QQQIHBBB16s7x")
+STATUSES = ("ok", "legacy", "truncated", "corrupt")
+
+
+class HeaderRecord(
+    namedtuple(
+        "HeaderRecord",
+        "size mtime_ns plaintext frames chunk_kb status_code version reserved salt",
+    )
+):
+    __slots__ = ()
+
+    @property
+    def status(self):
+        return STATUSES[self.status_code]
+
+
+def _encode(name):
+    return name.encode("utf-8", "surrogateescape")
+
+
+def walk_frames(container):
+    """
+    Frame count and plaintext size of an open ZNSC Container. Raises for a
+    truncated chain, an oversized frame or bytes after the terminator.
+    """
+    frames = plaintext = 0
+    for frame in container.frames(strict=True):
+        frames += 1
+        plaintext += frame.length
+    if container.end_offset != container.size:
+        raise CorruptContainerError(
+            f"{container.path}: {container.size - container.end_offset} bytes "
+            f"after the terminator"
+        )
+    return frames, plaintext
+
+
+def describe(path, stat=None):
+    """HeaderRecord for one container, read from disk. Raises OSError."""
+    if stat is None:
+        stat = os.stat(path)
+    version = reserved = chunk_kb = frames = plaintext = 0
+    salt = bytes(16)
+    try:
+        with Container(path) as container:
+            if container.is_legacy:
+                if container.size <= LEGACY_OVERHEAD:
+                    raise TruncatedContainerError(path)
+                status = "legacy"
+                salt = container.salt
+                plaintext = container.size - LEGACY_OVERHEAD
+            else:
+                if hasattr(mmap, "MADV_RANDOM"):
+                    container.advise(mmap.MADV_RANDOM)
+                header = container.header
+                version, reserved, chunk_kb = header[:3]
+                salt = bytes(header.salt)
+                status = "ok"
+                frames, plaintext = walk_frames(container)
+    except TruncatedContainerError:
+        status = "truncated"
+    except CorruptContainerError:
+        status = "corrupt"
+    return HeaderRecord(
+        stat.st_size,
+        stat.st_mtime_ns,
+        plaintext,
+        frames,
+        chunk_kb,
+        STATUSES.index(status),
+        version,
+        reserved,
+        salt,
+    )
+
+
+class HeaderManifest:
+    """
+    The manifest of one directory, keyed by file name. get()/put() are
+    thread-safe; save() writes it back only if something changed, dropping
+    files not seen since it was loaded when `prune` is set. With `path`
+    None nothing is read or written and every file is described afresh.
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path) if path is not None else None
+        self._lock = threading.Lock()
+        self._records = self._load()
+        self._seen = set()
+        self._changed = False
+        self.hits = self.misses = 0
+
+    def _load(self):
+        if self.path is None:
+            return {}
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return {}
+        if len(data) < HEADER.size:
+            return {}
+        magic, version, count, names_size = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            return {}  # a cache: unknown versions are simply rebuilt
+        names_start = HEADER.size + count * RECORD.size
+        if len(data) != names_start + names_size:
+            return {}
+        names = data[names_start:].decode("utf-8", "surrogateescape").split("\0")
+        if len(names) != count:
+            return {}
+        view = memoryview(data)[HEADER.size : names_start]
+        return dict(zip(names, map(HeaderRecord._make, RECORD.iter_unpack(view))))
+
+    def __len__(self):
+        return len(self._records)
+
+    def get(self, name, stat):
+        """Cached record for `name` if it still matches `stat`, else None"""
+        with self._lock:
+            self._seen.add(name)
+            record = self._records.get(name)
+        if (
+            record is None
+            or record.size != stat.st_size
+            or record.mtime_ns != stat.st_mtime_ns
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return record
+
+    def put(self, name, record):
+        with self._lock:
+            self._seen.add(name)
+            self._records[name] = record
+            self._changed = True
+
+    def lookup(self, path, stat=None):
+        """Record for `path`, from the manifest or freshly described"""
+        if stat is None:
+            stat = os.stat(path)
+        name = os.path.basename(path)
+        record = self.get(name, stat)
+        if record is None:
+            record = describe(path, stat)
+            self.put(name, record)
+        return record
+
+    def refresh(self, directory, workers=16, errors=False):
+        """
+        [(path, HeaderRecord)] for every container, in name order. Stale
+        and new files are described from a thread pool. Files that vanish
+        or cannot be read are left out, or with `errors` come back as
+        (path, OSError).
+        """
+        cached = self._records
+        seen = self._seen
+        records = []
+        stale = []
+        for path, entry in iter_containers(directory):
+            stat = entry.stat(follow_symlinks=False)
+            seen.add(entry.name)
+            record = cached.get(entry.name)
+            if (
+                record is None
+                or record.size != stat.st_size
+                or record.mtime_ns != stat.st_mtime_ns
+            ):
+                stale.append((len(records), entry.name, path, stat))
+                record = None
+            records.append((path, record))
+        self.hits += len(records) - len(stale)
+        self.misses += len(stale)
+
+        def _describe(item):
+            i, name, path, stat = item
+            try:
+                return i, name, describe(path, stat)
+            except OSError as e:
+                return i, name, e  # vanished or unreadable; not cached
+
+        if stale:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for i, name, record in pool.map(_describe, stale):
+                    if not isinstance(record, OSError):
+                        self.put(name, record)
+                    elif not errors:
+                        record = None
+                    records[i] = (records[i][0], record)
+        return [(path, record) for path, record in records if record is not None]
+
+    def save(self, prune=True):
+        """Write the manifest back if anything changed; True if written"""
+        with self._lock:
+            if self.path is None:
+                return False
+            if prune and len(self._seen) < len(self._records):
+                for name in self._records.keys() - self._seen:
+                    del self._records[name]
+                self._changed = True
+            if not self._changed:
+                return False
+            names = sorted(self._records)
+            blob = b"\0".join(_encode(name) for name in names)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as out:
+                out.write(HEADER.pack(MAGIC, VERSION, len(names), len(blob)))
+                out.write(b"".join(RECORD.pack(*self._records[n]) for n in names))
+                out.write(blob)
+            os.replace(tmp, self.path)
+            self._changed = False
+            return True
+
+
+def directory_records(directory, use_cache=True, workers=16):
+    """
+    [(path, HeaderRecord)] for every container in `directory`, through its
+    manifest unless `use_cache` is false. A manifest that cannot be written
+    (read-only copy) is still used for reading.
+    """
+    manifest = HeaderManifest(
+        os.path.join(directory, MANIFEST_NAME) if use_cache else None
+    )
+    records = manifest.refresh(directory, workers)
+    try:
+        manifest.save()
+    except OSError:
+        pass
+    return records
@@ -0,0 +1,261 @@
+"""
+Read-only access to a copy of the app's SwiftData store (default.store).
+
+SwiftData persists through Core Data's SQLite layout: MediaItem becomes the
+ZMEDIAITEM table, every attribute a Z-prefixed upper-case column, UUIDs
+16-byte blobs and Dates seconds since 2001-01-01 (Core Data's reference
+date). Always work on a copy; the store is opened read-only regardless.
+"""
+
+import csv
+import sqlite3
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+TABLE = "ZMEDIAITEM"
+REFERENCE_DATE = datetime(2001, 1, 1, tzinfo=timezone.utc)
+
+# MediaItem attribute -> Core Data column
+COLUMNS = {
+    "id": "ZID",
+    "file_name": "ZFILENAME",
+    "file_extension": "ZFILEEXTENSION",
+    "file_size": "ZFILESIZE",
+    "type": "ZTYPERAWVALUE",
+    "encrypted_path": "ZENCRYPTEDPATH",
+    "created_at": "ZCREATEDAT",
+    "modified_at": "ZMODIFIEDAT",
+    "width": "ZWIDTH",
+    "height": "ZHEIGHT",
+    "duration": "ZDURATION",
+}
+
+MediaRow = namedtuple("MediaRow", ["pk"] + list(COLUMNS))
+
+# The subset of Core Data's generated schema the tools read; used to build
+# synthetic stores for benchmarks and fixtures.
+SCHEMA = f"""
+CREATE TABLE {TABLE} (
+    Z_PK INTEGER PRIMARY KEY,
+    Z_ENT INTEGER,
+    Z_OPT INTEGER,
+    ZFILESIZE INTEGER,
+    ZWIDTH INTEGER,
+    ZHEIGHT INTEGER,
+    ZCREATEDAT TIMESTAMP,
+    ZMODIFIEDAT TIMESTAMP,
+    ZDURATION FLOAT,
+    ZFILENAME VARCHAR,
+    ZFILEEXTENSION VARCHAR,
+    ZTYPERAWVALUE VARCHAR,
+    ZENCRYPTEDPATH VARCHAR,
+    ZID BLOB,
+    ZTHUMBNAILDATA BLOB
+)
+"""
+
+# How the app reads MediaItem, as the SQL Core Data issues for it. A plain
+# FetchDescriptor<MediaItem>() loads every attribute, the inline thumbnail
+# included; fetchCount() is already a COUNT(*).
+_ALL_COLUMNS = ", ".join(
+    ["Z_PK", "Z_ENT", "Z_OPT", *COLUMNS.values(), "ZTHUMBNAILDATA"]
+)
+ACCESS_PATTERNS = {
+    "fetch all": (
+        "StorageService.calculateTotalStorageUsed, FileReencryptionService",
+        f"SELECT {_ALL_COLUMNS} FROM {TABLE}",
+    ),
+    "fetch count": (
+        "GalleryViewModel, ImportViewModel, SettingsView (fetchCount)",
+        f"SELECT COUNT(*) FROM {TABLE}",
+    ),
+    "fetch fileSize": (
+        "FetchDescriptor.propertiesToFetch = [\\.fileSize]",
+        f"SELECT Z_PK, ZFILESIZE FROM {TABLE}",
+    ),
+    "sum fileSize": (
+        "total storage as one aggregate",
+        f"SELECT TOTAL(ZFILESIZE) FROM {TABLE}",
+    ),
+    "per-type totals": (
+        "counts and bytes per media type",
+        f"SELECT ZTYPERAWVALUE, COUNT(*), TOTAL(ZFILESIZE) FROM {TABLE} "
+        f"GROUP BY ZTYPERAWVALUE",
+    ),
+    "photos page": (
+        "PhotosView @Query (type filter, newest first), one 60-item page",
+        f"SELECT {_ALL_COLUMNS} FROM {TABLE} WHERE ZTYPERAWVALUE = 'photo' "
+        f"ORDER BY ZCREATEDAT DESC LIMIT 60",
+    ),
+}
+
+# Indexes that let the patterns above skip the blob-bloated table pages:
+# #Index<MediaItem>([\.typeRawValue, \.fileSize], [\.typeRawValue, \.createdAt])
+PROPOSED_INDEXES = {
+    f"{TABLE}_ZTYPE_ZFILESIZE": ("ZTYPERAWVALUE", "ZFILESIZE"),
+    f"{TABLE}_ZTYPE_ZCREATEDAT": ("ZTYPERAWVALUE", "ZCREATEDAT"),
+}
+
+
+def to_uuid(value):
+    """ZID as stored (16-byte blob, or text in hand-made fixtures) -> UUID"""
+    if value is None:
+        return None
+    if isinstance(value, (bytes, memoryview)):
+        return uuid.UUID(bytes=bytes(value))
+    return uuid.UUID(str(value))
+
+
+def to_datetime(value):
+    if value is None:
+        return None
+    return REFERENCE_DATE + timedelta(seconds=value)
+
+
+def from_datetime(moment):
+    return (moment - REFERENCE_DATE).total_seconds()
+
+
+def write_csv(path, rows):
+    """
+    Export MediaRows as a metadata table: one CSV row per item, dates as
+    ISO 8601 UTC (to the microsecond) and empty cells for NULLs. Returns
+    the number written.
+    """
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(MediaRow._fields)
+        for row in rows:
+            row = row._replace(
+                created_at=_iso(row.created_at), modified_at=_iso(row.modified_at)
+            )
+            writer.writerow("" if value is None else value for value in row)
+            count += 1
+    return count
+
+
+def _iso(seconds):
+    return to_datetime(seconds).isoformat() if seconds is not None else None
+
+
+def _number(kind):
+    return lambda text: kind(text) if text else None
+
+
+def _seconds(text):
+    return from_datetime(datetime.fromisoformat(text)) if text else None
+
+
+_CSV_TYPES = {
+    "pk": _number(int),
+    "id": lambda text: uuid.UUID(text) if text else None,
+    "file_size": _number(int),
+    "created_at": _seconds,
+    "modified_at": _seconds,
+    "width": _number(int),
+    "height": _number(int),
+    "duration": _number(float),
+}
+
+
+def read_csv(path):
+    """MediaRows from a table written by write_csv, dates back in seconds"""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        fields = next(reader, None)
+        if fields is None or tuple(fields) != MediaRow._fields:
+            raise ValueError(f"{path}: not a MediaItem metadata table")
+        parsers = [_CSV_TYPES.get(field, str) for field in fields]
+        for values in reader:
+            yield MediaRow(*(parse(value) for parse, value in zip(parsers, values)))
+
+
+def create_store(path):
+    """Create an empty store with the ZMEDIAITEM schema; return the connection"""
+    db = sqlite3.connect(path)
+    db.executescript(SCHEMA)
+    return db
+
+
+class MetadataStore:
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.db.close()
+
+    def items(self, order_by="ZCREATEDAT DESC"):
+        """Every MediaItem row (without the thumbnail blob)"""
+        columns = ", ".join(COLUMNS.values())
+        rows = self.db.execute(
+            f"SELECT Z_PK, {columns} FROM {TABLE} ORDER BY {order_by}"
+        )
+        for row in rows:
+            row = list(row)
+            row[1] = to_uuid(row[1])
+            yield MediaRow(*row)
+
+    def thumbnails(self, order_by="ZCREATEDAT DESC"):
+        """(UUID, thumbnail blob) for rows that have one, in gallery order"""
+        rows = self.db.execute(
+            f"SELECT ZID, ZTHUMBNAILDATA FROM {TABLE} "
+            f"WHERE ZTHUMBNAILDATA IS NOT NULL ORDER BY {order_by}"
+        )
+        for item_id, blob in rows:
+            yield to_uuid(item_id), blob
+
+    def object_sizes(self):
+        """
+        {table or index: (bytes on disk, payload bytes)} from the dbstat
+        virtual table, or None where SQLite was built without it.
+        """
+        try:
+            rows = self.db.execute(
+                "SELECT name, SUM(pgsize), SUM(payload) FROM dbstat GROUP BY name"
+            ).fetchall()
+        except sqlite3.OperationalError:
+            return None
+        return {name: (size, payload) for name, size, payload in rows}
+
+    def page_usage(self):
+        """(page size, page count, free pages)"""
+        return tuple(
+            self.db.execute(f"PRAGMA {pragma}").fetchone()[0]
+            for pragma in ("page_size", "page_count", "freelist_count")
+        )
+
+    def thumbnail_usage(self):
+        """(rows, rows with a thumbnail, total thumbnail bytes)"""
+        rows, with_thumbnail, size = self.db.execute(
+            f"SELECT COUNT(*), COUNT(ZTHUMBNAILDATA), "
+            f"TOTAL(LENGTH(ZTHUMBNAILDATA)) FROM {TABLE}"
+        ).fetchone()
+        return rows, with_thumbnail, int(size)
+
+    def indexes(self, table=TABLE):
+        """{index name: (column, ...)} for `table`"""
+        found = {}
+        for row in self.db.execute(f"PRAGMA index_list({table})").fetchall():
+            name = row[1]
+            columns = self.db.execute(f"PRAGMA index_info({name})").fetchall()
+            found[name] = tuple(column[2] for column in columns)
+        return found
+
+    def query_plan(self, sql):
+        """EXPLAIN QUERY PLAN details, e.g. 'SCAN ZMEDIAITEM'"""
+        return [row[-1] for row in self.db.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+    def thumbnail(self, pk):
+        row = self.db.execute(
+            f"SELECT ZTHUMBNAILDATA FROM {TABLE} WHERE Z_PK = ?", (pk,)
+        ).fetchone()
+        return row[0] if row else None
@@ -0,0 +1,193 @@
+"""
+Parallel frame decryption for ZNSC containers.
+
+Every ZNSC frame carries its own IV and GCM tag, so frames can be opened
+independently. Frames are fanned out to a thread or process pool and the
+results are written back in order through a bounded reorder buffer: at most
+`workers * per_worker` frames are in flight, so memory stays at a few
+chunks per worker no matter how large the file is.
+
+Process workers map the container themselves and receive only frame
+offsets, so ciphertext is never pickled; only plaintext travels back.
+Legacy single-blob files have one tag over the whole payload and are
+decrypted sequentially.
+"""
+
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from . import crypto
+from .container import Container, iter_plaintext
+from .format import FRAME_OVERHEAD, IV_LENGTH, LENGTH, TAG_LENGTH
+
+_worker = {}
+
+
+def _init_worker(path, key):
+    _worker["container"] = Container(path)
+    _worker["key"] = key
+
+
+def _open_at(offset):
+    """Decrypt the frame whose length prefix starts at `offset` (process worker)"""
+    view = _worker["container"].view
+    (length,) = LENGTH.unpack_from(view, offset)
+    iv_start = offset + LENGTH.size
+    tag_start = iv_start + IV_LENGTH
+    ct_start = tag_start + TAG_LENGTH
+    return crypto.open_frame(
+        _worker["key"],
+        view[iv_start:tag_start],
+        view[tag_start:ct_start],
+        view[ct_start : offset + FRAME_OVERHEAD + length],
+    )
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def iter_plaintext_parallel(
+    container, key, workers=None, executor="thread", per_worker=2
+):
+    """
+    Yield plaintext chunks of an open Container in order, decrypting
+    frames concurrently.
+
+    `executor` is "thread" or "process". Frames are validated (length bounds,
+    truncation) by the producer before they are submitted.
+    """
+    if container.is_legacy:
+        yield from iter_plaintext(container, key)
+        return
+
+    workers = workers or default_workers()
+    window = max(1, workers * per_worker)
+    if executor == "process":
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(container.path, key),
+        )
+
+        def submit(frame):
+            return pool.submit(_open_at, frame.offset)
+
+    elif executor == "thread":
+        pool = ThreadPoolExecutor(max_workers=workers)
+
+        def submit(frame):
+            return pool.submit(
+                crypto.open_frame, key, frame.iv, frame.tag, frame.ciphertext
+            )
+
+    else:
+        raise ValueError(f"unknown executor {executor!r}")
+
+    pending = deque()
+    try:
+        for frame in container.frames():
+            pending.append(submit(frame))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=True)
+
+
+_DONE = object()
+
+
+class Prefetcher:
+    """
+    Run `iterable` in a background thread, at most `depth` items ahead.
+
+    The thread starts as soon as the Prefetcher is created, so several can
+    be opened up front and fill in parallel while the consumer drains them
+    one after another. Exceptions are re-raised in the consumer; close()
+    tells the producer to stop at its next item.
+    """
+
+    def __init__(self, iterable, depth=4):
+        self._items = queue.Queue(maxsize=max(1, depth))
+        self._stop = threading.Event()
+        self._finished = False
+        self._thread = threading.Thread(
+            target=self._produce, args=(iterable,), daemon=True
+        )
+        self._thread.start()
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self, iterable):
+        try:
+            for item in iterable:
+                if not self._put((item, None)):
+                    return
+        except BaseException as e:
+            self._put((_DONE, e))
+        else:
+            self._put((_DONE, None))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._finished:
+            raise StopIteration
+        item, error = self._items.get()
+        if item is _DONE:
+            self._finished = True
+            if error is not None:
+                raise error
+            raise StopIteration
+        return item
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def prefetch(iterable, depth=4):
+    """
+    Run `iterable` in a background thread, at most `depth` items ahead.
+
+    Turns a producer (e.g. iter_plaintext) into a pipeline stage that
+    overlaps with whatever the consumer does with each item. The thread
+    starts on the first next(); see Prefetcher to start it eagerly.
+    """
+    with Prefetcher(iterable, depth) as stage:
+        yield from stage
+
+
+def decrypt_file_parallel(
+    path, out, password=None, key=None, workers=None, executor="thread"
+):
+    """Decrypt `path` into the binary file object `out`; return plaintext bytes"""
+    written = 0
+    with Container(path) as container:
+        if key is None:
+            key = crypto.derive_key(password, container.salt)
+        for chunk in iter_plaintext_parallel(container, key, workers, executor):
+            out.write(chunk)
+            written += len(chunk)
+    return written
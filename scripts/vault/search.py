@@ -0,0 +1,212 @@
+"""
+In-memory search over MediaItem metadata: file name and extension
+substrings (what the gallery search box matches), name prefixes, media type
+and import date.
+
+Every field is indexed by its 1- to 3-character substrings ("grams"),
+casefolded, with START in front of each field so that a prefix is a gram
+too. A gram maps to a posting list of document numbers, an array('I') that
+only ever grows at the end: documents are numbered in insertion order, so
+every list stays sorted without being rewritten. A query of up to three
+characters is one posting list, exactly; a longer one takes the shortest
+list among its trigrams and checks each candidate against the text.
+
+Deleting only clears the document's `alive` flag (a tombstone); once a
+quarter of the documents are dead the index is rebuilt from the live ones.
+Import dates are kept in a second, sorted pair of arrays for range queries.
+
+    index = SearchIndex(MetadataStore(path).items())
+    index.search("img_12", kind="photo", since=from_datetime(...))
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+START = "\x02"
+MAX_GRAM = 3
+COMPACT_RATIO = 0.25
+COMPACT_MIN = 1024
+
+# What compact() re-adds: the indexed fields of one live document
+_Row = namedtuple("_Row", "id file_name file_extension type created_at")
+
+
+def grams(text):
+    """Set of 1- to 3-character grams of START + casefolded `text`"""
+    text = START + text.casefold()
+    return {
+        text[i : i + n]
+        for n in range(1, MAX_GRAM + 1)
+        for i in range(len(text) - n + 1)
+    }
+
+
+class SearchIndex:
+    """
+    Documents are MediaRows (anything with id, file_name, file_extension,
+    type and created_at). Results are item ids in insertion order.
+    """
+
+    def __init__(self, rows=()):
+        self._clear()
+        self.extend(rows)
+
+    def _clear(self):
+        self._postings = {}
+        self._ids = []
+        self._names = []  # casefolded, for checking candidates
+        self._extensions = []
+        self._types = array("B")
+        self._type_codes = {}
+        self._created = array("d")
+        self._alive = bytearray()
+        self._dead = 0
+        self._docs = {}  # item id -> document number
+        self._dates = array("d")  # created_at, sorted
+        self._date_docs = array("I")  # document numbers in that order
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, item_id):
+        return item_id in self._docs
+
+    def add(self, row):
+        """Index one item; an id already present is replaced"""
+        doc, created = self._append(row)
+        at = bisect_right(self._dates, created)
+        self._dates.insert(at, created)
+        self._date_docs.insert(at, doc)
+
+    def extend(self, rows):
+        """Index many items, sorting the date arrays once at the end"""
+        for row in rows:
+            self._append(row)
+        created = self._created
+        order = sorted(range(len(created)), key=created.__getitem__)
+        self._dates = array("d", (created[doc] for doc in order))
+        self._date_docs = array("I", order)
+
+    def _append(self, row):
+        if row.id in self._docs:
+            self.remove(row.id)
+        doc = len(self._ids)
+        name, extension = row.file_name or "", row.file_extension or ""
+        created = row.created_at if row.created_at is not None else float("-inf")
+        self._ids.append(row.id)
+        self._names.append(name.casefold())
+        self._extensions.append(extension.casefold())
+        kind = self._type_codes.setdefault(row.type, len(self._type_codes))
+        self._types.append(kind)
+        self._created.append(created)
+        self._alive.append(1)
+        self._docs[row.id] = doc
+
+        postings = self._postings
+        for gram in grams(name) | grams(extension):
+            posting = postings.get(gram)
+            if posting is None:
+                posting = postings[gram] = array("I")
+            posting.append(doc)
+        return doc, created
+
+    def remove(self, item_id):
+        """Tombstone one item; False if it was not indexed"""
+        doc = self._docs.pop(item_id, None)
+        if doc is None:
+            return False
+        self._alive[doc] = 0
+        self._dead += 1
+        if self._dead >= COMPACT_MIN and self._dead > len(self._ids) * COMPACT_RATIO:
+            self.compact()
+        return True
+
+    def compact(self):
+        """Rebuild from the live documents, dropping every tombstone"""
+        codes = {code: kind for kind, code in self._type_codes.items()}
+        live = [
+            _Row(
+                self._ids[doc],
+                self._names[doc],
+                self._extensions[doc],
+                codes[self._types[doc]],
+                self._created[doc],
+            )
+            for doc in range(len(self._ids))
+            if self._alive[doc]
+        ]
+        self._clear()
+        self.extend(live)
+
+    def _candidates(self, text, prefix):
+        """(document numbers, whether each still needs checking)"""
+        key = (START if prefix else "") + text.casefold()
+        if len(key) <= MAX_GRAM:
+            return self._postings.get(key, ()), False
+        shortest = min(
+            (
+                self._postings.get(key[i : i + MAX_GRAM], ())
+                for i in range(len(key) - MAX_GRAM + 1)
+            ),
+            key=len,
+        )
+        return shortest, True
+
+    def search(self, text="", kind=None, since=None, until=None, prefix=False):
+        """
+        Ids of live items whose name or extension contains `text` (starts
+        with it if `prefix`), of type `kind`, created in [since, until].
+        """
+        check = False
+        if text:
+            docs, check = self._candidates(text, prefix)
+        elif since is not None or until is not None:
+            low = 0 if since is None else bisect_left(self._dates, since)
+            high = (
+                len(self._dates) if until is None else bisect_right(self._dates, until)
+            )
+            docs = sorted(self._date_docs[low:high])
+        else:
+            docs = range(len(self._ids))
+
+        code = None
+        if kind is not None:
+            code = self._type_codes.get(kind)
+            if code is None:
+                return []
+        ids, alive = self._ids, self._alive
+        if not check and code is None and since is None and until is None:
+            if not self._dead:
+                return list(map(ids.__getitem__, docs))
+            return [ids[doc] for doc in docs if alive[doc]]
+
+        folded = text.casefold()
+        names, extensions = self._names, self._extensions
+        types, created = self._types, self._created
+        results = []
+        for doc in docs:
+            if not alive[doc] or (code is not None and types[doc] != code):
+                continue
+            if (since is not None and created[doc] < since) or (
+                until is not None and created[doc] > until
+            ):
+                continue
+            if check:
+                name, extension = names[doc], extensions[doc]
+                if prefix:
+                    if not (name.startswith(folded) or extension.startswith(folded)):
+                        continue
+                elif folded not in name and folded not in extension:
+                    continue
+            results.append(ids[doc])
+        return results
+
+    def nbytes(self):
+        """Bytes held by the posting and date arrays (not the strings)"""
+        arrays = [self._types, self._created, self._dates, self._date_docs]
+        return (
+            sum(p.itemsize * len(p) for p in self._postings.values())
+            + sum(a.itemsize * len(a) for a in arrays)
+            + len(self._alive)
+        )
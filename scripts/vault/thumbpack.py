@@ -0,0 +1,200 @@
+"""
+Packed thumbnail store: every grid thumbnail in one file.
+
+MediaItem.thumbnailData keeps each JPEG inline in its SwiftData row, so a
+grid page means one row fault per cell, and a re-key touches every row. A
+pack keeps them back to back behind a fixed-size header and a UUID-sorted
+offset table; loading a page is one mmap plus a slice per cell, and the
+whole pack shares one salt, so one key derivation covers every thumbnail.
+
+    header  "ZNTP" | version u8 (=1) | pad 3 | count u32 BE | salt 16
+            | data offset u64 BE | pad 4                        (40 bytes)
+    table   count * (item UUID 16 | record offset u64 BE | record length
+            u32 BE | pad 4), sorted by UUID bytes                (32 each)
+    data    records in gallery order: IV 12 | GCM tag 16 | ciphertext
+
+Records are AES-256-GCM under PBKDF2(password, salt) like ZNSC frames.
+Writing them in gallery order (newest first) keeps a page's records
+adjacent on disk.
+"""
+
+import bisect
+import mmap
+import os
+import struct
+import sys
+import uuid
+from array import array
+
+from . import crypto
+from .format import (
+    IV_LENGTH,
+    SALT_LENGTH,
+    TAG_LENGTH,
+    CorruptContainerError,
+    TruncatedContainerError,
+)
+
+MAGIC = b"ZNTP"
+VERSION = 1
+HEADER = struct.Struct(">4sB3xI16sQ4x")
+ENTRY = struct.Struct(">16sQI4x")
+RECORD_OVERHEAD = IV_LENGTH + TAG_LENGTH
+
+
+def _uuid_bytes(item_id):
+    if isinstance(item_id, uuid.UUID):
+        return item_id.bytes
+    if isinstance(item_id, str):
+        return uuid.UUID(item_id).bytes
+    return bytes(item_id)
+
+
+class ThumbPack:
+    """Read-only mapping of a pack file"""
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self._file = open(self.path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        if self.size < HEADER.size:
+            self._file.close()
+            raise TruncatedContainerError(f"{self.path}: header is {self.size} bytes")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self._mmap)
+        magic, version, self.count, salt, self.data_offset = HEADER.unpack_from(
+            self.view
+        )
+        self.salt = bytes(salt)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise CorruptContainerError(f"{self.path}: not a version {VERSION} pack")
+        if self.data_offset != HEADER.size + self.count * ENTRY.size:
+            self.close()
+            raise CorruptContainerError(f"{self.path}: table size mismatch")
+        if self.data_offset > self.size:
+            self.close()
+            raise TruncatedContainerError(f"{self.path}: table runs past the end")
+        self._prefixes = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, item_id):
+        return self._find(_uuid_bytes(item_id)) is not None
+
+    def close(self):
+        self.view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # record slices still alive; the mapping closes with them
+        self._file.close()
+
+    def _prefix_column(self):
+        """
+        First 8 bytes of every table UUID as integers, in table order.
+
+        Copied out of the mapping with one strided C-level pass, so lookups
+        can bisect without touching Python objects per probe.
+        """
+        if self._prefixes is None:
+            table = self.view[HEADER.size : self.data_offset].cast("Q")
+            prefixes = array("Q", table[:: ENTRY.size // 8])
+            if sys.byteorder == "little":
+                prefixes.byteswap()
+            self._prefixes = prefixes
+        return self._prefixes
+
+    def _id_at(self, i):
+        start = HEADER.size + i * ENTRY.size
+        return bytes(self.view[start : start + 16])
+
+    def _find(self, key):
+        prefixes = self._prefix_column()
+        prefix = int.from_bytes(key[:8], "big")
+        i = bisect.bisect_left(prefixes, prefix)
+        while i < self.count and prefixes[i] == prefix:
+            if self._id_at(i) == key:
+                return i
+            i += 1
+        return None
+
+    def _entry(self, i):
+        _, offset, length = ENTRY.unpack_from(self.view, HEADER.size + i * ENTRY.size)
+        if length < RECORD_OVERHEAD or offset + length > self.size:
+            raise CorruptContainerError(f"{self.path}: record {i} is out of bounds")
+        return offset, length
+
+    def record(self, item_id):
+        """Encrypted record for `item_id` as a memoryview, or None"""
+        i = self._find(_uuid_bytes(item_id))
+        if i is None:
+            return None
+        offset, length = self._entry(i)
+        return self.view[offset : offset + length]
+
+    def load(self, item_id, key):
+        """Decrypted thumbnail bytes, or None if the pack has no entry"""
+        record = self.record(item_id)
+        if record is None:
+            return None
+        return crypto.open_frame(
+            key,
+            record[:IV_LENGTH],
+            record[IV_LENGTH:RECORD_OVERHEAD],
+            record[RECORD_OVERHEAD:],
+        )
+
+    def load_page(self, item_ids, key):
+        """Thumbnails for one grid page, in the order asked (None if missing)"""
+        return [self.load(item_id, key) for item_id in item_ids]
+
+    def ids(self):
+        """Item UUIDs in stored (gallery) order"""
+        entries = []
+        for i in range(self.count):
+            item_id, offset, _ = ENTRY.unpack_from(
+                self.view, HEADER.size + i * ENTRY.size
+            )
+            entries.append((offset, uuid.UUID(bytes=bytes(item_id))))
+        return [item_id for _, item_id in sorted(entries)]
+
+
+def write_pack(out, items, key, salt):
+    """
+    Write `items` — (item UUID, plaintext JPEG) pairs in gallery order — to
+    the binary file object `out`. Returns the number of thumbnails.
+    """
+    if len(salt) != SALT_LENGTH:
+        raise ValueError(f"salt must be {SALT_LENGTH} bytes")
+    items = [(_uuid_bytes(item_id), data) for item_id, data in items]
+    if len({item_id for item_id, _ in items}) != len(items):
+        raise ValueError("duplicate item ids")
+
+    data_offset = HEADER.size + len(items) * ENTRY.size
+    offsets = []
+    position = data_offset
+    for _, data in items:
+        offsets.append(position)
+        position += RECORD_OVERHEAD + len(data)
+
+    out.write(HEADER.pack(MAGIC, VERSION, len(items), salt, data_offset))
+    table = sorted(
+        (item_id, offset, RECORD_OVERHEAD + len(data))
+        for (item_id, data), offset in zip(items, offsets)
+    )
+    for entry in table:
+        out.write(ENTRY.pack(*entry))
+    for _, data in items:
+        iv, tag, ciphertext = crypto.seal_frame(key, data)
+        out.write(iv)
+        out.write(tag)
+        out.write(ciphertext)
+    return len(items)
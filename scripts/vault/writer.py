@@ -0,0 +1,133 @@
+"""
+ZNSC container writer, byte-compatible with EncryptionService.encryptFile.
+
+The chunk size is clamped to the same 256 KB minimum, and the header's u16
+KB indicator saturates the same way, so containers written here open in
+the app and vice versa.
+"""
+
+import os
+
+from . import crypto
+from .format import (
+    CHUNK_INDICATOR_MAX,
+    DEFAULT_CHUNK_SIZE,
+    HEADER,
+    LENGTH,
+    MAGIC,
+    MIN_CHUNK_SIZE,
+    SALT_LENGTH,
+    TERMINATOR,
+    VERSION,
+)
+
+
+def effective_chunk_size(preferred=None):
+    """
+    Clamp to the 256 KB minimum and round up to whole KB, so the header's
+    KB indicator stays a valid bound for strict readers.
+    """
+    size = max(MIN_CHUNK_SIZE, preferred or DEFAULT_CHUNK_SIZE)
+    return -(-size // 1024) * 1024
+
+
+def chunk_indicator(chunk_size):
+    return min(chunk_size // 1024, CHUNK_INDICATOR_MAX)
+
+
+class ContainerWriter:
+    """
+    Streaming ZNSC encoder over a binary file object.
+
+    write() buffers at most one chunk; each full chunk becomes one frame.
+    close() seals the remainder and writes the zero terminator (it does not
+    close `out`). `ivs`, if given, is called for each frame's IV instead of
+    drawing a random one (reproducible fixtures only).
+    """
+
+    def __init__(self, out, key, salt, chunk_size=None, ivs=None):
+        if len(salt) != SALT_LENGTH:
+            raise ValueError(f"salt must be {SALT_LENGTH} bytes")
+        self.out = out
+        self.key = key
+        self.ivs = ivs
+        self.chunk_size = effective_chunk_size(chunk_size)
+        self.frames = 0
+        self.plaintext_bytes = 0
+        self._buffer = bytearray()
+        out.write(
+            HEADER.pack(MAGIC, VERSION, 0, chunk_indicator(self.chunk_size), salt)
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+
+    def _emit(self, chunk):
+        iv = self.ivs() if self.ivs is not None else None
+        iv, tag, ciphertext = crypto.seal_frame(self.key, chunk, iv)
+        self.out.write(LENGTH.pack(len(ciphertext)))
+        self.out.write(iv)
+        self.out.write(tag)
+        self.out.write(ciphertext)
+        self.frames += 1
+        self.plaintext_bytes += len(chunk)
+
+    def write(self, data):
+        view = memoryview(data)
+        if self._buffer:
+            take = min(len(view), self.chunk_size - len(self._buffer))
+            self._buffer += view[:take]
+            view = view[take:]
+            if len(self._buffer) < self.chunk_size:
+                return
+            self._emit(bytes(self._buffer))
+            self._buffer.clear()
+        while len(view) >= self.chunk_size:
+            self._emit(view[: self.chunk_size])
+            view = view[self.chunk_size :]
+        self._buffer += view
+
+    def close(self):
+        if self._buffer:
+            self._emit(bytes(self._buffer))
+            self._buffer.clear()
+        self.out.write(TERMINATOR)
+
+
+def write_legacy(out, key, salt, plaintext, iv=None):
+    """
+    Write a legacy single-blob container (salt | IV | tag | ciphertext), as
+    EncryptionService.encrypt(data:password:) did before ZNSC
+    """
+    if len(salt) != SALT_LENGTH:
+        raise ValueError(f"salt must be {SALT_LENGTH} bytes")
+    iv, tag, ciphertext = crypto.seal_frame(key, plaintext, iv)
+    out.write(salt)
+    out.write(iv)
+    out.write(tag)
+    out.write(ciphertext)
+
+
+def encrypt_stream(reader, out, key, salt, chunk_size=None):
+    """Encrypt everything readable from `reader` into `out`; return the writer"""
+    writer = ContainerWriter(out, key, salt, chunk_size)
+    while True:
+        chunk = reader.read(writer.chunk_size)
+        if not chunk:
+            break
+        writer.write(chunk)
+    writer.close()
+    return writer
+
+
+def encrypt_file(src, dst, password=None, key=None, salt=None, chunk_size=None):
+    """Encrypt file `src` into a new ZNSC container at `dst`"""
+    salt = salt or os.urandom(SALT_LENGTH)
+    if key is None:
+        key = crypto.derive_key(password, salt)
+    with open(src, "rb") as reader, open(dst, "wb") as out:
+        return encrypt_stream(reader, out, key, salt, chunk_size)
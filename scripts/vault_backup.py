@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Incremental, append-only backups of an EncryptedMedia directory.
+
+  backup    append new and changed containers to a backup (see vault/backup.py)
+  list      show the backup's generations, or the files in one of them
+  restore   copy files from any generation back out, by name or UUID prefix
+  verify    re-read every file of a generation and check its digest
+
+Unchanged files (same size and mtime as in the manifest) are never opened,
+so a nightly run over a 100k-file vault costs one directory scan plus the
+changed bytes. Nothing is decrypted and no password is needed.
+
+  python3 scripts/vault_backup.py backup path/to/EncryptedMedia /mnt/backup/vault
+  python3 scripts/vault_backup.py list /mnt/backup/vault [--files] [--at 12]
+  python3 scripts/vault_backup.py restore /mnt/backup/vault restored/ --item UUID
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import file_writer
+from vault import Container, ContainerError
+from vault.backup import BackupStore, file_record, fingerprint
+from vault.layout import iter_containers, media_directory
+
+# Manifest lines are written (after an fsync of the pack) at least this often
+SYNC_FILES = 512
+SYNC_BYTES = 256 * 1024 * 1024
+
+
+def changed_files(directory, known):
+    """([(path, name, mtime_ns)] differing from `known`, names present)"""
+    changed = []
+    present = set()
+    for path, entry in iter_containers(directory):
+        present.add(entry.name)
+        stat = entry.stat(follow_symlinks=False)
+        record = known.get(entry.name)
+        if (
+            record
+            and record["size"] == stat.st_size
+            and record["mtime_ns"] == stat.st_mtime_ns
+        ):
+            continue
+        changed.append((path, entry.name, stat.st_mtime_ns))
+    return changed, present
+
+
+def cmd_backup(args):
+    directory = media_directory(args.source)
+    start = time.perf_counter()
+    with BackupStore(args.backup, create=True) as store:
+        manifest = store.manifest
+        known = manifest.files
+        changed, present = changed_files(directory, known)
+        scanned = time.perf_counter() - start
+        generation = store.begin()
+        print(
+            f"🔍 {len(present)} containers checked against the manifest in "
+            f"{scanned:.2f}s; {len(changed)} new or changed"
+        )
+
+        stats = {"added": 0, "touched": 0, "bytes": 0}
+        batch, batch_bytes = [], 0
+
+        def flush():
+            nonlocal batch, batch_bytes
+            store.sync()
+            manifest.append(batch)
+            batch, batch_bytes = [], 0
+
+        for path, name, mtime_ns in changed:
+            try:
+                with Container(path) as container:
+                    previous = known.get(name)
+                    identity = fingerprint(container)
+                    if (
+                        previous
+                        and previous["head"] == identity[2]
+                        and previous["size"] == container.size
+                    ):
+                        # Same bytes, new mtime: point at the stored copy
+                        record = dict(previous, gen=generation, mtime_ns=mtime_ns)
+                        record["time"] = round(time.time(), 3)
+                        stats["touched"] += 1
+                    else:
+                        stored = store.append(container)
+                        record = file_record(
+                            generation, name, mtime_ns, identity, stored
+                        )
+                        stats["added"] += 1
+                        stats["bytes"] += container.size
+                        batch_bytes += container.size
+            except OSError as e:
+                print(f"❌ {name}: {e}")
+                continue
+            batch.append(record)
+            if len(batch) >= SYNC_FILES or batch_bytes >= SYNC_BYTES:
+                flush()
+
+        deleted = sorted(known.keys() - present)
+        batch.extend({"gen": generation, "name": n, "deleted": True} for n in deleted)
+        batch.append(
+            {
+                "gen": generation,
+                "commit": True,
+                "time": round(time.time(), 3),
+                "source": os.path.abspath(directory),
+                "files": len(present),
+                "deleted": len(deleted),
+                **stats,
+            }
+        )
+        flush()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"✅ Generation {generation}: {stats['added']} stored "
+        f"({stats['bytes'] / 1e6:.1f} MB), {stats['touched']} touched, "
+        f"{len(deleted)} deleted in {elapsed:.1f}s"
+    )
+
+
+def cmd_list(args):
+    with BackupStore(args.backup) as store:
+        manifest = store.manifest
+        if not args.files:
+            print(f"{'Gen':>5}  {'When':<19}{'Files':>9}{'Stored':>9}{'MB':>10}")
+            for commit in manifest.generations:
+                when = time.strftime(
+                    "%Y-%m-%d %H:%M:%S", time.localtime(commit["time"])
+                )
+                print(
+                    f"{commit['gen']:>5}  {when:<19}{commit['files']:>9}"
+                    f"{commit['added']:>9}{commit['bytes'] / 1e6:>10.1f}"
+                )
+            print(f"\nPack: {os.path.getsize(store.pack_path) / 1e6:.1f} MB")
+            return
+        for name, record in sorted(manifest.records(args.at).items()):
+            frames = record["frames"] if record["frames"] is not None else "-"
+            print(f"{record['gen']:>5} {record['size']:>12} {frames:>6}  {name}")
+
+
+def _select(records, items):
+    if not items:
+        return records
+    wanted = tuple(item.lower() for item in items)
+    return {n: r for n, r in records.items() if n.lower().startswith(wanted)}
+
+
+def cmd_restore(args):
+    destination = media_directory(args.destination)
+    os.makedirs(destination, exist_ok=True)
+    restored = failed = 0
+    with BackupStore(args.backup) as store:
+        records = _select(store.manifest.records(args.at), args.item)
+        if not records:
+            sys.exit("❌ Nothing matches")
+        for name, record in sorted(records.items()):
+            target = os.path.join(destination, name)
+            if os.path.exists(target) and not args.force:
+                print(f"⏭️  {name}: exists (use --force)")
+                continue
+            try:
+                with file_writer.atomic_output(target) as out:
+                    for piece in store.iter_read(record):
+                        out.write(piece)
+            except ContainerError as e:
+                failed += 1
+                print(f"❌ {e}")
+                continue
+            os.utime(target, ns=(record["mtime_ns"], record["mtime_ns"]))
+            restored += 1
+    print(f"✅ Restored {restored} files into {destination}; {failed} failed")
+    if failed:
+        sys.exit(1)
+
+
+def cmd_verify(args):
+    checked = failed = 0
+    with BackupStore(args.backup) as store:
+        for name, record in sorted(store.manifest.records(args.at).items()):
+            try:
+                for _ in store.iter_read(record):
+                    pass
+            except ContainerError as e:
+                failed += 1
+                print(f"❌ {e}")
+                continue
+            checked += 1
+    print(f"✅ {checked} files intact; {failed} damaged")
+    if failed:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backup = commands.add_parser("backup", help="store new and changed files")
+    backup.add_argument("source", help="EncryptedMedia (or its parent)")
+    backup.add_argument("backup", help="backup directory (created if missing)")
+    backup.set_defaults(func=cmd_backup)
+
+    listing = commands.add_parser("list", help="show generations or files")
+    listing.add_argument("backup")
+    listing.add_argument("--files", action="store_true", help="list files instead")
+    listing.add_argument("--at", type=int, help="generation (default: latest)")
+    listing.set_defaults(func=cmd_list)
+
+    restore = commands.add_parser("restore", help="copy files back out")
+    restore.add_argument("backup")
+    restore.add_argument("destination", help="directory to restore into")
+    restore.add_argument(
+        "--item",
+        action="append",
+        default=[],
+        metavar="UUID",
+        help="restore only this item (repeatable; default: everything)",
+    )
+    restore.add_argument("--at", type=int, help="generation (default: latest)")
+    restore.add_argument("--force", action="store_true", help="overwrite files")
+    restore.set_defaults(func=cmd_restore)
+
+    verify = commands.add_parser("verify", help="check stored digests")
+    verify.add_argument("backup")
+    verify.add_argument("--at", type=int, help="generation (default: latest)")
+    verify.set_defaults(func=cmd_verify)
+
+    args = parser.parse_args()
+    try:
+        args.func(args)
+    except (ContainerError, FileNotFoundError) as e:
+        sys.exit(f"❌ {e}")
+
+
+if __name__ == "__main__":
+    main()
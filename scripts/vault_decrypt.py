@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Decrypt one vault container (ZNSC or legacy) to a file or stdout.
+
+Streams frame by frame from a memory-mapped container, so memory stays at
+about one chunk even for 500 MB videos. Useful for spot-checking backups on
+a machine other than the device.
+
+  ZNSC_PASSWORD=... python3 scripts/vault_decrypt.py FILE.encrypted -o out.jpg
+  python3 scripts/vault_decrypt.py FILE.encrypted --info
+
+With --workers > 1, frames are decrypted concurrently (threads, or separate
+processes with --processes) and written back in order.
+"""
+
+import argparse
+import os
+import sys
+
+from vault import Container, ContainerError, cli, derive_key, iter_plaintext
+from vault.parallel import default_workers, iter_plaintext_parallel
+
+
+def print_info(container):
+    print(f"File:       {container.path}")
+    print(f"Size:       {container.size} bytes")
+    if container.is_legacy:
+        print("Format:     legacy single blob")
+        print(f"Plaintext:  {container.plaintext_size()} bytes")
+        return
+    frames = list(container.frames())
+    print(f"Format:     ZNSC v{container.header.version}")
+    print(f"Chunk size: {container.header.chunk_kb} KB")
+    print(f"Frames:     {len(frames)}")
+    print(f"Plaintext:  {sum(f.length for f in frames)} bytes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decrypt one vault container")
+    parser.add_argument("container")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument(
+        "--info", action="store_true", help="print header and frame summary only"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=f"decrypt frames concurrently (0 = all {default_workers()} cores)",
+    )
+    parser.add_argument(
+        "--processes",
+        action="store_true",
+        help="use a process pool instead of threads for --workers",
+    )
+    cli.add_password_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        with Container(args.container) as container:
+            if args.info:
+                print_info(container)
+                return
+
+            key = derive_key(cli.read_password(args), container.salt)
+            out = open(args.output, "wb") if args.output else sys.stdout.buffer
+            if args.workers == 1:
+                chunks = iter_plaintext(container, key)
+            else:
+                chunks = iter_plaintext_parallel(
+                    container,
+                    key,
+                    workers=args.workers or None,
+                    executor="process" if args.processes else "thread",
+                )
+            try:
+                for chunk in chunks:
+                    out.write(chunk)
+            except BaseException:
+                if args.output:
+                    out.close()
+                    os.unlink(args.output)
+                raise
+            if args.output:
+                out.close()
+    except ContainerError as e:
+        sys.exit(f"❌ {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Find items imported more than once, by the hash of their plaintext.
+
+MediaImportService encrypts every import under a fresh salt, so two imports
+of the same photo share nothing on disk. This decrypts just enough to tell
+them apart, in three rounds that each only look at what the last one could
+not rule out:
+
+  1. plaintext size, straight from the header manifest (vault/manifest.py);
+     a file with a unique size has no duplicate and is never opened
+  2. BLAKE2b of the first 64 KB of plaintext (one partial frame per file)
+  3. BLAKE2b of the whole plaintext, streamed chunk by chunk; every GCM
+     tag is checked on the way
+
+Keys are derived only for the salts of files that survive round 1, in one
+parallel batch, and rounds 2 and 3 run on a thread pool. The total cost is
+about one sequential read of the real candidates. Nothing is deleted: the
+report lists each group, the copy to keep (the oldest) and the bytes the
+other copies take up. Removing them also means removing their MediaItems,
+so that is left to the app.
+
+  ZNSC_PASSWORD=... python3 scripts/vault_dedupe.py path/to/EncryptedMedia
+  ZNSC_PASSWORD=... python3 scripts/vault_dedupe.py DIR --json dupes.json
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from vault import (
+    AuthenticationError,
+    Container,
+    ContainerError,
+    KeyDeriver,
+    cli,
+    crypto,
+    iter_plaintext,
+)
+from vault.layout import media_directory, original_name
+from vault.manifest import directory_records
+from vault.parallel import default_workers
+
+PREFIX_SIZE = 64 * 1024
+
+
+def _digest():
+    return hashlib.blake2b(digest_size=32)
+
+
+def prefix_hash(path, key):
+    """
+    Hash of the first PREFIX_SIZE plaintext bytes. Not authenticated (the
+    tag covers the whole frame); round 3 authenticates every survivor.
+    """
+    with Container(path) as container:
+        if container.is_znsc:
+            frame = next(container.frames(), None)
+            if frame is None:
+                return _digest().hexdigest()
+            iv, tag, ciphertext = frame.iv, frame.tag, frame.ciphertext
+        else:
+            parts = container.legacy_parts()
+            iv, tag, ciphertext = parts.iv, parts.tag, parts.ciphertext
+        decryptor = crypto.stream_decryptor(key, iv, tag)
+        digest = _digest()
+        digest.update(decryptor.update(ciphertext[:PREFIX_SIZE]))
+        return digest.hexdigest()
+
+
+def content_hash(path, key):
+    """Hash of the whole plaintext; raises AuthenticationError on a bad tag"""
+    digest = _digest()
+    with Container(path) as container:
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            container.advise(mmap.MADV_SEQUENTIAL)
+        for chunk in iter_plaintext(container, key):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _groups(buckets):
+    return [group for group in buckets.values() if len(group) > 1]
+
+
+def refine(groups, hasher, keys, workers, failures):
+    """
+    Split each group by `hasher(path, key)`; files that fail to read go to
+    `failures` instead.
+    """
+    items = [item for group in groups for item in group]
+
+    def _hash(item):
+        path, record = item
+        try:
+            return item, hasher(path, keys[record.salt]), None
+        except (ContainerError, OSError) as e:
+            return item, None, e
+
+    buckets = defaultdict(list)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for (path, record), digest, error in pool.map(_hash, items):
+            if error is not None:
+                failures[path] = str(error)
+                continue
+            buckets[(record.plaintext, digest)].append((path, record))
+    return _groups(buckets)
+
+
+def check_password(groups, keys):
+    """Authenticate the smallest candidate so a wrong password fails fast"""
+    path, record = min(
+        (item for group in groups for item in group), key=lambda i: i[1].size
+    )
+    try:
+        content_hash(path, keys[record.salt])
+    except AuthenticationError:
+        sys.exit(f"❌ {os.path.basename(path)} does not open: wrong password?")
+
+
+def report_groups(groups):
+    """[{keep, duplicates, plaintext, reclaimable}] largest savings first"""
+    report = []
+    for group in groups:
+        group = sorted(group, key=lambda item: (item[1].mtime_ns, item[0]))
+        keep, *copies = group
+        report.append(
+            {
+                "keep": keep[0],
+                "duplicates": [path for path, _ in copies],
+                "plaintext": keep[1].plaintext,
+                "reclaimable": sum(record.size for _, record in copies),
+            }
+        )
+    report.sort(key=lambda g: -g["reclaimable"])
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directory", help="EncryptedMedia (or its parent)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help=f"files hashed at once (default: {default_workers()} cores)",
+    )
+    parser.add_argument("--json", metavar="FILE", help="also write the groups as JSON")
+    cli.add_password_arguments(parser)
+    cli.add_cache_arguments(parser)
+    args = parser.parse_args()
+
+    workers = args.workers or default_workers()
+    directory = media_directory(args.directory)
+    start = time.perf_counter()
+
+    records = directory_records(directory, not args.no_cache, workers)
+    by_size = defaultdict(list)
+    for path, record in records:
+        if record.status in ("ok", "legacy"):
+            by_size[record.plaintext].append((path, record))
+    groups = _groups(by_size)
+    candidates = sum(len(group) for group in groups)
+    print(
+        f"🔍 {len(records)} containers; {candidates} share a size "
+        f"({time.perf_counter() - start:.2f}s)"
+    )
+
+    failures = {}
+    if groups:
+        with KeyDeriver(cli.read_password(args), workers=workers) as deriver:
+            keys = deriver.derive_many(
+                record.salt for group in groups for _, record in group
+            )
+            print(f"🔑 Derived {len(keys)} keys ({time.perf_counter() - start:.2f}s)")
+            check_password(groups, keys)
+
+            groups = refine(groups, prefix_hash, keys, workers, failures)
+            candidates = sum(len(group) for group in groups)
+            read = sum(r.size for group in groups for _, r in group)
+            print(
+                f"🧮 {candidates} share the first {PREFIX_SIZE // 1024} KB; "
+                f"reading {read / 1e6:.1f} MB ({time.perf_counter() - start:.2f}s)"
+            )
+            groups = refine(groups, content_hash, keys, workers, failures)
+
+    report = report_groups(groups)
+    for group in report:
+        print(
+            f"\n♊ {original_name(os.path.basename(group['keep']))} "
+            f"({group['plaintext'] / 1e6:.1f} MB) x{len(group['duplicates']) + 1}"
+        )
+        print(f"   keep  {os.path.basename(group['keep'])}")
+        for path in group["duplicates"]:
+            print(f"   dup   {os.path.basename(path)}")
+    for path, error in failures.items():
+        print(f"❌ {os.path.basename(path)}: {error}")
+
+    reclaimable = sum(group["reclaimable"] for group in report)
+    duplicates = sum(len(group["duplicates"]) for group in report)
+    print(
+        f"\n📊 {len(report)} groups, {duplicates} duplicates, "
+        f"{reclaimable / 1e6:.1f} MB reclaimable in {time.perf_counter() - start:.1f}s"
+    )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {"groups": report, "reclaimable": reclaimable, "failures": failures},
+                f,
+                indent=2,
+                ensure_ascii=False,
+            )
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
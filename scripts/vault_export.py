@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Export vault items straight into a tar or zip archive, decrypting on the fly.
+
+ExportService.exportItems decrypts every selected item into a temporary
+ZeroNetExport directory and only then hands the files to the share sheet,
+so disk use doubles and nothing is written until the last item is done.
+This streams instead: every container is decrypted frame by frame into its
+archive entry, and no plaintext ever touches the disk outside the archive.
+
+  - sizes and salts come from the header manifest (vault/manifest.py), so
+    planning opens only new or changed files; keys are derived up front in
+    one parallel batch (one per salt)
+  - up to --workers items are decrypted at once, each by a reader thread
+    feeding a queue of at most --depth chunks; the archive writer drains
+    them strictly in order, so entries come out sorted by container name
+  - peak memory is about workers * (depth + 1) chunks
+
+Entries are named after the original file (`{UUID}_{name}.encrypted` ->
+name), with " (2)", " (3)"... appended on clashes. The output is written
+through a temp file and renamed into place on success; a failure (a wrong
+password, a tampered frame) removes it. Truncated or corrupt containers are
+skipped with a warning. With "-o -" the archive goes to stdout and progress
+to stderr.
+
+  ZNSC_PASSWORD=... python3 scripts/vault_export.py path/to/EncryptedMedia -o out.zip
+  ZNSC_PASSWORD=... python3 scripts/vault_export.py DIR --item UUID -o - | tar tv
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from collections import deque
+
+import file_writer
+from vault import (
+    Container,
+    ContainerError,
+    CorruptContainerError,
+    KeyDeriver,
+    cli,
+    iter_plaintext,
+)
+from vault.layout import media_directory, original_name
+from vault.manifest import directory_records
+from vault.parallel import Prefetcher, default_workers
+
+COPY_BUFFER = 1024 * 1024
+
+
+def item_stream(path, key):
+    """Plaintext chunks of one container (runs on a reader thread)"""
+    with Container(path) as container:
+        yield from iter_plaintext(container, key)
+
+
+class ChunkReader:
+    """Minimal file object over an iterator of byte chunks"""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._buffer = memoryview(b"")
+
+    def read(self, size=-1):
+        """Up to `size` bytes; short only at the end (tarfile relies on it)"""
+        parts = []
+        while size != 0:
+            if not self._buffer:
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    break
+                self._buffer = memoryview(chunk)
+            take = len(self._buffer) if size < 0 else min(size, len(self._buffer))
+            parts.append(self._buffer[:take])
+            self._buffer = self._buffer[take:]
+            if size > 0:
+                size -= take
+        if len(parts) == 1:
+            return parts[0]
+        return b"".join(parts)
+
+
+class TarArchive:
+    def __init__(self, out):
+        self._tar = tarfile.open(
+            fileobj=out,
+            mode="w|",
+            format=tarfile.PAX_FORMAT,
+            copybufsize=COPY_BUFFER,
+        )
+
+    def add(self, name, size, mtime, chunks):
+        info = tarfile.TarInfo(name)
+        info.size = size
+        info.mtime = mtime
+        info.mode = 0o644
+        self._tar.addfile(info, ChunkReader(chunks))
+
+    def close(self):
+        self._tar.close()
+
+
+class ZipArchive:
+    """Stored (uncompressed) entries: photos and videos are compressed already"""
+
+    def __init__(self, out):
+        self._zip = zipfile.ZipFile(out, "w", zipfile.ZIP_STORED, allowZip64=True)
+
+    def add(self, name, size, mtime, chunks):
+        info = zipfile.ZipInfo(name, time.localtime(max(mtime, 315532800))[:6])
+        info.file_size = size
+        info.external_attr = 0o644 << 16
+        with self._zip.open(info, "w", force_zip64=size >= zipfile.ZIP64_LIMIT) as f:
+            for chunk in chunks:
+                f.write(chunk)
+
+    def close(self):
+        self._zip.close()
+
+
+ARCHIVES = {"tar": TarArchive, "zip": ZipArchive}
+
+
+def archive_format(output, requested):
+    if requested:
+        return requested
+    if output.lower().endswith(".zip"):
+        return "zip"
+    return "tar"
+
+
+def entry_names(paths):
+    """{path: unique archive entry name}"""
+    names = {}
+    used = set()
+    for path in paths:
+        name = original_name(os.path.basename(path))
+        stem, ext = os.path.splitext(name)
+        n = 1
+        while name in used:
+            n += 1
+            name = f"{stem} ({n}){ext}"
+        used.add(name)
+        names[path] = name
+    return names
+
+
+def export(items, keys, archive, workers, depth, log):
+    """
+    Write every (path, HeaderRecord) into `archive` in order; return
+    (items, plaintext bytes).
+
+    Up to `workers` items decrypt ahead of the writer, each into its own
+    bounded queue.
+    """
+    names = entry_names(path for path, _ in items)
+    pending = iter(items)
+    window = deque()
+
+    def open_next():
+        item = next(pending, None)
+        if item is not None:
+            path, record = item
+            stream = item_stream(path, keys[record.salt])
+            window.append((path, record, Prefetcher(stream, depth)))
+
+    exported = written = 0
+    try:
+        for _ in range(max(1, workers)):
+            open_next()
+        while window:
+            path, record, stage = window.popleft()
+            size = record.plaintext
+            with stage:
+                archive.add(names[path], size, record.mtime_ns / 1e9, stage)
+                # A legacy blob only authenticates once its stream is
+                # exhausted, and tarfile stops reading at `size` bytes.
+                if next(stage, None) is not None:
+                    raise CorruptContainerError(f"{path}: longer than its frames")
+            open_next()
+            exported += 1
+            written += size
+            log(f"✅ {names[path]} ({size / 1e6:.1f} MB)")
+    finally:
+        for _, _, stage in window:
+            stage.close()
+    return exported, written
+
+
+def select(records, items):
+    if not items:
+        return records
+    wanted = tuple(item.lower() for item in items)
+    return [
+        (path, record)
+        for path, record in records
+        if os.path.basename(path).lower().startswith(wanted)
+    ]
+
+
+@contextlib.contextmanager
+def open_output(output):
+    if output == "-":
+        yield sys.stdout.buffer
+        sys.stdout.buffer.flush()
+    else:
+        with file_writer.atomic_output(output) as out:
+            yield out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directory", help="EncryptedMedia (or its parent)")
+    parser.add_argument(
+        "-o", "--output", required=True, help="archive to write ('-' for stdout)"
+    )
+    parser.add_argument(
+        "--format", choices=sorted(ARCHIVES), help="default: from --output suffix"
+    )
+    parser.add_argument(
+        "--item",
+        action="append",
+        default=[],
+        metavar="UUID",
+        help="export only this item (repeatable; default: everything)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help=f"items decrypted ahead of the writer (default: {default_workers()})",
+    )
+    parser.add_argument(
+        "--depth", type=int, default=2, help="decrypted chunks queued per item"
+    )
+    cli.add_password_arguments(parser)
+    cli.add_cache_arguments(parser)
+    args = parser.parse_args()
+
+    def log(message):
+        print(message, file=sys.stderr if args.output == "-" else sys.stdout)
+
+    workers = args.workers or default_workers()
+    start = time.perf_counter()
+    directory = media_directory(args.directory)
+    records = directory_records(directory, not args.no_cache, workers)
+    items = select(records, args.item)
+    if not items:
+        sys.exit("❌ Nothing to export")
+    damaged = [(p, r) for p, r in items if r.status not in ("ok", "legacy")]
+    for path, record in damaged:
+        log(f"⚠️  Skipping {os.path.basename(path)}: {record.status}")
+    items = [(p, r) for p, r in items if r.status in ("ok", "legacy")]
+    log(
+        f"🔍 {len(items)} items, {sum(r.plaintext for _, r in items) / 1e6:.1f} MB "
+        f"to export"
+    )
+
+    password = cli.read_password(args)
+    with KeyDeriver(password, workers=workers) as deriver:
+        keys = deriver.derive_many(record.salt for _, record in items)
+        fmt = archive_format(args.output, args.format)
+        try:
+            with open_output(args.output) as out:
+                archive = ARCHIVES[fmt](out)
+                try:
+                    exported, written = export(
+                        items, keys, archive, workers, args.depth, log
+                    )
+                finally:
+                    archive.close()
+        except ContainerError as e:
+            if args.output == "-":
+                sys.exit(f"❌ {e}; the archive on stdout is incomplete")
+            sys.exit(f"❌ {e}; {args.output} was not written")
+
+    elapsed = time.perf_counter() - start
+    log(
+        f"\n📦 Exported {exported} items, {written / 1e6:.1f} MB as {fmt} in "
+        f"{elapsed:.1f}s ({written / 1e6 / max(elapsed, 1e-9):.1f} MB/s)"
+    )
+    if damaged:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic vault: an EncryptedMedia directory of ZNSC and legacy
+containers plus the metadata that goes with it, for benchmarks and tests.
+
+    OUT/EncryptedMedia/{UUID}_{name}.encrypted
+    OUT/default.store    SwiftData store copy, one ZMEDIAITEM row per file
+                         (no thumbnails)
+    OUT/metadata.csv     the same rows as a metadata table
+    OUT/workload.json    the parameters, so a workload can be described
+
+Everything is a function of --seed and the options: names, sizes, salts,
+IVs, plaintext and mtimes, so two runs produce byte-identical trees and a
+tree can be regenerated instead of copied. Files are planned up front from
+one RNG, then written by a process pool, largest first; a file already
+present with its final size is kept, so an interrupted run just restarts.
+
+Sizes are log-normal around a per-type median (photos 3 MB, videos 40 MB,
+documents 0.5 MB), capped at the app's 500 MB maxFileSize. Keys come from a
+pool of --salts salts derived once (0 gives every file its own salt, as
+the app does, at one PBKDF2 per file). Plaintext is a seeded noise buffer
+behind a type signature; --duplicates re-imports earlier files for
+vault_dedupe.py. Legacy blobs are sealed in memory, like the app did.
+
+  ZNSC_PASSWORD=... python3 scripts/vault_generate.py /tmp/vault --total-gb 10
+  python3 scripts/vault_generate.py /tmp/vault --files 500 --legacy 0.2
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+import uuid
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from vault import KeyDeriver, cli
+from vault.format import (
+    ENCRYPTED_FILE_EXTENSION,
+    ENCRYPTED_MEDIA_DIRECTORY,
+    FRAME_OVERHEAD,
+    HEADER_SIZE,
+    IV_LENGTH,
+    LEGACY_OVERHEAD,
+    MAX_FILE_SIZE,
+    MIN_CHUNK_SIZE,
+    SALT_LENGTH,
+    TERMINATOR,
+)
+from vault.metadata import TABLE, MediaRow, create_store, write_csv
+from vault.parallel import default_workers
+from vault.writer import ContainerWriter, effective_chunk_size, write_legacy
+
+PASSWORD = "benchmark"
+NOISE_SIZE = 8 * 1024 * 1024
+PIECE = 1024 * 1024
+UNIX_EPOCH = 978307200  # Core Data reference date, in Unix seconds
+
+# type -> (median MB, log-normal sigma, name pattern, extension, signature)
+MEDIA_TYPES = {
+    "photo": (3.0, 0.5, "IMG_{n:04d}", "JPG", b"\xff\xd8\xff\xe0"),
+    "video": (40.0, 1.0, "VID_{n:04d}", "MOV", b"\x00\x00\x00\x14ftypqt  "),
+    "document": (0.5, 0.8, "Scan {n}", "pdf", b"%PDF-1.7\n"),
+}
+DIMENSIONS = {"photo": (4032, 3024), "video": (1920, 1080), "document": (None, None)}
+
+FileSpec = namedtuple(
+    "FileSpec", "index item_id name kind size chunk_size legacy salt start created"
+)
+
+
+def _pairs(text, cast):
+    pairs = {}
+    for part in text.split(","):
+        name, _, value = part.partition("=")
+        if name not in MEDIA_TYPES:
+            raise argparse.ArgumentTypeError(f"unknown media type {name!r}")
+        pairs[name] = cast(value)
+    return pairs
+
+
+def file_name(spec):
+    extension = MEDIA_TYPES[spec.kind][3]
+    return (
+        f"{str(spec.item_id).upper()}_{spec.name}.{extension}{ENCRYPTED_FILE_EXTENSION}"
+    )
+
+
+def container_size(spec):
+    if spec.legacy:
+        return LEGACY_OVERHEAD + spec.size
+    frames = math.ceil(spec.size / spec.chunk_size)
+    return HEADER_SIZE + frames * FRAME_OVERHEAD + spec.size + len(TERMINATOR)
+
+
+def plan(args):
+    """[FileSpec] for the whole workload, from one RNG seeded with --seed"""
+    rng = random.Random(args.seed)
+    mix = {kind: args.mix.get(kind, 0.0) for kind in MEDIA_TYPES}
+    kinds, weights = list(mix), list(mix.values())
+    medians = {kind: MEDIA_TYPES[kind][0] for kind in MEDIA_TYPES}
+    medians.update(args.median_mb)
+    salts = [rng.randbytes(SALT_LENGTH) for _ in range(args.salts)]
+    budget = args.total_gb * 1e9 if args.total_gb else math.inf
+    limit = args.files if args.files or not args.total_gb else math.inf
+    created = 7.0e8  # March 2023, in Core Data's reference-date seconds
+    counters = Counter()
+    specs, total = [], 0
+    while len(specs) < limit and total < budget:
+        index = len(specs)
+        created += rng.expovariate(1 / 3600)
+        salt = rng.choice(salts) if salts else rng.randbytes(SALT_LENGTH)
+        item_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+        legacy = rng.random() < args.legacy
+        chunk_size = effective_chunk_size(rng.choice(args.chunk_kb) * 1024)
+        if specs and rng.random() < args.duplicates:
+            original = rng.choice(specs)  # the same file imported again
+            kind, size, start = original.kind, original.size, original.start
+        else:
+            kind = rng.choices(kinds, weights)[0]
+            _, sigma, *_ = MEDIA_TYPES[kind]
+            size = int(rng.lognormvariate(math.log(medians[kind] * 1e6), sigma))
+            size = min(max(size, 1024), MAX_FILE_SIZE)
+            start = rng.randrange(NOISE_SIZE)
+        counters[kind] += 1
+        name = MEDIA_TYPES[kind][2].format(n=counters[kind])
+        specs.append(
+            FileSpec(
+                index,
+                item_id,
+                name,
+                kind,
+                size,
+                chunk_size,
+                legacy,
+                salt,
+                start,
+                created,
+            )
+        )
+        total += size
+    return specs
+
+
+_noise = None
+_keys = None
+
+
+def _init_worker(seed, keys):
+    global _noise, _keys
+    _noise = random.Random(f"{seed}:noise").randbytes(NOISE_SIZE)
+    _keys = keys
+
+
+def plaintext(spec, piece=PIECE):
+    """The file's plaintext in pieces: its type signature, then noise"""
+    signature = MEDIA_TYPES[spec.kind][4][: spec.size]
+    yield signature
+    position, left = spec.start, spec.size - len(signature)
+    while left:
+        take = min(piece, left, NOISE_SIZE - position)
+        yield _noise[position : position + take]
+        position = (position + take) % NOISE_SIZE
+        left -= take
+
+
+def generate(task):
+    """Write one container unless it is already there; (bytes written, kept)"""
+    spec, directory, seed = task
+    path = os.path.join(directory, file_name(spec))
+    mtime_ns = int((spec.created + UNIX_EPOCH) * 1e9)
+    size = container_size(spec)
+    try:
+        if os.path.getsize(path) == size:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+            return 0, True
+    except FileNotFoundError:
+        pass
+    rng = random.Random(f"{seed}:{spec.index}")
+    key = _keys[spec.salt]
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as out:
+        if spec.legacy:
+            data = b"".join(plaintext(spec))
+            write_legacy(out, key, spec.salt, data, rng.randbytes(IV_LENGTH))
+        else:
+            writer = ContainerWriter(
+                out,
+                key,
+                spec.salt,
+                spec.chunk_size,
+                ivs=lambda: rng.randbytes(IV_LENGTH),
+            )
+            for piece in plaintext(spec, spec.chunk_size):
+                writer.write(piece)
+            writer.close()
+    os.utime(tmp, ns=(mtime_ns, mtime_ns))
+    os.replace(tmp, path)
+    return size, False
+
+
+def metadata_rows(specs):
+    for spec in specs:
+        width, height = DIMENSIONS[spec.kind]
+        duration = spec.size / 2e6 if spec.kind == "video" else None  # ~16 Mbit/s
+        yield MediaRow(
+            spec.index + 1,
+            spec.item_id,
+            f"{spec.name}.{MEDIA_TYPES[spec.kind][3]}",
+            MEDIA_TYPES[spec.kind][3],
+            spec.size,
+            spec.kind,
+            file_name(spec),
+            spec.created,
+            spec.created,
+            width,
+            height,
+            duration,
+        )
+
+
+def write_store(path, specs):
+    tmp = f"{path}.tmp"
+    if os.path.exists(tmp):
+        os.unlink(tmp)
+    db = create_store(tmp)
+    db.executemany(
+        f"INSERT INTO {TABLE} (Z_PK, Z_ENT, Z_OPT, ZID, ZFILENAME, ZFILEEXTENSION, "
+        f"ZFILESIZE, ZTYPERAWVALUE, ZENCRYPTEDPATH, ZCREATEDAT, ZMODIFIEDAT, "
+        f"ZWIDTH, ZHEIGHT, ZDURATION) "
+        f"VALUES (?, 1, 1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        ((row.pk, row.id.bytes, *row[2:]) for row in metadata_rows(specs)),
+    )
+    db.commit()
+    db.close()
+    os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output", help="directory to create the vault in")
+    parser.add_argument("--files", type=int, default=0, help="number of files")
+    parser.add_argument(
+        "--total-gb", type=float, default=0, help="stop at this much plaintext"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--mix",
+        type=lambda text: _pairs(text, float),
+        default="photo=0.8,video=0.15,document=0.05",
+        help="share of each media type",
+    )
+    parser.add_argument(
+        "--median-mb",
+        type=lambda text: _pairs(text, float),
+        default={},
+        metavar="TYPE=MB,...",
+        help="override the median size of a type (photo=3,video=40,document=0.5)",
+    )
+    parser.add_argument(
+        "--chunk-kb",
+        type=lambda text: [int(kb) for kb in text.split(",")],
+        default=[4096],
+        help="ZNSC chunk sizes, picked per file (default 4096)",
+    )
+    parser.add_argument("--legacy", type=float, default=0.1, help="legacy share")
+    parser.add_argument(
+        "--duplicates", type=float, default=0.0, help="share of repeat imports"
+    )
+    parser.add_argument(
+        "--salts", type=int, default=64, help="salt pool size (0: one per file)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help=f"files written at once (default: {default_workers()} cores)",
+    )
+    cli.add_password_arguments(parser)
+    args = parser.parse_args()
+
+    if min(args.chunk_kb) * 1024 < MIN_CHUNK_SIZE:
+        sys.exit(f"❌ Chunks are at least {MIN_CHUNK_SIZE // 1024} KB")
+    if not args.files and not args.total_gb:
+        args.files = 1000
+    password = os.environ.get(args.password_env) or PASSWORD
+    workers = args.workers or default_workers()
+    start = time.perf_counter()
+
+    specs = plan(args)
+    total = sum(spec.size for spec in specs)
+    kinds = Counter(spec.kind for spec in specs)
+    legacy = sum(spec.legacy for spec in specs)
+    print(
+        f"🧮 {len(specs)} files, {total / 1e9:.2f} GB plaintext "
+        f"({', '.join(f'{n} {kind}s' for kind, n in kinds.most_common())}; "
+        f"{legacy} legacy)"
+    )
+
+    with KeyDeriver(password, workers=workers) as deriver:
+        keys = deriver.derive_many(spec.salt for spec in specs)
+        keys = {salt: bytes(key) for salt, key in keys.items()}
+    print(f"🔑 Derived {len(keys)} keys ({time.perf_counter() - start:.1f}s)")
+
+    writing = time.perf_counter()
+    directory = os.path.join(args.output, ENCRYPTED_MEDIA_DIRECTORY)
+    os.makedirs(directory, exist_ok=True)
+    written = kept = 0
+    tasks = [
+        (spec, directory, args.seed)
+        for spec in sorted(specs, key=lambda spec: -spec.size)
+    ]
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(args.seed, keys)
+    ) as pool:
+        for size, was_kept in pool.map(generate, tasks):
+            written += size
+            kept += was_kept
+    elapsed = time.perf_counter() - writing
+    print(
+        f"✅ Wrote {len(specs) - kept} containers ({written / 1e9:.2f} GB, "
+        f"{written / 1e6 / max(elapsed, 1e-9):.0f} MB/s), kept {kept}, "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+
+    write_store(os.path.join(args.output, "default.store"), specs)
+    write_csv(os.path.join(args.output, "metadata.csv"), metadata_rows(specs))
+    with open(os.path.join(args.output, "workload.json"), "w") as f:
+        json.dump(
+            {
+                "seed": args.seed,
+                "files": len(specs),
+                "plaintext_bytes": total,
+                "types": dict(kinds),
+                "legacy": legacy,
+                "mix": args.mix,
+                "median_mb": args.median_mb,
+                "chunk_kb": args.chunk_kb,
+                "duplicates": args.duplicates,
+                "salts": args.salts,
+                "password": PASSWORD if password == PASSWORD else None,
+            },
+            f,
+            indent=2,
+        )
+    print(f"📝 default.store, metadata.csv and workload.json in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Convert legacy single-blob containers in an EncryptedMedia directory to ZNSC.
+
+Legacy files (salt | IV | tag | ciphertext, from encrypt(data:password:))
+make EncryptionService.decryptFile fall back to loading the whole payload
+into memory. This re-encodes each of them as a chunked ZNSC container:
+
+  - streamed: the legacy tag is stored up front, so the blob is decrypted
+    in 4 MB pieces straight into the frame writer; memory stays at a few
+    chunks per worker even for 500 MB videos
+  - the legacy salt is kept, so the existing key is reused and each file
+    costs one PBKDF2 derivation (done in parallel for the whole batch)
+  - the new container is written to a temp file next to the original,
+    optionally re-read and compared, and renamed over the original only
+    once the legacy tag has authenticated; file names do not change
+  - progress is appended to a checkpoint journal, so an interrupted run
+    picks up where it stopped; files that are already ZNSC are skipped
+
+  ZNSC_PASSWORD=... python3 scripts/vault_migrate.py path/to/EncryptedMedia
+  python3 scripts/vault_migrate.py path/to/Documents --dry-run
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import file_writer
+from vault import Container, ContainerError, KeyDeriver, cli, iter_plaintext
+from vault.format import LEGACY_OVERHEAD
+from vault.journal import Journal
+from vault.layout import media_directory
+from vault.manifest import directory_records
+from vault.parallel import default_workers
+from vault.writer import ContainerWriter
+
+JOURNAL_NAME = ".znsc-migrate.journal"
+
+
+def _digest():
+    return hashlib.blake2b(digest_size=32)
+
+
+def migrate_file(path, key, chunk_size=None, verify=True):
+    """
+    Re-encode one legacy container in place; return a stats dict, or None
+    if the file is not legacy.
+    """
+    with Container(path) as container:
+        if not container.is_legacy:
+            return None
+        legacy_size = container.size
+        digest = _digest()
+        with file_writer.atomic_output(path) as out:
+            writer = ContainerWriter(out, key, container.salt, chunk_size)
+            # The legacy tag is only checked after the last piece; the error
+            # propagates before the temp file is committed.
+            for chunk in iter_plaintext(container, key):
+                writer.write(chunk)
+                digest.update(chunk)
+            writer.close()
+            out.flush()
+            if verify:
+                check = _digest()
+                with Container(out.name) as written:
+                    for chunk in iter_plaintext(written, key):
+                        check.update(chunk)
+                if check.digest() != digest.digest():
+                    raise ContainerError(f"{path}: re-read plaintext does not match")
+            size = out.tell()
+    return {
+        "legacy_size": legacy_size,
+        "size": size,
+        "plaintext": writer.plaintext_bytes,
+        "frames": writer.frames,
+    }
+
+
+def find_legacy(records, journal, retry_failed):
+    """
+    Split header manifest records into (legacy, too small to be a container,
+    skipped-as-failed), each a list of (path, HeaderRecord)
+    """
+    legacy = []
+    too_small = []
+    skipped = []
+    for path, record in records:
+        if record.version:
+            continue  # ZNSC header
+        tiny = record.status == "truncated" and record.size <= LEGACY_OVERHEAD
+        if record.status != "legacy" and not tiny:
+            continue
+        if journal.status(os.path.basename(path)) == "failed" and not retry_failed:
+            skipped.append((path, record))
+        elif tiny:
+            too_small.append((path, record))
+        else:
+            legacy.append((path, record))
+    return legacy, too_small, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directory", help="EncryptedMedia (or its parent)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help=f"files converted at once (default: all {default_workers()} cores)",
+    )
+    parser.add_argument(
+        "--chunk-kb", type=int, help="ZNSC chunk size in KB (default: 4096)"
+    )
+    parser.add_argument(
+        "--journal", help=f"checkpoint journal (default: DIRECTORY/{JOURNAL_NAME})"
+    )
+    parser.add_argument(
+        "--no-verify",
+        action="store_true",
+        help="skip re-reading each new container before replacing the original",
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="retry files the journal marks failed",
+    )
+    parser.add_argument(
+        "--dry-run", "-n", action="store_true", help="list legacy files and exit"
+    )
+    cli.add_password_arguments(parser)
+    cli.add_cache_arguments(parser)
+    args = parser.parse_args()
+
+    directory = media_directory(args.directory)
+    workers = args.workers or default_workers()
+    chunk_size = args.chunk_kb * 1024 if args.chunk_kb else None
+
+    with Journal(args.journal or os.path.join(directory, JOURNAL_NAME)) as journal:
+        records = directory_records(directory, not args.no_cache, workers)
+        legacy, too_small, skipped = find_legacy(records, journal, args.retry_failed)
+        total_bytes = sum(record.size for _, record in legacy)
+        print(
+            f"🔍 {len(legacy)} legacy files ({total_bytes / 1e6:.1f} MB) in {directory}"
+        )
+        if skipped:
+            print(f"⏭️  {len(skipped)} files failed previously (use --retry-failed)")
+        if args.dry_run:
+            for path, _ in legacy:
+                print(f"   {os.path.basename(path)}")
+            return
+        if not legacy and not too_small:
+            return
+
+        for path, _ in too_small:
+            journal.record(os.path.basename(path), "failed", error="truncated")
+            print(f"❌ {os.path.basename(path)}: too small to be a container")
+
+        start = time.perf_counter()
+        with KeyDeriver(cli.read_password(args), workers=workers) as deriver:
+            derived = deriver.derive_many(record.salt for _, record in legacy)
+            keys = {path: derived[record.salt] for path, record in legacy}
+            print(
+                f"🔑 Derived {len(derived)} keys in {time.perf_counter() - start:.1f}s"
+            )
+
+            migrated = failed = 0
+            plaintext = 0
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(
+                        migrate_file, path, keys[path], chunk_size, not args.no_verify
+                    ): path
+                    for path, _ in legacy
+                }
+                for future in as_completed(futures):
+                    name = os.path.basename(futures[future])
+                    try:
+                        stats = future.result()
+                    except (ContainerError, OSError) as e:
+                        failed += 1
+                        journal.record(name, "failed", error=str(e))
+                        print(f"❌ {name}: {e}")
+                        continue
+                    if stats is None:
+                        continue  # converted by someone else since the scan
+                    migrated += 1
+                    plaintext += stats["plaintext"]
+                    journal.record(name, "done", **stats)
+                    print(f"✅ {name}: {stats['frames']} frames")
+
+        elapsed = time.perf_counter() - start
+        print(
+            f"\n📊 Migrated {migrated} files, {plaintext / 1e6:.1f} MB in "
+            f"{elapsed:.1f}s ({plaintext / 1e6 / max(elapsed, 1e-9):.1f} MB/s); "
+            f"{failed + len(too_small)} failed"
+        )
+        if failed or too_small:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Re-key every container in an EncryptedMedia directory to a new password.
+
+Offline counterpart of FileReencryptionService.reencryptAllFiles, which
+processes one file at a time in batches of 10 with a 0.1 s sleep in between,
+holds each whole file in memory and aborts the job on the first failure.
+Here:
+
+  - keys are derived up front in parallel: one per old salt (read from the
+    header manifest, see vault/manifest.py), and one per fresh salt (every
+    re-keyed file gets its own new salt)
+  - each file is a two-stage pipeline: a reader thread maps and decrypts
+    frames with the old key into a small bounded queue while the worker
+    encrypts them with the new key and writes them out, and --workers files
+    run at once, so the job is bound by disk throughput
+  - output is always a ZNSC container (legacy files are converted on the
+    way), written to a temp file and renamed over the original only when
+    every old tag has authenticated
+  - each finished file is appended to a checkpoint journal together with
+    its new salt; a rerun skips files whose salt matches, and a failure
+    only marks that file failed. The journal belongs to one rotation: it
+    is deleted once a run finishes with nothing failed, and a rerun whose
+    new password does not open the files it lists as done starts over
+
+Thumbnails live in the SwiftData store (MediaItem.thumbnailData), not in
+EncryptedMedia, and are not touched by this tool.
+
+  ZNSC_PASSWORD=old ZNSC_NEW_PASSWORD=new \\
+      python3 scripts/vault_rekey.py path/to/EncryptedMedia
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import file_writer
+from vault import (
+    AuthenticationError,
+    Container,
+    ContainerError,
+    KeyDeriver,
+    cli,
+    derive_key,
+    iter_plaintext,
+    read_salt,
+)
+from vault.container import max_frame_length
+from vault.format import SALT_LENGTH
+from vault.journal import Journal
+from vault.layout import media_directory
+from vault.manifest import directory_records
+from vault.parallel import default_workers, prefetch
+from vault.writer import ContainerWriter
+
+JOURNAL_NAME = ".znsc-rekey.journal"
+
+
+class Cancelled(Exception):
+    pass
+
+
+def _chunk_size(container, override):
+    if override:
+        return override
+    if container.is_znsc:
+        return max_frame_length(container.header.chunk_kb)
+    return None  # writer default
+
+
+def rekey_file(path, old_key, new_key, new_salt, stop, chunk_size=None, depth=4):
+    """Re-encrypt one container in place; return a stats dict"""
+    start = time.perf_counter()
+    with Container(path) as container:
+        was_legacy = container.is_legacy
+        with file_writer.atomic_output(path) as out:
+            writer = ContainerWriter(
+                out, new_key, new_salt, _chunk_size(container, chunk_size)
+            )
+            for plaintext in prefetch(iter_plaintext(container, old_key), depth):
+                if stop.is_set():
+                    raise Cancelled(path)
+                writer.write(plaintext)
+            writer.close()
+            size = out.tell()
+    return {
+        "salt": new_salt.hex(),
+        "size": size,
+        "plaintext": writer.plaintext_bytes,
+        "frames": writer.frames,
+        "was_legacy": was_legacy,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def opens_with(path, password):
+    """True if `path` already authenticates under `password` (first frame)"""
+    with Container(path) as container:
+        if not container.is_znsc:
+            return False
+        key = derive_key(password, container.salt)
+        try:
+            for _ in iter_plaintext(container, key):
+                return True
+        except AuthenticationError:
+            return False
+    return True  # no frames: an empty ZNSC file has nothing to re-key
+
+
+def pending_records(records, journal):
+    """
+    [(path, HeaderRecord)] not yet re-keyed according to the journal: a
+    file is done once its current salt is the one the journal recorded.
+    """
+    todo = []
+    done = 0
+    for path, header in records:
+        record = journal.entries.get(os.path.basename(path))
+        if record and record["status"] == "done":
+            if header.salt.hex() == record.get("salt"):
+                done += 1
+                continue
+        todo.append((path, header))
+    return todo, done
+
+
+def journal_matches(done_paths, new_password):
+    """
+    True if the journal's finished files are under `new_password`, i.e.
+    this run resumes the rotation that wrote it. One file is checked.
+    """
+    for path in done_paths:
+        try:
+            return opens_with(path, new_password)
+        except (ContainerError, OSError):
+            continue
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directory", help="EncryptedMedia (or its parent)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help=f"files re-keyed at once (default: {default_workers()} cores)",
+    )
+    parser.add_argument(
+        "--depth", type=int, default=4, help="decrypted frames queued per file"
+    )
+    parser.add_argument(
+        "--chunk-kb", type=int, help="chunk size for all output (default: keep)"
+    )
+    parser.add_argument(
+        "--journal", help=f"checkpoint journal (default: DIRECTORY/{JOURNAL_NAME})"
+    )
+    parser.add_argument(
+        "--dry-run", "-n", action="store_true", help="count pending files and exit"
+    )
+    cli.add_password_arguments(parser)
+    cli.add_new_password_arguments(parser)
+    cli.add_cache_arguments(parser)
+    args = parser.parse_args()
+
+    directory = media_directory(args.directory)
+    workers = args.workers or default_workers()
+    chunk_size = args.chunk_kb * 1024 if args.chunk_kb else None
+
+    with Journal(args.journal or os.path.join(directory, JOURNAL_NAME)) as journal:
+        records = directory_records(directory, not args.no_cache, workers)
+        todo, done = pending_records(records, journal)
+        total_bytes = sum(header.size for _, header in todo)
+        print(
+            f"🔍 {len(todo)} files to re-key ({total_bytes / 1e6:.1f} MB), "
+            f"{done} already done according to the journal"
+        )
+        if args.dry_run or not records:
+            return
+
+        old_password = cli.read_password(args, "Current vault password: ")
+        new_password = cli.read_new_password(args)
+        if new_password == old_password:
+            sys.exit("❌ The new password is the same as the current one")
+        if done:
+            pending = {path for path, _ in todo}
+            if not journal_matches(
+                [path for path, _ in records if path not in pending], new_password
+            ):
+                print("🆕 The journal is from another rotation; starting over")
+                journal.discard()
+                todo, done = pending_records(records, journal)
+        if not todo:
+            journal.discard()
+            return
+
+        start = time.perf_counter()
+        old = KeyDeriver(old_password, workers=workers)
+        new = KeyDeriver(new_password, workers=workers)
+        stop = threading.Event()
+        rekeyed = failed = 0
+        plaintext = 0
+        try:
+            errors = {
+                path: f"{header.status} container"
+                for path, header in todo
+                if header.status not in ("ok", "legacy")
+            }
+            derived = old.derive_many(
+                header.salt for path, header in todo if path not in errors
+            )
+            old_keys = {
+                path: derived[header.salt]
+                for path, header in todo
+                if path not in errors
+            }
+            new_salts = {path: os.urandom(SALT_LENGTH) for path in old_keys}
+            new_keys = new.derive_many(new_salts.values())
+            print(
+                f"🔑 Derived {len(old_keys) + len(new_keys)} keys in "
+                f"{time.perf_counter() - start:.1f}s"
+            )
+            for path, error in errors.items():
+                failed += 1
+                journal.record(os.path.basename(path), "failed", error=str(error))
+                print(f"❌ {os.path.basename(path)}: {error}")
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(
+                        rekey_file,
+                        path,
+                        old_keys[path],
+                        new_keys[new_salts[path]],
+                        new_salts[path],
+                        stop,
+                        chunk_size,
+                        args.depth,
+                    ): path
+                    for path in old_keys
+                }
+                try:
+                    for future in as_completed(futures):
+                        path = futures[future]
+                        name = os.path.basename(path)
+                        try:
+                            stats = future.result()
+                        except AuthenticationError as e:
+                            # Swapped in by an interrupted run before it
+                            # could journal the file?
+                            if opens_with(path, new_password):
+                                salt = read_salt(path).hex()
+                                journal.record(name, "done", salt=salt, recovered=True)
+                                print(f"✅ {name}: already re-keyed")
+                                continue
+                            failed += 1
+                            journal.record(name, "failed", error=str(e))
+                            print(f"❌ {name}: {e}")
+                            continue
+                        except (ContainerError, OSError) as e:
+                            failed += 1
+                            journal.record(name, "failed", error=str(e))
+                            print(f"❌ {name}: {e}")
+                            continue
+                        rekeyed += 1
+                        plaintext += stats["plaintext"]
+                        journal.record(name, "done", **stats)
+                        print(f"✅ {name}: {stats['frames']} frames")
+                except KeyboardInterrupt:
+                    stop.set()
+                    for future in futures:
+                        future.cancel()
+                    print("\n⏸️  Interrupted; rerun to resume", file=sys.stderr)
+        finally:
+            old.close()
+            new.close()
+
+        elapsed = time.perf_counter() - start
+        print(
+            f"\n📊 Re-keyed {rekeyed} files, {plaintext / 1e6:.1f} MB in "
+            f"{elapsed:.1f}s ({plaintext / 1e6 / max(elapsed, 1e-9):.1f} MB/s); "
+            f"{failed} failed"
+        )
+        if failed or stop.is_set():
+            sys.exit(1)
+        journal.discard()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Check every container in one or more EncryptedMedia directories.
+
+EncryptionService.decryptFile stops quietly when a ZNSC file ends before its
+terminator, so a truncated backup looks fine until someone opens it. This
+walks each file and reports:
+
+  truncated  header or a frame runs past the end, or no zero terminator
+  corrupt    bad version, a frame longer than the header's chunk size
+             allows, or bytes after the terminator
+  auth       a GCM tag failed (only with --verify-tags)
+  legacy     single-blob file; valid but not yet migrated (vault_migrate.py)
+
+Every file is walked on every run. Without --verify-tags only the length
+prefixes are touched (a few pages per frame), so large vaults scan at
+disk-metadata speed; with it every frame is authenticated and keys are
+derived once per salt in parallel. The header manifest (vault/manifest.py)
+only plans the work: it supplies the salts to derive up front and the
+sizes to start the largest files first. Nothing it says is trusted, since
+a flipped byte need not change a file's size or mtime, and a backup may
+carry a manifest copied from somewhere else. The manifest is written back
+(corrected by what the scan found) only with --write-manifest, so a scan
+leaves the scanned tree untouched.
+
+  python3 scripts/vault_scan.py BACKUP/EncryptedMedia [--json report.json]
+  ZNSC_PASSWORD=... python3 scripts/vault_scan.py BACKUP --verify-tags
+
+Exit status is 1 if any file is truncated, corrupt or fails authentication.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from vault import (
+    AuthenticationError,
+    Container,
+    ContainerError,
+    CorruptContainerError,
+    KeyDeriver,
+    TruncatedContainerError,
+    cli,
+    iter_plaintext,
+)
+from vault.format import SALT_LENGTH
+from vault.layout import media_directory
+from vault.manifest import MANIFEST_NAME, HeaderManifest, describe, walk_frames
+from vault.parallel import default_workers
+
+PROBLEMS = ("truncated", "corrupt", "auth", "error")
+
+
+def scan_file(path, key_for=None):
+    """
+    Return a result dict with a `status` of ok/legacy or one of PROBLEMS.
+    With `key_for` (salt -> key) every frame is also authenticated.
+    """
+    result = {"path": path, "status": "ok", "size": 0, "frames": 0}
+    try:
+        with Container(path) as container:
+            result["size"] = container.size
+            key = None
+            if key_for is not None and container.size >= SALT_LENGTH:
+                key = key_for(container.salt)
+            if container.is_legacy:
+                result["status"] = "legacy"
+                container.legacy_parts()  # raises if too short
+                if key is not None:
+                    for _ in iter_plaintext(container, key):
+                        pass
+                return result
+            if key is None and hasattr(mmap, "MADV_RANDOM"):
+                container.advise(mmap.MADV_RANDOM)
+            result["chunk_kb"] = container.header.chunk_kb
+            result["frames"], _ = walk_frames(container)
+            if key is not None:
+                for _ in iter_plaintext(container, key):
+                    pass
+    except TruncatedContainerError as e:
+        result.update(status="truncated", error=str(e))
+    except AuthenticationError as e:
+        result.update(status="auth", error=f"{path}: {e}")
+    except CorruptContainerError as e:
+        result.update(status="corrupt", error=str(e))
+    except (ContainerError, OSError) as e:
+        result.update(status="error", error=str(e))
+    return result
+
+
+def collect_records(targets, use_cache, workers):
+    """
+    ([(path, HeaderRecord or OSError)] for every container in `targets`,
+    [(directory, HeaderManifest)] they were planned from)
+    """
+    records = []
+    manifests = []
+    for target in targets:
+        if os.path.isdir(target):
+            directory = media_directory(target)
+            manifest = HeaderManifest(
+                os.path.join(directory, MANIFEST_NAME) if use_cache else None
+            )
+            records.extend(manifest.refresh(directory, workers, errors=True))
+            manifests.append((directory, manifest))
+            continue
+        try:
+            records.append((target, describe(target)))
+        except OSError as e:
+            records.append((target, e))
+    return records, manifests
+
+
+def correct_manifests(manifests, results, records):
+    """Re-describe files whose scan disagrees with their manifest record"""
+    by_directory = {os.path.normpath(d): manifest for d, manifest in manifests}
+    for result in results:
+        path = result["path"]
+        manifest = by_directory.get(os.path.normpath(os.path.dirname(path)))
+        record = records.get(path)
+        if manifest is None or isinstance(record, OSError) or record is None:
+            continue
+        if result["status"] == record.status and result["frames"] == record.frames:
+            continue
+        try:
+            manifest.put(os.path.basename(path), describe(path))
+        except OSError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("targets", nargs="+", help="directories or container files")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help=f"files checked at once (default: {default_workers()} cores)",
+    )
+    parser.add_argument("--json", metavar="FILE", help="also write a JSON report")
+    parser.add_argument(
+        "--quiet", "-q", action="store_true", help="only print problems and totals"
+    )
+    parser.add_argument(
+        "--write-manifest",
+        action="store_true",
+        help="save each directory's refreshed .znsc-headers manifest",
+    )
+    cli.add_password_arguments(parser, required=False)
+    cli.add_cache_arguments(parser)
+    args = parser.parse_args()
+
+    workers = args.workers or default_workers()
+    start = time.perf_counter()
+    records, manifests = collect_records(args.targets, not args.no_cache, workers)
+
+    key_for = None
+    deriver = None
+    if args.verify_tags:
+        # Salts come from the manifest; a file whose header says otherwise
+        # gets its key derived on the spot
+        deriver = KeyDeriver(cli.read_password(args), workers=workers)
+        derived = deriver.derive_many(
+            record.salt for _, record in records if not isinstance(record, OSError)
+        )
+        late = threading.Lock()
+
+        def key_for(salt):
+            key = derived.get(bytes(salt))
+            if key is None:
+                with late:
+                    key = deriver.key_for(salt)
+            return key
+
+        print(f"🔑 Derived keys in {time.perf_counter() - start:.1f}s")
+
+    results = []
+
+    def report(result):
+        results.append(result)
+        status = result["status"]
+        if status in PROBLEMS:
+            print(f"❌ {status:<9} {result['error']}")
+        elif not args.quiet:
+            icon = "⚠️ " if status == "legacy" else "✅"
+            print(f"{icon} {status:<9} {result['path']}")
+
+    # Largest files first, so the pool does not end on one big straggler;
+    # results are still reported in name order
+    readable = [(path, r) for path, r in records if not isinstance(r, OSError)]
+    order = sorted(readable, key=lambda item: -item[1].size)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {path: pool.submit(scan_file, path, key_for) for path, _ in order}
+            for path, record in records:
+                if isinstance(record, OSError):
+                    report(
+                        {
+                            "path": path,
+                            "status": "error",
+                            "size": 0,
+                            "frames": 0,
+                            "error": str(record),
+                        }
+                    )
+                else:
+                    report(futures[path].result())
+    finally:
+        if deriver is not None:
+            deriver.close()
+
+    if args.write_manifest:
+        correct_manifests(manifests, results, dict(records))
+        for directory, manifest in manifests:
+            try:
+                manifest.save()
+            except OSError as e:
+                print(f"⚠️  {directory}: manifest not saved: {e}")
+
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    counts = Counter(r["status"] for r in results)
+    total_bytes = sum(r["size"] for r in results)
+    print(
+        f"\n📊 {len(results)} files, {total_bytes / 1e6:.1f} MB in {elapsed:.2f}s "
+        f"({total_bytes / 1e6 / elapsed:.1f} MB/s, {len(results) / elapsed:.0f} files/s)"
+    )
+    print(
+        "   "
+        + ", ".join(
+            f"{status} {counts[status]}"
+            for status in ("ok", "legacy") + PROBLEMS
+            if counts[status]
+        )
+    )
+
+    if args.json:
+        summary = {
+            "elapsed": round(elapsed, 3),
+            "bytes": total_bytes,
+            "verify_tags": bool(args.verify_tags),
+            "counts": dict(counts),
+            "problems": [r for r in results if r["status"] in PROBLEMS],
+            "legacy": [r["path"] for r in results if r["status"] == "legacy"],
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+
+    if any(counts[status] for status in PROBLEMS):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
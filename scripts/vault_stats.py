@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+One-pass storage analytics for a copy of the app's vault.
+
+FileStorageService.getTotalStorageSize and StorageService.calculateDirectorySize
+enumerate the tree and ask for resourceValues one file at a time. This walks
+the tree with os.scandir (subdirectories in parallel), takes every
+container's format, chunk size and plaintext size from the EncryptedMedia
+header manifest (vault/manifest.py; only new or changed files are opened),
+and reports in one pass:
+
+  - total size, and size per top-level directory
+  - a size histogram of .encrypted files
+  - ZNSC vs legacy vs damaged container counts, and plaintext size
+  - the distribution of ZNSC chunk sizes
+  - orphaned .encrypted files no MediaItem points at, and MediaItems whose
+    file is missing (with --store, a copy of the SwiftData default.store)
+
+  python3 scripts/vault_stats.py path/to/Documents [--store default.store]
+
+Nothing is decrypted, so no password is needed.
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from vault import cli
+from vault.format import ENCRYPTED_FILE_EXTENSION, ENCRYPTED_MEDIA_DIRECTORY
+from vault.manifest import HeaderManifest, directory_records
+from vault.metadata import MetadataStore
+
+# Upper bounds of the size histogram buckets
+BUCKETS = [
+    (64 * 1024, "< 64 KB"),
+    (256 * 1024, "64-256 KB"),
+    (1024 * 1024, "256 KB-1 MB"),
+    (4 * 1024 * 1024, "1-4 MB"),
+    (16 * 1024 * 1024, "4-16 MB"),
+    (64 * 1024 * 1024, "16-64 MB"),
+    (256 * 1024 * 1024, "64-256 MB"),
+    (float("inf"), ">= 256 MB"),
+]
+KINDS = {"ok": "znsc", "legacy": "legacy", "truncated": "damaged", "corrupt": "damaged"}
+
+
+def _is_container(name):
+    return name.endswith(ENCRYPTED_FILE_EXTENSION) and not name.startswith(".")
+
+
+def _scan_directory(path):
+    """
+    Return (whether it holds containers, other files as (path, size),
+    subdirectories). Containers are sized by the header manifest instead.
+    """
+    containers, others, subdirs = False, [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif not entry.is_file(follow_symlinks=False):
+                        continue
+                    elif _is_container(entry.name):
+                        containers = True
+                    else:
+                        size = entry.stat(follow_symlinks=False).st_size
+                        others.append((entry.path, size))
+                except OSError:
+                    continue  # vanished mid-walk
+    except OSError:
+        pass
+    return containers, others, subdirs
+
+
+def walk(root, pool):
+    """
+    Walk `root` with directories scanned in parallel; return
+    ([directories holding containers], [(path, size) of other files]).
+    """
+    directories, others = [], []
+    pending = [(root, pool.submit(_scan_directory, root))]
+    while pending:
+        directory, future = pending.pop()
+        containers, found, subdirs = future.result()
+        if containers:
+            directories.append(directory)
+        others.extend(found)
+        pending.extend((d, pool.submit(_scan_directory, d)) for d in subdirs)
+    return directories, others
+
+
+def container_records(directory, use_cache, workers):
+    """
+    [(path, HeaderRecord)] for one directory. Only EncryptedMedia keeps a
+    manifest; containers anywhere else are described afresh.
+    """
+    if os.path.basename(directory) == ENCRYPTED_MEDIA_DIRECTORY:
+        return directory_records(directory, use_cache, workers)
+    return HeaderManifest(None).refresh(directory, workers)
+
+
+def bucket_label(size):
+    for bound, label in BUCKETS:
+        if size < bound:
+            return label
+    return BUCKETS[-1][1]
+
+
+def analyze(root, workers, store=None, use_cache=True):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        directories, others = walk(root, pool)
+    containers = [
+        (path, record)
+        for directory in directories
+        for path, record in container_records(directory, use_cache, workers)
+    ]
+    files = others + [(path, record.size) for path, record in containers]
+
+    by_top = Counter()
+    prefix = len(os.path.join(root, ""))
+    for path, size in files:
+        rel = path[prefix:]
+        by_top[rel.split(os.sep, 1)[0] if os.sep in rel else "."] += size
+
+    formats = Counter()
+    format_bytes = Counter()
+    chunks = Counter()
+    histogram = Counter()
+    for _, record in containers:
+        kind = KINDS[record.status]
+        formats[kind] += 1
+        format_bytes[kind] += record.size
+        histogram[bucket_label(record.size)] += 1
+        if record.version:
+            chunks[record.chunk_kb] += 1
+
+    report = {
+        "root": root,
+        "files": len(files),
+        "total_bytes": sum(size for _, size in files),
+        "by_directory": dict(by_top.most_common()),
+        "containers": len(containers),
+        "container_bytes": sum(record.size for _, record in containers),
+        "plaintext_bytes": sum(record.plaintext for _, record in containers),
+        "formats": dict(formats),
+        "format_bytes": dict(format_bytes),
+        "histogram": {label: histogram[label] for _, label in BUCKETS},
+        "chunk_kb": {str(kb): n for kb, n in sorted(chunks.items())},
+    }
+
+    if store:
+        with MetadataStore(store) as metadata:
+            referenced = {
+                os.path.basename(row.encrypted_path)
+                for row in metadata.items()
+                if row.encrypted_path
+            }
+        on_disk = {os.path.basename(path): path for path, _ in containers}
+        report["orphans"] = sorted(
+            on_disk[name] for name in on_disk.keys() - referenced
+        )
+        report["missing"] = sorted(referenced - on_disk.keys())
+    report["scan_seconds"] = round(time.perf_counter() - start, 3)
+    return report
+
+
+def print_report(report):
+    mb = 1e6
+    print(f"📁 {report['root']}")
+    print(
+        f"   {report['files']} files, {report['total_bytes'] / mb:.1f} MB "
+        f"(scanned in {report['scan_seconds']:.2f}s)"
+    )
+    for name, size in report["by_directory"].items():
+        print(f"   {name:<28}{size / mb:>12.1f} MB")
+
+    print(
+        f"\n🔐 {report['containers']} containers, "
+        f"{report['container_bytes'] / mb:.1f} MB"
+    )
+    print(f"   plaintext {report['plaintext_bytes'] / mb:>20.1f} MB")
+    for kind in ("znsc", "legacy", "damaged"):
+        if kind in report["formats"]:
+            print(
+                f"   {kind:<10}{report['formats'][kind]:>8}"
+                f"{report['format_bytes'][kind] / mb:>12.1f} MB"
+            )
+
+    print("\n📊 Size histogram")
+    peak = max(report["histogram"].values(), default=0) or 1
+    for label, count in report["histogram"].items():
+        bar = "█" * round(30 * count / peak)
+        print(f"   {label:>12} {count:>8} {bar}")
+
+    if report["chunk_kb"]:
+        print("\n🧱 ZNSC chunk sizes")
+        for kb, count in report["chunk_kb"].items():
+            print(f"   {kb:>8} KB {count:>8}")
+
+    if "orphans" in report:
+        print(f"\n🧹 {len(report['orphans'])} orphaned containers")
+        for path in report["orphans"][:20]:
+            print(f"   {path}")
+        if len(report["orphans"]) > 20:
+            print(f"   ... and {len(report['orphans']) - 20} more")
+        print(f"❓ {len(report['missing'])} MediaItems without a file")
+        for name in report["missing"][:20]:
+            print(f"   {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("root", help="vault copy (Documents, or EncryptedMedia)")
+    parser.add_argument(
+        "--store", help="copy of the SwiftData default.store, for orphan checks"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=16, help="threads for walking and headers"
+    )
+    parser.add_argument("--json", metavar="FILE", help="also write the report as JSON")
+    cli.add_cache_arguments(parser)
+    args = parser.parse_args()
+
+    report = analyze(
+        os.path.abspath(args.root), args.workers, args.store, not args.no_cache
+    )
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
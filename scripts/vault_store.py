@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Report what a SwiftData store copy spends its bytes on, and how the app's
+MediaItem reads would execute against it.
+
+  sizes      every table and index, from SQLite's dbstat (skipped when the
+             local SQLite lacks it)
+  blobs      how much of the file is inline MediaItem.thumbnailData
+  coverage   the indexes on ZMEDIAITEM and the query plan of each access
+             pattern in vault/metadata.py: a "SCAN ZMEDIAITEM" walks every
+             table page, and with inline thumbnails those are mostly blob
+
+The store is opened read-only; copy default.store (with its -wal and -shm
+files) out of the app container first. Patterns without a usable index get
+the CREATE INDEX that would cover them; bench_swiftdata_store.py measures
+the difference on a synthetic store.
+
+With --csv the MediaItem table (without thumbnails) is also exported as a
+metadata table, the input of bench_search_index.py.
+
+  python3 scripts/vault_store.py path/to/default.store [--csv media.csv]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+
+from vault.metadata import (
+    ACCESS_PATTERNS,
+    PROPOSED_INDEXES,
+    TABLE,
+    MetadataStore,
+    write_csv,
+)
+
+
+def classify(plan):
+    """Short verdict for an EXPLAIN QUERY PLAN"""
+    text = " | ".join(plan)
+    if "COVERING INDEX" in text:
+        verdict = "covering index"
+    elif "USING INDEX" in text or "USING INTEGER PRIMARY KEY" in text:
+        verdict = "index + table rows"
+    elif f"SCAN {TABLE}" in text:
+        verdict = "⚠️ full table scan"
+    else:
+        verdict = "other"
+    if "TEMP B-TREE" in text:
+        verdict += ", sorts in memory"
+    return verdict
+
+
+def missing_indexes(indexes):
+    """PROPOSED_INDEXES not already served by an index with the same prefix"""
+    existing = set(indexes.values())
+    return {
+        name: columns
+        for name, columns in PROPOSED_INDEXES.items()
+        if not any(have[: len(columns)] == columns for have in existing)
+    }
+
+
+def report_sizes(store, file_size):
+    page_size, pages, free = store.page_usage()
+    print(
+        f"📁 {os.path.basename(store.path)}: {file_size / 1e6:.1f} MB, "
+        f"{pages} pages of {page_size} bytes, {free} free"
+    )
+    sizes = store.object_sizes()
+    if sizes is None:
+        print("⚠️  SQLite here has no dbstat; skipping table sizes")
+        return
+    print(f"\n{'Table / index':<36}{'MB':>10}{'share':>8}{'payload MB':>12}")
+    for name, (size, payload) in sorted(sizes.items(), key=lambda i: -i[1][0]):
+        print(
+            f"{name:<36}{size / 1e6:>10.1f}{size / max(file_size, 1):>8.1%}"
+            f"{payload / 1e6:>12.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("store", help="copy of the app's default.store")
+    parser.add_argument("--csv", metavar="FILE", help="also export the item table")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.store):
+        sys.exit(f"❌ {args.store}: no such file")
+    try:
+        with MetadataStore(args.store) as store:
+            report_sizes(store, os.path.getsize(args.store))
+
+            rows, with_thumbnail, blob_bytes = store.thumbnail_usage()
+            print(
+                f"\n🖼️  {with_thumbnail} of {rows} MediaItems have an inline "
+                f"thumbnail: {blob_bytes / 1e6:.1f} MB, "
+                f"{blob_bytes / max(os.path.getsize(args.store), 1):.1%} of the file"
+                + (
+                    f", {blob_bytes / with_thumbnail / 1024:.1f} KB each"
+                    if with_thumbnail
+                    else ""
+                )
+            )
+
+            indexes = store.indexes()
+            print(f"\n🗂️  Indexes on {TABLE}:")
+            for name, columns in sorted(indexes.items()):
+                print(f"   {name} ({', '.join(columns)})")
+            if not indexes:
+                print("   none besides the primary key")
+
+            print("\n🔎 Access patterns")
+            for name, (caller, sql) in ACCESS_PATTERNS.items():
+                plan = store.query_plan(sql)
+                print(f"   {name:<16}{classify(plan)}")
+                print(f"   {'':<16}{caller}")
+                print(f"   {'':<16}{' | '.join(plan)}")
+
+            missing = missing_indexes(indexes)
+            if missing:
+                print("\n💡 Covering indexes to try:")
+                for name, columns in missing.items():
+                    print(f"   CREATE INDEX {name} ON {TABLE} ({', '.join(columns)});")
+
+            if args.csv:
+                count = write_csv(args.csv, store.items())
+                print(f"\n✅ Exported {count} items to {args.csv}")
+    except sqlite3.DatabaseError as e:
+        sys.exit(f"❌ {args.store}: {e}")
+
+
+if __name__ == "__main__":
+    main()
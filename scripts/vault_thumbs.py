@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Build and inspect packed thumbnail stores (see vault/thumbpack.py).
+
+  migrate   copy every inline MediaItem.thumbnailData from a SwiftData store
+            copy into a new pack, encrypted under one fresh salt
+  info      print a pack's header and size breakdown
+  extract   decrypt one thumbnail from a pack
+
+Inline thumbnails come in two shapes: MediaImportService stores the JPEG
+as-is, while older rows may hold a legacy salt | IV | tag | ciphertext blob
+(encrypt(data:password:)). Both are accepted; legacy blobs each have their
+own salt, so their keys are derived in one parallel batch. The SwiftData
+store itself is opened read-only and never modified.
+
+  ZNSC_PASSWORD=... python3 scripts/vault_thumbs.py migrate default.store thumbs.zntp
+  python3 scripts/vault_thumbs.py info thumbs.zntp
+  ZNSC_PASSWORD=... python3 scripts/vault_thumbs.py extract thumbs.zntp UUID -o t.jpg
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import file_writer
+from vault import AuthenticationError, ContainerError, KeyDeriver, cli, derive_key
+from vault import crypto
+from vault.format import IV_LENGTH, LEGACY_OVERHEAD, SALT_LENGTH
+from vault.metadata import MetadataStore
+from vault.parallel import default_workers
+from vault.thumbpack import ENTRY, HEADER, ThumbPack, write_pack
+
+IMAGE_SIGNATURES = (b"\xff\xd8\xff", b"\x89PNG\r\n\x1a\n")
+
+
+def is_plain_image(blob):
+    return any(blob.startswith(signature) for signature in IMAGE_SIGNATURES)
+
+
+def open_legacy_blob(blob, key):
+    return crypto.open_frame(
+        key,
+        blob[SALT_LENGTH : SALT_LENGTH + IV_LENGTH],
+        blob[SALT_LENGTH + IV_LENGTH : LEGACY_OVERHEAD],
+        memoryview(blob)[LEGACY_OVERHEAD:],
+    )
+
+
+def collect_thumbnails(store_path, password, workers):
+    """Return ([(UUID, JPEG)] in gallery order, [(UUID, error)])"""
+    with MetadataStore(store_path) as store:
+        rows = list(store.thumbnails())
+    encrypted = [
+        blob
+        for _, blob in rows
+        if not is_plain_image(blob) and len(blob) > LEGACY_OVERHEAD
+    ]
+    keys = {}
+    if encrypted:
+        with KeyDeriver(password, workers=workers) as deriver:
+            derived = deriver.derive_many(blob[:SALT_LENGTH] for blob in encrypted)
+            keys = {salt: bytes(key) for salt, key in derived.items()}
+
+    items, failures = [], []
+    for item_id, blob in rows:
+        if is_plain_image(blob):
+            items.append((item_id, blob))
+            continue
+        if len(blob) <= LEGACY_OVERHEAD:
+            failures.append((item_id, f"unrecognised {len(blob)}-byte blob"))
+            continue
+        try:
+            items.append((item_id, open_legacy_blob(blob, keys[blob[:SALT_LENGTH]])))
+        except AuthenticationError as e:
+            failures.append((item_id, str(e)))
+    return items, failures
+
+
+def cmd_migrate(args):
+    password = cli.read_password(args)
+    start = time.perf_counter()
+    items, failures = collect_thumbnails(
+        args.store, password, args.workers or default_workers()
+    )
+    for item_id, error in failures:
+        print(f"❌ {item_id}: {error}")
+
+    salt = os.urandom(SALT_LENGTH)
+    key = derive_key(password, salt)
+    with file_writer.atomic_output(args.pack) as out:
+        write_pack(out, items, key, salt)
+    size = os.path.getsize(args.pack)
+    print(
+        f"✅ Packed {len(items)} thumbnails ({size / 1e6:.1f} MB) into {args.pack} "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+    if failures:
+        sys.exit(1)
+
+
+def cmd_info(args):
+    with ThumbPack(args.pack) as pack:
+        payload = pack.size - pack.data_offset
+        print(f"File:        {pack.path}")
+        print(f"Thumbnails:  {len(pack)}")
+        print(f"Header:      {HEADER.size} bytes")
+        print(f"Table:       {len(pack) * ENTRY.size} bytes")
+        print(f"Records:     {payload} bytes")
+        if len(pack):
+            print(f"Average:     {payload / len(pack):.0f} bytes")
+
+
+def cmd_extract(args):
+    with ThumbPack(args.pack) as pack:
+        key = derive_key(cli.read_password(args), pack.salt)
+        data = pack.load(args.item, key)
+    if data is None:
+        sys.exit(f"❌ {args.item} is not in {args.pack}")
+    if args.output:
+        with open(args.output, "wb") as f:
+            f.write(data)
+    else:
+        sys.stdout.buffer.write(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate = commands.add_parser("migrate", help="build a pack from a SwiftData store")
+    migrate.add_argument("store", help="copy of the app's default.store")
+    migrate.add_argument("pack", help="pack file to write")
+    migrate.add_argument("--workers", type=int, default=0)
+    cli.add_password_arguments(migrate)
+    migrate.set_defaults(func=cmd_migrate)
+
+    info = commands.add_parser("info", help="describe a pack")
+    info.add_argument("pack")
+    info.set_defaults(func=cmd_info)
+
+    extract = commands.add_parser("extract", help="decrypt one thumbnail")
+    extract.add_argument("pack")
+    extract.add_argument("item", help="MediaItem UUID")
+    extract.add_argument("-o", "--output", help="output file (default: stdout)")
+    cli.add_password_arguments(extract)
+    extract.set_defaults(func=cmd_extract)
+
+    args = parser.parse_args()
+    try:
+        args.func(args)
+    except ContainerError as e:
+        sys.exit(f"❌ {e}")
+
+
+if __name__ == "__main__":
+    main()
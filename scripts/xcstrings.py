@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Read and write Localizable.xcstrings in Xcode's own JSON layout.
+
+Xcode writes `"key" : value` separators and expands empty objects over three
+lines. Matching that byte for byte means a catalog that was loaded and saved
+without edits is left untouched on disk, and real edits produce minimal
+diffs instead of reformatting all ~250 KB.
+"""
+
+import json
+import re
+
+import file_writer
+
+_EMPTY_OBJECT = re.compile(r"^( *)(.*)\{\}(,?)$", re.M)
+
+
+def load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def dumps(data):
+    """Serialize a catalog exactly like Xcode does"""
+    text = json.dumps(data, ensure_ascii=False, indent=2, separators=(",", " : "))
+    return _EMPTY_OBJECT.sub(
+        lambda m: f"{m.group(1)}{m.group(2)}{{\n\n{m.group(1)}}}{m.group(3)}", text
+    )
+
+
+def save(path, data):
+    """Atomically write the catalog if it changed; True if written"""
+    return file_writer.write_if_changed(path, dumps(data))